@@ -0,0 +1,125 @@
+"""
+Anomaly Benchmark
+Time and memory of anomaly injection into one series against the previous injector
+
+The previous ``AnomalyInjector`` built a timestamp mask and copied the
+whole series several times per anomaly; it now copies once per call (or
+not at all with ``inplace``) and hands every anomaly to ``AnomalyEngine``
+in one pass.
+
+Usage: python benchmarks/anomaly_benchmark.py [--rows N] [--anomalies K]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generator.anomaly import AnomalyConfig, AnomalyInjector
+from generator.domain_schema import AnomalyType
+
+LEGACY_TYPES = (AnomalyType.DEGRADATION, AnomalyType.SPIKE, AnomalyType.OUTAGE,
+                AnomalyType.CONGESTION, AnomalyType.OSCILLATION)
+
+
+def legacy_inject_multiple_anomalies(data: np.ndarray, timestamps: pd.DatetimeIndex,
+                                     anomaly_configs: list, rng) -> np.ndarray:
+    """The injector as it was before it moved onto AnomalyEngine"""
+    result = data.copy()
+    for config in anomaly_configs:
+        start_ts = pd.Timestamp(config.start_time)
+        end_ts = pd.Timestamp(config.get_end_time())
+        mask = (timestamps >= start_ts) & (timestamps < end_ts)
+        indices = np.where(mask)[0]
+        if len(indices) == 0:
+            continue
+        # One copy in inject_anomaly and one in the pattern method
+        result = result.copy()
+        result = result.copy()
+        severity = config.severity
+        n = len(indices)
+        if config.anomaly_type == AnomalyType.DEGRADATION:
+            result[indices] *= np.linspace(1.0, 1.0 - severity, n)
+        elif config.anomaly_type == AnomalyType.SPIKE:
+            result[indices] *= 1.0 + severity * np.exp(-np.linspace(0, 3, n))
+        elif config.anomaly_type == AnomalyType.OUTAGE:
+            result[indices] *= 1.0 - severity
+        elif config.anomaly_type == AnomalyType.CONGESTION:
+            result[indices] *= (1.0 + severity * 0.5) * rng.normal(1.0, severity * 0.2, n)
+        elif config.anomaly_type == AnomalyType.OSCILLATION:
+            result[indices] *= 1.0 + severity * np.sin(np.linspace(0, 4 * np.pi, n))
+    return result
+
+
+def make_anomalies(timestamps: pd.DatetimeIndex, count: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    span = int((timestamps[-1] - timestamps[0]).total_seconds() // 60)
+    return [
+        AnomalyConfig(
+            anomaly_type=LEGACY_TYPES[i % len(LEGACY_TYPES)],
+            start_time=(timestamps[0] + timedelta(minutes=int(rng.integers(0, span)))).to_pydatetime(),
+            duration_minutes=int(rng.integers(15, 240)),
+            severity=float(rng.uniform(0.2, 0.8)),
+            affected_metrics=['value']
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--anomalies', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+    
+    timestamps = pd.date_range('2024-01-01', periods=args.rows, freq='1min')
+    data = np.random.default_rng(args.seed).gamma(4.0, 10.0, args.rows)
+    anomalies = make_anomalies(timestamps, args.anomalies, args.seed)
+    print(f'{args.rows:,} rows, {args.anomalies} anomalies, '
+          f'series of {data.nbytes / 2 ** 20:.0f} MiB')
+    
+    runs = {
+        'legacy': lambda values: legacy_inject_multiple_anomalies(
+            values, timestamps, anomalies, np.random.default_rng(args.seed)
+        ),
+        'copy': lambda values: AnomalyInjector(args.seed).inject_multiple_anomalies(
+            values, timestamps, anomalies
+        ),
+        'inplace': lambda values: AnomalyInjector(args.seed).inject_multiple_anomalies(
+            values, timestamps, anomalies, inplace=True
+        ),
+    }
+    timings = {}
+    peaks = {}
+    for name, run in runs.items():
+        if name == 'legacy' and args.skip_legacy:
+            continue
+        values = data.copy()
+        tracemalloc.start()
+        start = time.perf_counter()
+        run(values)
+        timings[name] = time.perf_counter() - start
+        peaks[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del values
+    
+    # Peak excludes the input series and timestamps
+    for name, seconds in timings.items():
+        line = (f'{name:>8}: {seconds:8.3f} s, peak {peaks[name] / 2 ** 20:8.1f} MiB '
+                f'({peaks[name] / data.nbytes:4.1f}x the series)')
+        if 'legacy' in timings and name != 'legacy':
+            line += f'  ({timings["legacy"] / seconds:.1f}x faster)'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
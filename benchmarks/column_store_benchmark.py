@@ -0,0 +1,61 @@
+"""
+Column Store Benchmark
+Windowed reads from the column store against re-parsing the written file
+
+Usage: python benchmarks/column_store_benchmark.py [--rows N] [--entities E] [--window W]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common import scaled_config
+from generator.column_store import ColumnStoreReader, ColumnStoreWriter
+from generator.domain_schema import OutputConfig
+from generator.generic_core import SyntheticDataGenerator
+from generator.readers import get_reader_class
+from generator.writers import get_writer_class
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--entities', type=int, default=10)
+    parser.add_argument('--window', type=int, default=2000)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    args = parser.parse_args()
+    
+    generator = SyntheticDataGenerator(scaled_config(entities=args.entities, rows=args.rows))
+    output = OutputConfig(chunk_size=args.chunk_size)
+    workdir = Path(tempfile.mkdtemp())
+    
+    # Write every format and the store in one generation pass
+    writers = {
+        fmt: get_writer_class(fmt).from_config(workdir / f'data.{fmt}', output)
+        for fmt in ('csv', 'parquet')
+    }
+    writers['store'] = ColumnStoreWriter(workdir / 'store', generator.grid)
+    start = time.perf_counter()
+    for chunk in generator.generate_chunks(args.chunk_size):
+        for writer in writers.values():
+            writer.write(chunk)
+    for writer in writers.values():
+        writer.close()
+    print(f'{args.rows:,} rows x {chunk.shape[1] - 1} metrics, '
+          f'written in {time.perf_counter() - start:.2f} s')
+    
+    # A zoomed window near the end is the worst case for sequential formats
+    lo = args.rows - args.window
+    readers = {
+        fmt: get_reader_class(fmt)(workdir / f'data.{fmt}') for fmt in ('csv', 'parquet')
+    }
+    readers['store'] = ColumnStoreReader(workdir / 'store')
+    for name, reader in readers.items():
+        start = time.perf_counter()
+        rows = sum(len(frame) for frame in reader.read(lo, args.rows))
+        print(f'{name:>10} {time.perf_counter() - start:8.3f} s for {rows:,} rows')
+
+
+if __name__ == '__main__':
+    main()
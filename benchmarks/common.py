@@ -0,0 +1,122 @@
+"""
+Benchmark Helpers
+Scaled-up template configurations shared by the benchmark scripts
+"""
+
+import copy
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generator.domain_schema import (
+    AnomalyConfig, AnomalyType, ARIMAConfig, CorrelationConfig, DistributionConfig,
+    EntityConfig, GeneratorConfig, MetricConfig, SeasonalityConfig, TimeWindowConfig
+)
+from generator.domain_templates import DomainTemplates
+
+
+def scaled_config(domain_type: str = 'telecom', entities: int = 10,
+                  rows: int = 100_000, seed: int = 42) -> GeneratorConfig:
+    """Domain template replicated over ``entities`` entities and ``rows`` windows"""
+    config = DomainTemplates.get_template(domain_type)
+    config.seed = seed
+    
+    # Template correlations name bare metrics; give every replica its own
+    template = config.entities[0]
+    correlations = config.correlations
+    config.entities = []
+    config.correlations = []
+    for i in range(entities):
+        entity = copy.deepcopy(template)
+        entity.entity_id = f'{template.entity_id}_{i}'
+        config.entities.append(entity)
+        for corr in correlations:
+            corr = copy.deepcopy(corr)
+            corr.source = f'{entity.entity_id}_{corr.source}'
+            corr.target = f'{entity.entity_id}_{corr.target}'
+            config.correlations.append(corr)
+    
+    start = datetime(2024, 1, 1)
+    granularity = config.time_window.granularity_minutes
+    config.time_window = TimeWindowConfig(
+        start_time=start,
+        end_time=start + timedelta(minutes=granularity * (rows - 1)),
+        granularity_minutes=granularity
+    )
+    
+    return config
+
+
+def pipeline_config(rows: int = 100_000, metrics: int = 10,
+                    distribution: str = 'normal', copula: bool = True,
+                    arima: Tuple[int, int] = (1, 1), anomalies_per_day: float = 0.0,
+                    metrics_per_entity: int = 10, seed: int = 42) -> GeneratorConfig:
+    """Synthetic configuration with every pipeline knob set explicitly
+    
+    ``metrics`` metrics of one distribution are spread over entities of
+    ``metrics_per_entity``; with ``copula`` each entity's metrics form a
+    correlated chain. ``arima`` is the (AR, MA) order, (0, 0) disables
+    it. Anomalies are spaced evenly and cycle through the anomaly types
+    and metrics. Windows are one minute apart.
+    """
+    start = datetime(2024, 1, 1)
+    entities = []
+    correlations = []
+    for e in range(0, metrics, metrics_per_entity):
+        entity = EntityConfig(entity_id=f'E{e // metrics_per_entity}', entity_type='node')
+        for m in range(min(metrics_per_entity, metrics - e)):
+            entity.metrics.append(MetricConfig(
+                name=f'm{m}', display_name=f'm{m}',
+                distribution=DistributionConfig(
+                    type=distribution, mean=50.0, std=10.0, min_value=0.0, max_value=100.0
+                )
+            ))
+            if copula and m > 0:
+                correlations.append(CorrelationConfig(
+                    source=f'{entity.entity_id}_m{m - 1}',
+                    target=f'{entity.entity_id}_m{m}',
+                    coefficient=0.6
+                ))
+        entities.append(entity)
+    
+    ar_order, ma_order = arima
+    arima_config = None
+    if ar_order or ma_order:
+        arima_config = ARIMAConfig(
+            ar_order=ar_order, ma_order=ma_order,
+            ar_coef=[0.5 / (i + 1) for i in range(ar_order)],
+            ma_coef=[0.3 / (i + 1) for i in range(ma_order)]
+        )
+    
+    columns = [f'{entity.entity_id}_{metric.name}' for entity in entities for metric in entity.metrics]
+    n_anomalies = int(round(anomalies_per_day * rows / (24 * 60)))
+    spacing = rows / max(n_anomalies, 1)
+    anomaly_types = list(AnomalyType)
+    anomalies = [
+        AnomalyConfig(
+            anomaly_id=f'A{i}',
+            anomaly_type=anomaly_types[i % len(anomaly_types)].value,
+            start_time=start + timedelta(minutes=int(i * spacing)),
+            duration_minutes=30,
+            severity=2.0,
+            epicenter=columns[i % len(columns)]
+        )
+        for i in range(n_anomalies)
+    ]
+    
+    return GeneratorConfig(
+        seed=seed,
+        entities=entities,
+        time_window=TimeWindowConfig(
+            start_time=start,
+            end_time=start + timedelta(minutes=rows - 1),
+            granularity_minutes=1
+        ),
+        seasonality=[SeasonalityConfig(period_hours=24, amplitude=0.2)],
+        arima=arima_config,
+        correlations=correlations,
+        anomalies=anomalies
+    )
@@ -0,0 +1,116 @@
+"""
+Cost Model Calibration
+Fit the /api/validate cost model on this host and check it against real runs
+
+Runs the profiled calibration workloads (about a minute on one core at
+the default scale), writes the coefficients where the API looks for them
+and then compares predictions with measured runs of a few pipeline
+configurations that were not part of the fit.
+
+Usage:
+    python benchmarks/cost_model_calibration.py [--scale S] [--output PATH]
+    python benchmarks/cost_model_calibration.py --check-only [--model PATH]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import pipeline_config
+from generator.cost_model import CostModel, calibrate
+from generator.domain_schema import OutputConfig
+from generator.generic_core import SyntheticDataGenerator
+from generator.summary import SummaryStatistics
+from generator.writers import get_writer_class
+
+# COST_MODEL_PATH of the default app configuration
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / 'cost_model.json'
+
+# (rows, metrics, output format) of the validation runs
+CHECKS = (
+    (20_000, 10, 'csv'),
+    (100_000, 20, 'parquet'),
+    (100_000, 50, 'ndjson'),
+    (300_000, 10, 'json'),
+)
+
+
+def run(config, filepath: Path) -> None:
+    """Generate, write and summarize ``config`` as /api/generate does"""
+    output = config.output
+    generator = SyntheticDataGenerator(config)
+    writer = get_writer_class(output.format).from_config(filepath, output)
+    statistics = None
+    for chunk in generator.generate_chunks(output.chunk_size):
+        writer.write(chunk)
+        metric_columns = [col for col in chunk.columns if col != 'timestamp']
+        if statistics is None:
+            statistics = SummaryStatistics(metric_columns)
+        statistics.add(chunk[metric_columns].to_numpy(dtype=float))
+    writer.close()
+    statistics.result()
+
+
+def measure(config) -> dict:
+    """Seconds, traced peak MB and file MB of ``run``"""
+    with tempfile.TemporaryDirectory() as workdir:
+        writer_cls = get_writer_class(config.output.format)
+        filepath = Path(workdir) / f'data.{writer_cls.extension_for(config.output)}'
+        
+        start = time.perf_counter()
+        run(config, filepath)
+        seconds = time.perf_counter() - start
+        
+        # A second, traced pass; tracing would distort the timing above
+        tracemalloc.start()
+        run(config, Path(workdir) / 'traced')
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            'seconds': seconds,
+            'peak_memory_mb': peak / (1 << 20),
+            'output_size_mb': filepath.stat().st_size / (1 << 20)
+        }
+
+
+def check(model: CostModel) -> None:
+    print(f'\n{"":<28} {"seconds":>17} {"peak MB":>17} {"file MB":>17}')
+    print(f'{"configuration":<28}' + ' predicted measured' * 3)
+    for rows, metrics, fmt in CHECKS:
+        config = pipeline_config(rows=rows, metrics=metrics)
+        # The column store is not written here, so leave it out of the estimate
+        config.output = OutputConfig(format=fmt, column_store=False)
+        estimate = model.estimate(config)
+        actual = measure(config)
+        predicted = (estimate.seconds, estimate.peak_memory_mb, estimate.output_size_mb)
+        measured = (actual['seconds'], actual['peak_memory_mb'], actual['output_size_mb'])
+        cells = ''.join(f' {p:9.2f} {m:8.2f}' for p, m in zip(predicted, measured))
+        print(f'{f"{rows:,} x {metrics} {fmt}":<28}{cells}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiplier of the calibration row counts')
+    parser.add_argument('--output', type=Path, default=DEFAULT_PATH,
+                        help='where to write the calibrated coefficients')
+    parser.add_argument('--check-only', action='store_true',
+                        help='only compare the model at --model with real runs')
+    parser.add_argument('--model', type=Path, default=DEFAULT_PATH)
+    args = parser.parse_args()
+    
+    if args.check_only:
+        model = CostModel.load(args.model)
+        print('host calibration' if model.calibrated else 'reference coefficients')
+    else:
+        start = time.perf_counter()
+        model = calibrate(scale=args.scale, progress=print)
+        model.save(args.output)
+        print(f'Calibrated in {time.perf_counter() - start:.0f} s, written to {args.output}')
+    check(model)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Statistics Benchmark
+Per-column pandas statistics against the single-pass SummaryStatistics
+
+Usage: python benchmarks/statistics_benchmark.py [--rows N] [--columns C]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from generator.summary import SummaryStatistics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--columns', type=int, default=200)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(3, 1, size=(args.rows, args.columns))
+    frame = pd.DataFrame(values, columns=[f'm{j}' for j in range(args.columns)])
+    print(f'{args.rows:,} rows x {args.columns} columns')
+    
+    # The previous post-processing: five pandas reductions per column
+    start = time.perf_counter()
+    legacy = {
+        col: {
+            'mean': float(frame[col].mean()),
+            'std': float(frame[col].std()),
+            'min': float(frame[col].min()),
+            'max': float(frame[col].max()),
+            'median': float(frame[col].median())
+        }
+        for col in frame.columns
+    }
+    print(f'{"per-column pandas":>20} {time.perf_counter() - start:8.2f} s')
+    exact_median = np.array([legacy[col]['median'] for col in frame.columns])
+    
+    for method in ('exact', 'approximate'):
+        start = time.perf_counter()
+        summary = SummaryStatistics(list(frame.columns), method=method)
+        for offset in range(0, args.rows, args.chunk_size):
+            # Chunks arrive the way the API folds them in
+            chunk = frame.iloc[offset:offset + args.chunk_size]
+            summary.add(chunk.to_numpy(dtype=float))
+        result = summary.result()
+        seconds = time.perf_counter() - start
+        
+        median = np.array([result[col]['median'] for col in frame.columns])
+        # Rank error: how far the estimate's rank is from the middle
+        ranks = (values < median).mean(axis=0)
+        print(f'{method:>20} {seconds:8.2f} s, median rank error '
+              f'{np.abs(ranks - 0.5).max():.5f}, max relative std error '
+              f'{max(abs(result[c]["std"] / legacy[c]["std"] - 1) for c in frame.columns):.1e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+Pipeline Benchmark Suite
+Rows/sec and peak RSS over a matrix of generator scenarios, with JSON baselines
+
+Every scenario runs in a fresh interpreter so peak RSS is its own. Each
+scenario set is a base scenario plus variants that change one setting
+at a time: row count, metric count, distribution, copula, ARIMA order,
+anomaly density and output format.
+
+Usage:
+    python benchmarks/suite.py [--set quick|full] [--only REGEX] [--repeat N]
+    python benchmarks/suite.py --save benchmarks/baselines/main.json
+    python benchmarks/suite.py --compare benchmarks/baselines/main.json [--threshold 10]
+
+``--compare`` exits with status 1 when a scenario's throughput dropped by
+more than ``--threshold`` percent against the baseline.
+"""
+
+import argparse
+import json
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from common import pipeline_config
+from generator.domain_schema import DistributionType, OutputConfig
+from generator.generic_core import GENERATOR_VERSION, SyntheticDataGenerator
+from generator.writers import get_writer_class
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One generator workload; ``output`` None measures generation alone"""
+    rows: int = 100_000
+    metrics: int = 10
+    distribution: str = 'normal'
+    copula: bool = True
+    arima: Tuple[int, int] = (1, 1)
+    anomalies_per_day: float = 0.0
+    output: Optional[str] = None
+    
+    @property
+    def name(self) -> str:
+        p, q = self.arima
+        return (f'rows={self.rows} metrics={self.metrics} dist={self.distribution} '
+                f'copula={"on" if self.copula else "off"} arima={p},{q} '
+                f'anomalies/day={self.anomalies_per_day:g} output={self.output or "none"}')
+
+
+def sweep(base: Scenario, **axes: list) -> List[Scenario]:
+    """The base scenario and every single-setting variant of it"""
+    scenarios = [base]
+    for name, values in axes.items():
+        for value in values:
+            variant = replace(base, **{name: value})
+            if variant not in scenarios:
+                scenarios.append(variant)
+    return scenarios
+
+
+AXES = dict(
+    distribution=[d.value for d in DistributionType],
+    copula=[False],
+    arima=[(0, 0), (1, 0), (2, 1), (3, 2)],
+    anomalies_per_day=[24.0, 288.0],
+    output=['csv', 'json', 'ndjson', 'parquet'],
+)
+
+SETS = {
+    # A couple of minutes; for checking a change before committing it
+    'quick': sweep(Scenario(rows=100_000), rows=[10_000], metrics=[200], **AXES),
+    # The sizes named in the performance work, tens of minutes
+    'full': sweep(Scenario(rows=1_000_000), rows=[10_000, 10_000_000], metrics=[1000], **AXES),
+}
+
+
+def run_scenario(scenario: Scenario) -> Dict[str, float]:
+    """Generate (and write) one scenario in this process"""
+    config = pipeline_config(
+        rows=scenario.rows, metrics=scenario.metrics,
+        distribution=scenario.distribution, copula=scenario.copula,
+        arima=scenario.arima, anomalies_per_day=scenario.anomalies_per_day
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        generator = SyntheticDataGenerator(config)
+        writer = None
+        if scenario.output:
+            output = OutputConfig(format=scenario.output, output_dir=workdir)
+            writer_cls = get_writer_class(scenario.output)
+            filepath = Path(workdir) / f'data.{writer_cls.extension_for(output)}'
+            writer = writer_cls.from_config(filepath, output)
+        rows = 0
+        for chunk in generator.generate_chunks():
+            if writer is not None:
+                writer.write(chunk)
+            rows += len(chunk)
+        if writer is not None:
+            writer.close()
+        seconds = time.perf_counter() - start
+        file_mb = filepath.stat().st_size / (1 << 20) if writer is not None else 0.0
+    
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds,
+        'peak_rss_mb': peak_mb,
+        'file_mb': file_mb
+    }
+
+
+def measure(scenario: Scenario, repeat: int) -> Dict[str, float]:
+    """Best throughput and highest peak RSS over ``repeat`` fresh processes"""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, __file__, '--scenario', json.dumps(asdict(scenario))],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    best = max(runs, key=lambda run: run['rows_per_second'])
+    return dict(best, peak_rss_mb=max(run['peak_rss_mb'] for run in runs))
+
+
+def environment() -> Dict[str, str]:
+    """What the numbers depend on besides the code"""
+    import pandas
+    import pyarrow
+    
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'pyarrow': pyarrow.__version__,
+        'generator_version': GENERATOR_VERSION
+    }
+
+
+def compare(results: Dict[str, dict], baseline: dict, threshold: float) -> List[str]:
+    """Print the change against ``baseline``; names of regressed scenarios"""
+    regressions = []
+    print(f'\nAgainst baseline from {baseline.get("created", "?")} '
+          f'(flagging throughput drops over {threshold:g}%)')
+    changed = {
+        key: (value, baseline.get('environment', {}).get(key))
+        for key, value in environment().items()
+        if baseline.get('environment', {}).get(key) != value
+    }
+    for key, (now, before) in changed.items():
+        print(f'  note: {key} was {before}, now {now}')
+    for name, result in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f'  new        {name}')
+            continue
+        speed = (result['rows_per_second'] / before['rows_per_second'] - 1) * 100
+        memory = (result['peak_rss_mb'] / before['peak_rss_mb'] - 1) * 100
+        flag = 'REGRESSED' if speed < -threshold else 'ok'
+        if flag == 'REGRESSED':
+            regressions.append(name)
+        print(f'  {flag:<10} {name}: rows/s {speed:+6.1f}%, peak RSS {memory:+6.1f}%')
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--set', choices=sorted(SETS), default='quick')
+    parser.add_argument('--only', help='run scenarios whose name matches this regex')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', type=Path, help='write the results as a baseline')
+    parser.add_argument('--compare', type=Path, help='baseline to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='throughput drop in percent that counts as a regression')
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.scenario:
+        # Child process: run one scenario and report it as JSON
+        values = json.loads(args.scenario)
+        values['arima'] = tuple(values['arima'])
+        print(json.dumps(run_scenario(Scenario(**values))))
+        return
+    
+    scenarios = SETS[args.set]
+    if args.only:
+        scenarios = [s for s in scenarios if re.search(args.only, s.name)]
+    
+    results = {}
+    print(f'{"rows/s":>12} {"seconds":>8} {"peak MB":>8} {"file MB":>8}  scenario')
+    for scenario in scenarios:
+        result = measure(scenario, args.repeat)
+        results[scenario.name] = dict(result, scenario=asdict(scenario))
+        print(f'{result["rows_per_second"]:12,.0f} {result["seconds"]:8.2f} '
+              f'{result["peak_rss_mb"]:8.0f} {result["file_mb"]:8.1f}  {scenario.name}')
+    
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'set': args.set,
+                'repeat': args.repeat,
+                'environment': environment(),
+                'results': results
+            }, f, indent=2)
+        print(f'\nBaseline written to {args.save}')
+    if regressions:
+        print(f'\n{len(regressions)} scenario(s) regressed by more than {args.threshold:g}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
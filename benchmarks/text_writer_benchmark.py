@@ -0,0 +1,76 @@
+"""
+Text Writer Benchmark
+CSV, JSON and NDJSON chunk writers against DataFrame.to_csv/to_json
+
+Usage: python benchmarks/text_writer_benchmark.py [--rows N] [--entities E]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common import scaled_config
+from generator.domain_schema import OutputConfig
+from generator.generic_core import SyntheticDataGenerator
+from generator.writers import get_writer_class
+
+
+VARIANTS = {
+    'csv': OutputConfig(format='csv'),
+    'csv %.6f': OutputConfig(format='csv', float_format='%.6f'),
+    'csv gzip': OutputConfig(format='csv', compression='gzip'),
+    'csv zstd': OutputConfig(format='csv', compression='zstd'),
+    'json': OutputConfig(format='json'),
+    'ndjson records': OutputConfig(format='ndjson'),
+    'ndjson columns': OutputConfig(format='ndjson', json_layout='columns'),
+    'ndjson records zstd': OutputConfig(format='ndjson', compression='zstd'),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--entities', type=int, default=5)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    parser.add_argument('--skip-legacy', action='store_true',
+                        help='skip the slow pandas baselines')
+    args = parser.parse_args()
+    
+    generator = SyntheticDataGenerator(
+        scaled_config(entities=args.entities, rows=args.rows)
+    )
+    chunks = list(generator.generate_chunks(args.chunk_size))
+    frame = generator.generate()
+    print(f'{len(frame):,} rows x {frame.shape[1] - 1} metrics')
+    print(f'{"writer":>24} {"seconds":>8} {"rows/s":>10} {"size MiB":>9}')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        def report(name: str, path: Path, seconds: float) -> None:
+            size = path.stat().st_size / 2 ** 20
+            print(f'{name:>24} {seconds:8.2f} {len(frame) / seconds:10,.0f} {size:9.1f}')
+        
+        if not args.skip_legacy:
+            # The previous writers: pandas on the full frame
+            path = Path(tmp) / 'legacy.csv'
+            start = time.perf_counter()
+            frame.to_csv(path, index=False)
+            report('DataFrame.to_csv', path, time.perf_counter() - start)
+            
+            path = Path(tmp) / 'legacy.json'
+            start = time.perf_counter()
+            frame.to_json(path, orient='records', date_format='iso', indent=2)
+            report('DataFrame.to_json', path, time.perf_counter() - start)
+        
+        for i, (name, output) in enumerate(VARIANTS.items()):
+            writer_cls = get_writer_class(output.format)
+            path = Path(tmp) / f'variant{i}.{writer_cls.extension_for(output)}'
+            start = time.perf_counter()
+            with writer_cls.from_config(path, output) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+            report(name, path, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
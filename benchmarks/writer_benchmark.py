@@ -0,0 +1,69 @@
+"""
+Writer Benchmark
+Parquet throughput and file size of the chunk writer against DataFrame.to_parquet
+
+Usage: python benchmarks/writer_benchmark.py [--rows N] [--entities E]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common import scaled_config
+from generator.domain_schema import OutputConfig
+from generator.generic_core import SyntheticDataGenerator
+from generator.writers import ParquetChunkWriter
+
+
+VARIANTS = {
+    'snappy/dictionary': OutputConfig(float_encoding='dictionary'),
+    'none/plain': OutputConfig(compress=False, float_encoding='plain'),
+    'lz4/plain': OutputConfig(compression='lz4', float_encoding='plain'),
+    'snappy/bss (default)': OutputConfig(),
+    'zstd-1/bss': OutputConfig(compression='zstd', compression_level=1,
+                               float_encoding='byte_stream_split'),
+    'zstd-9/bss': OutputConfig(compression='zstd', compression_level=9,
+                               float_encoding='byte_stream_split'),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--entities', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    args = parser.parse_args()
+    
+    generator = SyntheticDataGenerator(
+        scaled_config(entities=args.entities, rows=args.rows)
+    )
+    chunks = list(generator.generate_chunks(args.chunk_size))
+    frame = generator.generate()
+    raw_mb = frame.memory_usage(index=False).sum() / 2 ** 20
+    print(f'{len(frame):,} rows x {frame.shape[1] - 1} metrics, {raw_mb:.0f} MiB in memory')
+    print(f'{"writer":>24} {"seconds":>8} {"MiB/s":>8} {"size MiB":>9} {"ratio":>6}')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        def report(name: str, path: Path, seconds: float) -> None:
+            size = path.stat().st_size / 2 ** 20
+            print(f'{name:>24} {seconds:8.2f} {raw_mb / seconds:8.0f} '
+                  f'{size:9.1f} {raw_mb / size:6.2f}')
+        
+        # The previous writer: one to_parquet call on the full frame
+        path = Path(tmp) / 'legacy.parquet'
+        start = time.perf_counter()
+        frame.to_parquet(path, index=False)
+        report('DataFrame.to_parquet', path, time.perf_counter() - start)
+        
+        for name, output in VARIANTS.items():
+            path = Path(tmp) / f'{name.replace("/", "_")}.parquet'
+            start = time.perf_counter()
+            with ParquetChunkWriter.from_config(path, output) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+            report(name, path, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
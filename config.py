@@ -27,8 +27,47 @@ class Config:
     DEFAULT_GRANULARITY = 5  # minutes
     DEFAULT_DURATION_HOURS = 24
     
+    # Background generation jobs
+    JOB_WORKERS = 2
+    JOB_MAX_QUEUED = 16
+    JOB_MAX_FINISHED = 100
+    
+    # Reuse artifacts of identical configurations
+    RESULT_CACHE_ENABLED = True
+    RESULT_CACHE_MAX_ENTRIES = 128
+    RESULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1GB of cached files
+    
+    # Generated files are indexed for downloads; files from earlier runs
+    # are looked up in these directories
+    ARTIFACT_SEARCH_DIRS = ['./output', './output/telecom', './output/finance',
+                            './output/healthcare', './output/manufacturing',
+                            './output/ecommerce', './output/iot', './output/custom']
+    ARTIFACT_MAX_ENTRIES = 10000
+    
+    # Upper bounds for /api/artifacts/<id>/timeseries and /rows
+    TIMESERIES_MAX_POINTS = 10000
+    ARTIFACT_MAX_ROWS = 10000
+    
+    # Cost model behind /api/validate estimates and admission control;
+    # benchmarks/cost_model_calibration.py writes a calibration for this
+    # host, the reference coefficients are used until then
+    COST_MODEL_PATH = BASE_DIR / 'cost_model.json'
+    
+    # Requests estimated above these limits are rejected (None disables a
+    # limit); /api/generate requests estimated to take longer than
+    # ADMISSION_SYNC_MAX_SECONDS are run as background jobs instead
+    ADMISSION_MAX_SECONDS = 3600
+    ADMISSION_MAX_MEMORY_MB = 4096
+    ADMISSION_MAX_OUTPUT_MB = 10 * 1024
+    ADMISSION_SYNC_MAX_SECONDS = 60
+    
+    # Profiled requests (output.profile) trace memory allocations of the
+    # whole process, slowing every concurrent request; they are rejected
+    # unless enabled here
+    ALLOW_PROFILING = False
+    
     # Allowed output formats
-    ALLOWED_FORMATS = ['csv', 'parquet', 'json']
+    ALLOWED_FORMATS = ['csv', 'parquet', 'json', 'ndjson']
     
     # Session configuration
     SESSION_TYPE = 'filesystem'
@@ -0,0 +1,139 @@
+"""
+Anomaly Kernels
+Registry of the multiplicative patterns behind every anomaly type
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .domain_schema import AnomalyType
+
+
+@dataclass(frozen=True)
+class AnomalyKernel:
+    """Pattern of one anomaly type
+    
+    ``course(duration)`` is the severity-independent course over the rows
+    of a ``duration``-row event. ``factor(course, severity, noise)`` turns
+    it into multiplicative factors, elementwise on arrays of any
+    broadcastable shape; ``noise`` holds standard normal draws of that
+    shape for ``noisy`` kernels and is None otherwise.
+    """
+    course: Callable[[int], np.ndarray]
+    factor: Callable[[np.ndarray, np.ndarray, Optional[np.ndarray]], np.ndarray]
+    noisy: bool = False
+
+
+ANOMALY_KERNELS: Dict[str, AnomalyKernel] = {}
+
+# Bit of each anomaly type in the row labels, in registration order
+LABEL_BITS: Dict[str, int] = {}
+LABEL_DTYPE = np.uint16
+
+
+def register_anomaly_kernel(name: str, course: Callable[[int], np.ndarray],
+                            factor: Callable[..., np.ndarray],
+                            noisy: bool = False) -> AnomalyKernel:
+    """Add or replace the kernel of an anomaly type
+    
+    Registered kernels run through the same cached, vectorized path as
+    the built-in ones. A new type takes the next free label bit.
+    """
+    if name not in LABEL_BITS:
+        if len(LABEL_BITS) >= np.iinfo(LABEL_DTYPE).bits:
+            raise ValueError(f"No label bit left for anomaly type '{name}'")
+        LABEL_BITS[name] = 1 << len(LABEL_BITS)
+    kernel = AnomalyKernel(course, factor, noisy)
+    ANOMALY_KERNELS[name] = kernel
+    kernel_course.cache_clear()
+    return kernel
+
+
+@lru_cache(maxsize=256)
+def kernel_course(name: str, duration: int) -> np.ndarray:
+    """Read-only course of a ``duration``-row event of a registered type"""
+    course = np.array(ANOMALY_KERNELS[name].course(duration), dtype=float)
+    course.flags.writeable = False
+    return course
+
+
+def _swell(duration: int) -> np.ndarray:
+    # Rises to 1.5 halfway through and falls back
+    return 1 + 0.5 * np.sin(np.linspace(0, np.pi, duration))
+
+
+def _oscillations(duration: int) -> np.ndarray:
+    # Two full oscillations
+    return np.sin(np.linspace(0, 4 * np.pi, duration))
+
+
+def _ramp(duration: int) -> np.ndarray:
+    return np.linspace(0, 1, duration)
+
+
+def _envelope(duration: int) -> np.ndarray:
+    return np.sin(np.linspace(0, np.pi, duration))
+
+
+def _constant(duration: int) -> np.ndarray:
+    return np.ones(duration)
+
+
+# Sharp increase
+register_anomaly_kernel(
+    AnomalyType.SPIKE.value, _swell,
+    lambda course, severity, noise: 1 + severity * course
+)
+
+# Sharp decrease
+register_anomaly_kernel(
+    AnomalyType.DROP.value, _swell,
+    lambda course, severity, noise: np.maximum(1 - severity * course, 0.1)
+)
+
+# Oscillating pattern
+register_anomaly_kernel(
+    AnomalyType.OSCILLATION.value, _oscillations,
+    lambda course, severity, noise: 1 + severity * course
+)
+
+# Increased variance
+register_anomaly_kernel(
+    AnomalyType.CONGESTION.value, _constant,
+    lambda course, severity, noise: 1 + severity * 0.3 * noise,
+    noisy=True
+)
+
+# Gradual decline
+register_anomaly_kernel(
+    AnomalyType.DEGRADATION.value, _ramp,
+    lambda course, severity, noise: np.maximum(1 - severity * course, 0.2)
+)
+
+# Complete failure
+register_anomaly_kernel(
+    AnomalyType.OUTAGE.value, _constant,
+    lambda course, severity, noise: 1 - severity * course
+)
+
+# Gradual rise that does not recover within the event
+register_anomaly_kernel(
+    AnomalyType.DRIFT.value, _ramp,
+    lambda course, severity, noise: 1 + severity * course
+)
+
+# Sudden, sustained change of level
+register_anomaly_kernel(
+    AnomalyType.LEVEL_SHIFT.value, _constant,
+    lambda course, severity, noise: 1 + severity * course
+)
+
+# Noise that swells and fades with the event
+register_anomaly_kernel(
+    AnomalyType.VARIANCE_BURST.value, _envelope,
+    lambda course, severity, noise: np.maximum(1 + severity * course * noise, 0.1),
+    noisy=True
+)
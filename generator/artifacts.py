@@ -0,0 +1,151 @@
+"""
+Artifact Registry
+In-memory index of generated files for constant-time download lookups
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import mimetypes
+import threading
+import time
+
+from .generic_core import TimeGrid
+
+
+@dataclass
+class Artifact:
+    """A generated dataset and the files written for it"""
+    artifact_id: str
+    path: Path
+    mimetype: str
+    etag: str
+    size_bytes: int
+    created: float = field(default_factory=time.time)
+    metadata_path: Optional[Path] = None
+    
+    # Known for artifacts generated by this process
+    output_format: Optional[str] = None
+    grid: Optional[TimeGrid] = None
+    columns: Optional[List[str]] = None
+    store_path: Optional[Path] = None
+    
+    # Further downloadable files, such as anomaly labels
+    extra_paths: List[Path] = field(default_factory=list)
+    
+    @property
+    def files(self) -> List[Path]:
+        return [p for p in (self.path, self.metadata_path) if p is not None] + self.extra_paths
+
+
+def file_etag(path: Path) -> str:
+    """Validator derived from a file's size and modification time"""
+    stat = path.stat()
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+def guess_mimetype(path: Path) -> str:
+    """Media type from the file extension; compressed files are opaque"""
+    mimetype, encoding = mimetypes.guess_type(path.name)
+    if encoding is not None or mimetype is None:
+        return 'application/octet-stream'
+    return mimetype
+
+
+class ArtifactRegistry:
+    """Map artifact ids and file names to generated files
+    
+    Paths are stored resolved, so a lookup is a dictionary access that
+    does not depend on the working directory. Files written before the
+    process started are found once in ``search_dirs`` and then indexed. At most
+    ``max_entries`` artifacts are indexed; the oldest are forgotten first
+    (their files are left alone).
+    """
+    
+    def __init__(self, search_dirs: Optional[List[Path]] = None,
+                 max_entries: int = 10000):
+        self.search_dirs = [Path(d) for d in search_dirs or []]
+        self.max_entries = max_entries
+        self._artifacts: 'OrderedDict[str, Artifact]' = OrderedDict()
+        self._files: Dict[str, Tuple[str, Path]] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, artifact_id: str, path: Path,
+                 metadata_path: Optional[Path] = None,
+                 mimetype: Optional[str] = None,
+                 output_format: Optional[str] = None,
+                 grid: Optional[TimeGrid] = None,
+                 columns: Optional[List[str]] = None,
+                 store_path: Optional[Path] = None,
+                 extra_paths: Optional[List[Path]] = None) -> Artifact:
+        """Index a finished artifact; replaces an earlier one with the same id"""
+        path = Path(path).resolve()
+        if metadata_path is not None:
+            metadata_path = Path(metadata_path).resolve()
+        artifact = Artifact(
+            artifact_id=artifact_id,
+            path=path,
+            mimetype=mimetype or guess_mimetype(path),
+            etag=file_etag(path),
+            size_bytes=path.stat().st_size,
+            metadata_path=metadata_path,
+            output_format=output_format,
+            grid=grid,
+            columns=list(columns) if columns is not None else None,
+            store_path=Path(store_path).resolve() if store_path is not None else None,
+            extra_paths=[Path(p).resolve() for p in extra_paths or []]
+        )
+        with self._lock:
+            if artifact_id in self._artifacts:
+                self._drop(artifact_id)
+            self._artifacts[artifact_id] = artifact
+            for p in artifact.files:
+                self._files[p.name] = (artifact_id, p)
+            while len(self._artifacts) > self.max_entries:
+                self._drop(next(iter(self._artifacts)))
+        return artifact
+    
+    def get(self, artifact_id: str) -> Optional[Artifact]:
+        """Artifact by id, or None if unknown or its file is gone"""
+        with self._lock:
+            artifact = self._artifacts.get(artifact_id)
+            if artifact is not None and not artifact.path.exists():
+                self._drop(artifact_id)
+                return None
+            return artifact
+    
+    def find(self, filename: str) -> Optional[Tuple[Artifact, Path]]:
+        """Artifact owning a file name and the file's path"""
+        with self._lock:
+            entry = self._files.get(filename)
+        if entry is not None:
+            artifact = self.get(entry[0])
+            if artifact is not None and entry[1].exists():
+                return artifact, entry[1]
+            return None
+        
+        # Not generated by this process, look in the known directories
+        # once and index what is found
+        if Path(filename).name != filename:
+            return None
+        for directory in self.search_dirs:
+            path = directory / filename
+            if path.is_file():
+                artifact = self.register(filename, path)
+                return artifact, artifact.path
+        return None
+    
+    def remove(self, artifact_id: str) -> None:
+        with self._lock:
+            if artifact_id in self._artifacts:
+                self._drop(artifact_id)
+    
+    def __len__(self) -> int:
+        return len(self._artifacts)
+    
+    def _drop(self, artifact_id: str) -> None:
+        artifact = self._artifacts.pop(artifact_id)
+        for p in artifact.files:
+            if self._files.get(p.name, (None,))[0] == artifact_id:
+                del self._files[p.name]
@@ -0,0 +1,136 @@
+"""
+Result Cache
+Content-addressed reuse of generated artifacts for identical configurations
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import shutil
+import threading
+import time
+
+from .domain_schema import GeneratorConfig
+
+
+def config_key(config: GeneratorConfig, version: str) -> str:
+    """Canonical hash of a configuration and the generator version"""
+    canonical = json.dumps(
+        {'version': version, 'config': config.to_dict()},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """LRU index of generated artifacts and their API payloads
+    
+    Generation is deterministic given the seed, so a payload can be
+    reused as long as the files it points to still exist; unseeded
+    configurations are never cached. Entries are
+    evicted least recently used first once ``max_entries`` or
+    ``max_bytes`` (summed over the cached files and directories) is
+    exceeded; evicting an entry deletes its files.
+    """
+    
+    def __init__(self, max_entries: int = 128, max_bytes: int = 1 << 30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached payload for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not all(p.exists() for p in entry['files']):
+                # Files were removed behind our back
+                self._drop(key, delete=True)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry['last_access'] = time.time()
+            self.hits += 1
+            # Payloads are treated as read-only, a shallow copy is enough
+            return dict(entry['payload'])
+    
+    def __contains__(self, key: str) -> bool:
+        """Whether a key is cached, without counting a hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and all(p.exists() for p in entry['files'])
+    
+    def put(self, key: str, payload: Dict[str, Any], files: List[Path]) -> None:
+        """Remember the payload and the files backing it"""
+        files = [Path(p) for p in files]
+        size = sum(_disk_size(p) for p in files if p.exists())
+        with self._lock:
+            if key in self._entries:
+                old = self._entries[key]
+                self._drop(key, delete=old['files'] != files)
+            now = time.time()
+            self._entries[key] = {
+                'payload': payload,
+                'files': files,
+                'size_bytes': size,
+                'created': now,
+                'last_access': now
+            }
+            self.total_bytes += size
+            self._evict()
+    
+    def clear(self, delete_files: bool = False) -> None:
+        """Forget every entry, optionally deleting the cached files"""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key, delete=delete_files)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+    
+    def _evict(self) -> None:
+        # Always keep the newest entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or self.total_bytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            self._drop(key, delete=True)
+            self.evictions += 1
+    
+    def _drop(self, key: str, delete: bool) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry['size_bytes']
+        if delete:
+            for path in entry['files']:
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+
+
+def _disk_size(path: Path) -> int:
+    """Size of a file, or of all files below a directory"""
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+    return path.stat().st_size
@@ -0,0 +1,126 @@
+"""
+Column Store
+Column-major .npy copy of a dataset for memory-mapped reads
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import numpy as np
+import pandas as pd
+
+from .generic_core import TimeGrid
+from .readers import ChunkReader
+from .writers import ChunkWriter
+
+
+class ColumnStoreWriter(ChunkWriter):
+    """Write every metric column to its own .npy file in ``directory``
+    
+    Timestamps are not stored; ``store.json`` records the time grid
+    instead. Files are allocated to their full length up front and each
+    chunk is written at its row offset, so only one file is open at a
+    time however many columns there are.
+    """
+    
+    manifest = 'store.json'
+    
+    def __init__(self, directory: Path, grid: TimeGrid):
+        super().__init__(directory)
+        self.grid = grid
+        self._columns: List[str] = []
+        self._files: Dict[str, Tuple[Path, int, np.dtype]] = {}
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        if not self._files:
+            self._allocate(chunk)
+        lo = self.rows_written
+        for name in self._columns:
+            path, offset, dtype = self._files[name]
+            values = np.ascontiguousarray(chunk[name].to_numpy(dtype=dtype))
+            with open(path, 'r+b') as f:
+                f.seek(offset + lo * dtype.itemsize)
+                f.write(values.data)
+    
+    def _allocate(self, chunk: pd.DataFrame) -> None:
+        self.filepath.mkdir(parents=True, exist_ok=True)
+        self._columns = [str(name) for name in chunk.columns if name != 'timestamp']
+        for i, name in enumerate(self._columns):
+            path = self.filepath / f'{i:05d}.npy'
+            dtype = chunk[name].to_numpy().dtype
+            array = np.lib.format.open_memmap(
+                path, mode='w+', dtype=dtype, shape=(self.grid.n_windows,)
+            )
+            self._files[name] = (path, array.offset, dtype)
+            del array
+    
+    def close(self) -> None:
+        self.filepath.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'start': self.grid.start.isoformat(),
+            'step_ns': int(self.grid.step.value),
+            'rows': self.rows_written,
+            'columns': [
+                {'name': name, 'file': self._files[name][0].name,
+                 'dtype': self._files[name][2].str}
+                for name in self._columns
+            ]
+        }
+        with open(self.filepath / self.manifest, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+class ColumnStore:
+    """Read-only view of a directory written by ColumnStoreWriter"""
+    
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        with open(self.directory / ColumnStoreWriter.manifest) as f:
+            manifest = json.load(f)
+        self.grid = TimeGrid(
+            pd.Timestamp(manifest['start']),
+            pd.Timedelta(manifest['step_ns'], unit='ns'),
+            manifest['rows']
+        )
+        self._files = {entry['name']: entry['file'] for entry in manifest['columns']}
+        self.columns = list(self._files)
+    
+    @property
+    def num_rows(self) -> int:
+        return self.grid.n_windows
+    
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped values of one column"""
+        if name not in self._files:
+            raise KeyError(f"Unknown column '{name}'")
+        array = np.load(self.directory / self._files[name], mmap_mode='r')
+        return array[:self.num_rows]
+    
+    def frame(self, start: int = 0, stop: Optional[int] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rows ``[start, stop)`` with their timestamps
+        
+        Only the pages backing those rows are read.
+        """
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        start = min(start, stop)
+        data = {'timestamp': self.grid.timestamps(start, stop)}
+        for name in columns or self.columns:
+            data[name] = np.array(self.column(name)[start:stop])
+        return pd.DataFrame(data)
+
+
+class ColumnStoreReader(ChunkReader):
+    """ChunkReader over a column store, starting directly at ``start_row``"""
+    
+    chunk_rows = 65536
+    
+    def _frames(self, start_row: int,
+                stop_row: Optional[int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        store = ColumnStore(self.filepath)
+        columns = [
+            col for col in self.selected_columns or store.columns if col != 'timestamp'
+        ]
+        stop_row = store.num_rows if stop_row is None else min(stop_row, store.num_rows)
+        for lo in range(start_row, stop_row, self.chunk_rows):
+            yield lo, store.frame(lo, min(lo + self.chunk_rows, stop_row), columns)
@@ -0,0 +1,638 @@
+"""
+Generation Cost Model
+Calibrated estimates of time, memory and output size per stage and format
+"""
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import math
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+from .domain_schema import (
+    AnomalyConfig, ARIMAConfig, ChangePointConfig, CorrelationConfig, DependencyConfig,
+    DistributionConfig, DistributionType, EntityConfig, GeneratorConfig, MetricConfig,
+    OutputConfig, SeasonalityConfig, TimeWindowConfig
+)
+from .generic_core import DependencyIndex, SyntheticDataGenerator, _correlation_components
+from .profiling import StageProfiler
+from .writers import get_writer_class
+
+# Pipeline stages in the order they run; writing is split by format
+STAGES = ('setup', 'distributions', 'correlation', 'seasonality', 'arima',
+          'propagation', 'change_points', 'anomalies', 'summary', 'column_store', 'writing')
+
+# Output variants measured by ``calibrate``: (format, compression)
+FORMAT_VARIANTS = (
+    ('csv', None), ('csv', 'gzip'), ('csv', 'zstd'),
+    ('json', None),
+    ('ndjson', None), ('ndjson', 'gzip'), ('ndjson', 'zstd'),
+    ('parquet', None), ('parquet', 'snappy'), ('parquet', 'zstd'),
+)
+
+# Values buffered for exact quantiles before SummaryStatistics switches
+# to the digest (its default exact_limit)
+EXACT_LIMIT = 1 << 22
+
+# Coefficients fitted with ``calibrate()`` on the reference host; a host
+# calibration replaces them when one is configured
+REFERENCE_PATH = Path(__file__).with_name('cost_reference.json')
+
+
+def format_key(output_format: str, output: Optional[OutputConfig] = None) -> str:
+    """Cost table key of a format and the compression an OutputConfig selects"""
+    compress = output is None or output.compress
+    codec = output.compression if output is not None else None
+    if output_format == 'parquet':
+        codec = (codec or 'snappy') if compress else None
+    elif not compress:
+        codec = None
+    return f'{output_format}+{codec}' if codec else output_format
+
+
+@dataclass
+class Workload:
+    """Cost drivers of a configuration, per stage"""
+    rows: int
+    metrics: int
+    block_rows: int
+    chunk_rows: int
+    features: Dict[str, Dict[str, float]]
+    widths: Dict[str, int]
+    summary_buffer_cells: int
+    summary_switches: bool
+    column_store: bool
+    # Characters of all column names; records repeat them on every row
+    name_chars: int = 0
+    
+    @property
+    def size_features(self) -> Dict[str, float]:
+        """Drivers of the output size of any format"""
+        return {'cells': self.rows * self.metrics, 'rows': self.rows,
+                'names': self.rows * self.name_chars}
+    
+    @classmethod
+    def from_config(cls, config: GeneratorConfig) -> 'Workload':
+        """Drivers of ``config`` from the generator's plan, without generating
+        
+        Scheduled anomalies enter with their expected counts and durations
+        instead of being drawn, so estimating a schedule costs nothing per
+        event. Raises ValueError for configurations the generator rejects.
+        """
+        generator = SyntheticDataGenerator(replace(config, anomaly_schedule=[]))
+        output = config.output
+        n = generator.num_windows
+        m = len(generator.columns)
+        block_rows = generator.block_rows
+        blocks = math.ceil(n / block_rows)
+        chunk_rows = (output.chunk_size if output and output.chunk_size else block_rows)
+        shards = generator.shards
+        calls = blocks * len(shards)
+        
+        # Distribution cost depends on the sampler, one feature per type
+        by_type: Dict[str, int] = {}
+        for _, metric in generator.metric_specs:
+            name = f'cells:{metric.distribution.type.lower()}'
+            by_type[name] = by_type.get(name, 0) + n
+        features = {'distributions': dict(by_type, metric_calls=blocks * m)}
+        
+        # The copula sorts every correlated column and multiplies by the
+        # Cholesky factor of each connected component
+        sum_k = sum_k2 = k_max = 0
+        for shard in shards:
+            index = {key: i for i, key in enumerate(shard.columns)}
+            pairs = tuple(
+                (index[c.source], index[c.target], c.coefficient)
+                for c in shard.correlations if c.source in index and c.target in index
+            )
+            for columns, _ in _correlation_components(pairs):
+                sum_k += len(columns)
+                sum_k2 += len(columns) ** 2
+                k_max = max(k_max, len(columns))
+        features['correlation'] = {'cells': n * sum_k, 'matmul': n * sum_k2}
+        
+        seasonality = config.seasonality
+        if seasonality:
+            items = seasonality if isinstance(seasonality, list) else [seasonality]
+            harmonics = sum(item.harmonics for item in items)
+            features['seasonality'] = {'cells': n * m * harmonics, 'calls': calls}
+        if config.arima:
+            order = config.arima.ar_order + config.arima.ma_order
+            features['arima'] = {'cells': n * m, 'order_cells': n * m * order, 'calls': calls}
+        edges = sum(len(shard.causal.parents) for shard in shards if shard.causal)
+        if edges:
+            graphs = sum(1 for shard in shards if shard.causal)
+            features['propagation'] = {'cells': n * edges, 'calls': blocks * graphs}
+        if config.change_points:
+            known = set(generator.columns)
+            affected = sum(
+                sum(1 for name in cp.affected_metrics if name in known)
+                for cp in config.change_points
+            )
+            features['change_points'] = {
+                'cells': n * affected, 'calls': calls * len(config.change_points)
+            }
+        # The pattern is evaluated once per affected row. Events on one
+        # column are applied in bulk, each propagating one as a block over
+        # every dependent it reaches
+        counts = np.zeros(len(shards))
+        spreading = np.zeros(len(shards))
+        rows = cells = 0.0
+        for k, shard in enumerate(shards):
+            events = shard.events
+            durations = events.end - events.start
+            counts[k] = len(events)
+            rows += float(durations.sum())
+            cells += float(durations.sum())
+            for i in np.flatnonzero(events.max_hops != 0):
+                hops = None if events.max_hops[i] < 0 else int(events.max_hops[i])
+                reached = shard.dependency_index.reachable(
+                    shard.columns[events.epicenter[i]], hops
+                )[0]
+                cells += int(durations[i]) * (len(reached) - 1)
+                spreading[k] += 1
+        if config.anomaly_schedule:
+            # Dependencies never cross shards, so reach over all columns
+            # is reach within the shard
+            shard_of = {name: k for k, shard in enumerate(shards) for name in shard.columns}
+            dependencies = DependencyIndex(generator.columns, config.dependencies)
+        for schedule in config.anomaly_schedule:
+            expected = _expected_schedule(schedule, generator, shard_of, dependencies)
+            counts += expected['events']
+            spreading += expected['spreading']
+            rows += expected['rows']
+            cells += expected['cells']
+        if counts.sum() > 0:
+            calls = blocks * float(np.sum((spreading + 1) * (counts > 0)))
+            features['anomalies'] = {'rows': rows, 'cells': cells, 'calls': calls}
+        
+        chunks = math.ceil(n / chunk_rows)
+        features['summary'] = {'cells': n * m, 'chunks': chunks}
+        column_store = output is None or output.column_store
+        if column_store:
+            features['column_store'] = {'cells': n * m, 'column_chunks': chunks * m}
+        name_chars = sum(len(name) for name in generator.columns)
+        features['writing'] = {'cells': n * m, 'rows': n, 'chunks': chunks,
+                               'names': n * name_chars}
+        
+        # Rows held by one pipeline step times the columns it works on
+        widest = max((len(shard.columns) for shard in shards), default=0)
+        block = min(n, block_rows)
+        widths = {
+            'distributions': block, 'correlation': block * k_max,
+            'seasonality': block * widest, 'arima': block * widest,
+            'propagation': block,
+            'change_points': block * widest, 'anomalies': block * widest,
+            'summary': min(n, chunk_rows) * m, 'column_store': min(n, chunk_rows)
+        }
+        features['setup'] = {'runs': 1, 'metrics': m, 'shards': len(shards)}
+        widths['setup'] = 0
+        
+        # Values buffered for exact quantiles; 'auto' sketches them instead
+        # once there are too many
+        method = output.statistics if output else None
+        if method == 'approximate':
+            buffered = 0
+        elif method == 'exact':
+            buffered = n * m
+        else:
+            buffered = min(n * m, EXACT_LIMIT)
+        switches = method in (None, 'auto') and n * m > EXACT_LIMIT
+        return cls(n, m, block_rows, chunk_rows, features, widths, buffered,
+                   switches, column_store, name_chars)
+
+
+def _expected_schedule(schedule: Any, generator: SyntheticDataGenerator,
+                       shard_of: Dict[str, int],
+                       dependencies: DependencyIndex) -> Dict[str, Any]:
+    """Expected events (and propagating events) per shard, rows and cells
+    of one anomaly schedule, as ``AnomalyScheduler`` would draw them
+    """
+    n = generator.num_windows
+    step_minutes = generator.grid.step.total_seconds() / 60
+    eligible = ([name for name in schedule.epicenters if name in shard_of]
+                if schedule.epicenters else list(generator.columns))
+    events = np.zeros(len(generator.shards))
+    spreading = np.zeros(len(generator.shards))
+    if not eligible or n == 0:
+        return {'events': events, 'spreading': spreading, 'rows': 0.0, 'cells': 0.0}
+    
+    count = schedule.rate_per_day * n * step_minutes / (24 * 60)
+    # Durations are rounded up to whole rows and cut at the end of the window
+    duration = min(max(schedule.mean_duration_minutes / step_minutes + 0.5, 1.0), n)
+    hops = None if schedule.max_hops is None else schedule.max_hops
+    reach = 0.0
+    for name in eligible:
+        k = shard_of[name]
+        events[k] += count / len(eligible)
+        if schedule.propagate and hops != 0:
+            spreading[k] += count / len(eligible)
+            reached = dependencies.reachable(name, hops)[0]
+            reach += (len(reached) - 1) / len(eligible)
+    rows = count * duration
+    return {'events': events, 'spreading': spreading, 'rows': rows,
+            'cells': rows * (1 + reach)}
+
+
+@dataclass
+class CostEstimate:
+    """Predicted cost of generating one configuration
+    
+    ``output_size_mb`` is everything written: the data file plus the
+    column store when one is written.
+    """
+    rows: int
+    seconds: float
+    peak_memory_mb: float
+    output_size_mb: float
+    output_format: str
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    formats: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    calibrated: bool = False
+    file_size_mb: float = 0.0
+    column_store_mb: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'seconds': round(self.seconds, 3),
+            'peak_memory_mb': round(self.peak_memory_mb, 2),
+            'output_size_mb': round(self.output_size_mb, 2),
+            'file_size_mb': round(self.file_size_mb, 2),
+            'column_store_mb': round(self.column_store_mb, 2),
+            'output_format': self.output_format,
+            'stages': {
+                name: {key: round(value, 3) for key, value in stage.items()}
+                for name, stage in self.stages.items()
+            },
+            'formats': {
+                name: {key: round(value, 3) for key, value in entry.items()}
+                for name, entry in self.formats.items()
+            },
+            'calibrated': self.calibrated
+        }
+
+
+class CostModel:
+    """Linear cost model over the drivers in ``Workload``
+    
+    Time per stage is a non-negative combination of that stage's
+    features. Working memory (traced Python allocations, above the
+    process baseline) is the resident block, chunk and statistics
+    buffers plus the largest single-stage increment. Output size is
+    bytes per cell plus bytes per row for each format variant.
+    """
+    
+    def __init__(self, coefficients: Dict[str, Any], calibrated: bool = False):
+        self.coefficients = coefficients
+        self.calibrated = calibrated
+    
+    @classmethod
+    def reference(cls) -> 'CostModel':
+        with open(REFERENCE_PATH) as f:
+            return cls(json.load(f))
+    
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> 'CostModel':
+        """Host calibration at ``path``, or the reference model without one"""
+        if path is not None and Path(path).is_file():
+            with open(path) as f:
+                return cls(json.load(f), calibrated=True)
+        return cls.reference()
+    
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.coefficients, f, indent=2)
+    
+    def estimate(self, config: GeneratorConfig,
+                 output_formats: Optional[List[str]] = None) -> CostEstimate:
+        """Cost of generating ``config`` in its configured output format
+        
+        ``formats`` of the result covers ``output_formats`` as well, with
+        the configured compression applied to each.
+        """
+        workload = Workload.from_config(config)
+        output = config.output
+        output_format = output.format if output else 'csv'
+        key = format_key(output_format, output)
+        
+        stages = {}
+        for stage, features in workload.features.items():
+            if stage == 'writing':
+                continue
+            stages[stage] = {
+                'seconds': self._seconds(stage, features),
+                'peak_mb': self._stage_memory(stage, workload) / (1 << 20)
+            }
+        formats = {}
+        for fmt in dict.fromkeys([output_format] + list(output_formats or [])):
+            variant = format_key(fmt, output)
+            formats[fmt] = {
+                'seconds': self._seconds(f'writing:{self._variant(variant)}',
+                                         workload.features['writing']),
+                'size_mb': self._size(variant, workload) / (1 << 20)
+            }
+        stages['writing'] = {
+            'seconds': formats[output_format]['seconds'],
+            'peak_mb': self._stage_memory(f'writing:{self._variant(key)}', workload) / (1 << 20)
+        }
+        
+        memory = self.coefficients.get('memory', {})
+        resident = 8 * workload.metrics * memory.get('resident', 2.0) * min(
+            workload.rows, workload.block_rows
+        ) / (1 << 20)
+        buffer = 8 * workload.summary_buffer_cells / (1 << 20)
+        largest_stage = max(stage['peak_mb'] for stage in stages.values())
+        if workload.summary_switches:
+            # Sketching the buffer when switching briefly copies it once more
+            peak = resident + 2 * buffer + largest_stage
+        else:
+            # Exact quantiles concatenate the buffer and partition a copy
+            peak = max(resident + buffer + largest_stage, 3 * buffer)
+        file_size = formats[output_format]['size_mb']
+        store_size = 0.0
+        if workload.column_store:
+            # One float64 .npy file per metric
+            store_size = 8 * workload.rows * workload.metrics / (1 << 20)
+        return CostEstimate(
+            rows=workload.rows,
+            seconds=sum(stage['seconds'] for stage in stages.values()),
+            peak_memory_mb=peak,
+            output_size_mb=file_size + store_size,
+            output_format=key,
+            stages=stages,
+            formats=formats,
+            calibrated=self.calibrated,
+            file_size_mb=file_size,
+            column_store_mb=store_size
+        )
+    
+    def _seconds(self, stage: str, features: Dict[str, float]) -> float:
+        coefficients = self.coefficients.get('time', {}).get(stage, {})
+        return sum(coefficients.get(name, 0.0) * value for name, value in features.items())
+    
+    def _stage_memory(self, stage: str, workload: Workload) -> float:
+        per_unit = self.coefficients.get('memory', {}).get('stages', {}).get(stage, 0.0)
+        if stage.startswith('writing:'):
+            variant = stage.split(':', 1)[1]
+            return per_unit * _chunk_bytes(workload, self._size(variant, workload))
+        return per_unit * workload.widths[stage.split(':')[0]]
+    
+    def _size(self, variant: str, workload: Workload) -> float:
+        size = dict({'cells': 8.0}, **self.coefficients.get('size', {}).get(
+            self._variant(variant), {}
+        ))
+        return sum(size.get(name, 0.0) * value
+                   for name, value in workload.size_features.items())
+    
+    def _variant(self, variant: str) -> str:
+        """Closest calibrated variant: same format, then uncompressed"""
+        known = self.coefficients.get('size', {})
+        if variant in known or not known:
+            return variant
+        output_format = variant.split('+')[0]
+        if output_format in known:
+            return output_format
+        return next((key for key in known if key.startswith(output_format)), variant)
+
+
+def _chunk_bytes(workload: Workload, file_size: float) -> float:
+    """Output bytes of one chunk; writers hold about that much, encoded"""
+    return min(workload.rows, workload.chunk_rows) * file_size / max(workload.rows, 1)
+
+
+def _calibration_config(rows: int, entities: int, metrics_per_entity: int,
+                        chain: str, arima: Tuple[int, int], harmonics: int,
+                        change_points: int, anomalies: int,
+                        dependencies: int, long_names: bool = False) -> GeneratorConfig:
+    """Workload for one calibration run
+    
+    ``chain`` correlates metrics within each entity ('entity'), across all
+    metrics as one component ('all') or not at all ('none').
+    ``dependencies`` lagged edges form a tree over the metrics, along
+    which every other anomaly propagates. ``long_names`` gives metrics
+    descriptive names, which text records repeat on every row.
+    """
+    start = datetime(2024, 1, 1)
+    types = [t.value for t in DistributionType]
+    entity_list = []
+    columns = []
+    for e in range(entities):
+        entity = EntityConfig(entity_id=f'E{e}', entity_type='node')
+        for m in range(metrics_per_entity):
+            kind = types[(e * metrics_per_entity + m) % len(types)]
+            name = f'{kind}_response_time_ms_{m}' if long_names else f'm{m}'
+            entity.metrics.append(MetricConfig(
+                name=name, display_name=name,
+                distribution=DistributionConfig(
+                    type=kind, mean=50.0, std=10.0, min_value=0.0, max_value=100.0
+                )
+            ))
+            columns.append(f'E{e}_{name}')
+        entity_list.append(entity)
+    correlations = []
+    for i in range(1, len(columns)):
+        same_entity = columns[i].split('_')[0] == columns[i - 1].split('_')[0]
+        if chain == 'all' or (chain == 'entity' and same_entity):
+            correlations.append(CorrelationConfig(
+                source=columns[i - 1], target=columns[i], coefficient=0.5
+            ))
+    p, q = arima
+    return GeneratorConfig(
+        seed=7,
+        entities=entity_list,
+        time_window=TimeWindowConfig(
+            start_time=start, end_time=start + timedelta(minutes=rows - 1),
+            granularity_minutes=1
+        ),
+        seasonality=[
+            SeasonalityConfig(period_hours=24, amplitude=0.2, harmonics=harmonics)
+        ] if harmonics else None,
+        arima=ARIMAConfig(
+            ar_order=p, ma_order=q, ar_coef=[0.4 / (i + 1) for i in range(p)],
+            ma_coef=[0.2 / (i + 1) for i in range(q)]
+        ) if p or q else None,
+        correlations=correlations,
+        dependencies=[
+            DependencyConfig(parent=columns[k // 8], child=columns[k + 1],
+                             influence_factor=0.5, delay_minutes=5 * (k % 4))
+            for k in range(min(dependencies, len(columns) - 1))
+        ],
+        change_points=[
+            ChangePointConfig(
+                change_id=f'C{i}', change_type='ramp' if i % 2 else 'step',
+                affected_metrics=columns[i::max(change_points, 1)],
+                start_time=start + timedelta(minutes=rows * (i + 1) // (change_points + 1)),
+                duration_minutes=60, magnitude=0.1
+            )
+            for i in range(change_points)
+        ],
+        anomalies=[
+            AnomalyConfig(
+                anomaly_id=f'A{i}', anomaly_type='spike',
+                start_time=start + timedelta(minutes=rows * i // anomalies),
+                duration_minutes=600 if i % 2 else 30, severity=2.0,
+                epicenter=columns[i % len(columns)],
+                propagate=i % 2 == 1
+            )
+            for i in range(anomalies)
+        ],
+        output=OutputConfig(chunk_size=65536)
+    )
+
+
+# (rows, entities, metrics per entity, correlation, ARIMA order, harmonics,
+#  change points, anomalies, dependencies, long metric names, write every
+#  format variant)
+CALIBRATION_RUNS = (
+    (65536, 4, 10, 'entity', (1, 1), 1, 2, 100, 20, False, True),
+    (131072, 1, 10, 'entity', (3, 2), 3, 1, 500, 9, True, True),
+    (32768, 12, 10, 'all', (2, 0), 2, 4, 2000, 100, True, True),
+    (65536, 150, 1, 'none', (1, 0), 1, 0, 0, 0, False, False),
+    (98304, 2, 30, 'entity', (0, 1), 0, 8, 50, 30, False, False),
+)
+
+
+def _profile_run(config: GeneratorConfig, directory: Path, write_formats: bool,
+                 track_memory: bool) -> Tuple[Workload, SyntheticDataGenerator,
+                                              Dict[str, Path], float]:
+    """Generate, write and summarize ``config`` the way the API does, profiled
+    
+    Returns the workload, the generator with its profiler, the file of
+    every written format variant and the most memory held between
+    chunks (less the statistics buffer).
+    """
+    from .column_store import ColumnStoreWriter
+    from .downsample import LTTBSampler
+    from .summary import SummaryStatistics
+    
+    workload = Workload.from_config(config)
+    profiler = StageProfiler(track_memory=track_memory)
+    with profiler.measure('setup'):
+        generator = SyntheticDataGenerator(config)
+    generator.profiler = profiler
+    directory.mkdir(parents=True, exist_ok=True)
+    writers = {}
+    for fmt, codec in FORMAT_VARIANTS if write_formats else ():
+        output = OutputConfig(format=fmt, compress=codec is not None, compression=codec)
+        key = format_key(fmt, output)
+        path = directory / f'{key}.{get_writer_class(fmt).extension_for(output)}'
+        writers[key] = (get_writer_class(fmt).from_config(path, output), path)
+    store = ColumnStoreWriter(directory / 'store', generator.grid)
+    statistics = None
+    sampler = LTTBSampler(workload.rows, 100)
+    largest = 0
+    with profiler:
+        for chunk in generator.generate_chunks():
+            for key, (writer, _) in writers.items():
+                with profiler.measure(f'writing:{key}'):
+                    writer.write(chunk)
+            with profiler.measure('column_store'):
+                store.write(chunk)
+            with profiler.measure('summary'):
+                values = chunk.drop(columns='timestamp').to_numpy(dtype=float)
+                if statistics is None:
+                    statistics = SummaryStatistics(list(chunk.columns[1:]))
+                statistics.add(values)
+                sampler.add(values, chunk['timestamp'].to_numpy())
+            if track_memory:
+                buffered = statistics.count * workload.metrics if statistics.exact else 0
+                largest = max(largest, tracemalloc.get_traced_memory()[0] - 8 * buffered)
+        with profiler.measure('summary'):
+            statistics.result()
+            sampler.result()
+    for writer, _ in writers.values():
+        writer.close()
+    store.close()
+    return workload, generator, {key: path for key, (_, path) in writers.items()}, largest
+
+
+def calibrate(scale: float = 1.0, workdir: Optional[Path] = None,
+              progress: Optional[Callable[[str], None]] = None) -> CostModel:
+    """Fit a cost model to profiled runs on this host
+    
+    Times come from runs without memory tracing, which would slow the
+    allocation-heavy stages; memory from traced runs on a quarter of the
+    rows, since it is modelled per cell of a block. ``scale`` multiplies
+    the row counts; the default takes about a minute on one core.
+    """
+    from scipy.optimize import nnls
+    
+    samples: Dict[str, List[Tuple[Dict[str, float], float]]] = {}
+    sizes: Dict[str, List[Tuple[Dict[str, float], float]]] = {}
+    stage_memory: Dict[str, float] = {}
+    resident = 0.0
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for i, (rows, *shape, write_formats) in enumerate(CALIBRATION_RUNS):
+            config = _calibration_config(max(int(rows * scale), 1024), *shape)
+            workload, generator, paths, _ = _profile_run(
+                config, Path(tmp) / f'time{i}', write_formats, track_memory=False
+            )
+            profiler = generator.profiler
+            
+            # Sampling cost differs by distribution, so that stage is fitted
+            # per metric rather than per run
+            blocks = workload.features['distributions']['metric_calls'] / workload.metrics
+            for key, metric in generator.metric_specs:
+                timing = profiler.metrics[key]['distributions']
+                features = {f'cells:{metric.distribution.type.lower()}': workload.rows,
+                            'metric_calls': blocks}
+                samples.setdefault('distributions', []).append((features, timing.wall_seconds))
+            for stage, timing in profiler.stages.items():
+                features = workload.features.get(stage.split(':')[0])
+                if features is not None and stage != 'distributions':
+                    samples.setdefault(stage, []).append((features, timing.wall_seconds))
+            for key, path in paths.items():
+                sizes.setdefault(key, []).append((workload.size_features, path.stat().st_size))
+            
+            config = _calibration_config(max(int(rows * scale / 4), 1024), *shape)
+            workload, generator, paths, largest = _profile_run(
+                config, Path(tmp) / f'memory{i}', write_formats, track_memory=True
+            )
+            # Files are written at every size, so these runs fit sizes too
+            for key, path in paths.items():
+                sizes.setdefault(key, []).append((workload.size_features, path.stat().st_size))
+            for stage, timing in generator.profiler.stages.items():
+                if stage.startswith('writing:'):
+                    width = _chunk_bytes(workload, paths[stage.split(':', 1)[1]].stat().st_size)
+                else:
+                    width = workload.widths.get(stage.split(':')[0], 0)
+                if width:
+                    stage_memory[stage] = max(stage_memory.get(stage, 0.0),
+                                              timing.peak_bytes / width)
+            if not paths:
+                # Writers keep buffers of their own, so only runs without
+                # them show the pipeline's memory per cell of a block
+                block = 8 * workload.metrics * min(workload.rows, workload.block_rows)
+                resident = max(resident, largest / block)
+            if progress:
+                progress(f'run {i + 1}/{len(CALIBRATION_RUNS)}: {workload.rows} rows x '
+                         f'{workload.metrics} metrics')
+    
+    def fit(observations: List[Tuple[Dict[str, float], float]]) -> Dict[str, float]:
+        names = sorted({name for features, _ in observations for name in features})
+        matrix = np.array([[features.get(name, 0.0) for name in names]
+                           for features, _ in observations], dtype=float)
+        target = np.array([value for _, value in observations], dtype=float)
+        # Scale columns so the solver sees comparable magnitudes
+        norms = np.maximum(np.abs(matrix).max(axis=0), 1e-12)
+        solution, _ = nnls(matrix / norms, target)
+        return {name: float(c) for name, c in zip(names, solution / norms) if c > 0}
+    
+    import pyarrow
+    
+    coefficients = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': {'numpy': np.__version__, 'pyarrow': pyarrow.__version__},
+        'time': {stage: fit(observations) for stage, observations in samples.items()},
+        'memory': {'resident': resident, 'stages': stage_memory},
+        'size': {key: fit(observations) for key, observations in sizes.items()}
+    }
+    return CostModel(coefficients, calibrated=True)
@@ -30,6 +30,8 @@ class AnomalyType(str, Enum):
     DEGRADATION = "degradation"
     OUTAGE = "outage"
     DRIFT = "drift"
+    LEVEL_SHIFT = "level_shift"
+    VARIANCE_BURST = "variance_burst"
 
 
 class ChangeType(str, Enum):
@@ -124,7 +126,12 @@ class EntityConfig:
 
 @dataclass
 class CorrelationConfig:
-    """Correlation between metrics"""
+    """Correlation between metrics
+    
+    ``lag`` is the number of rows the target trails the source by (a
+    negative lag lets the target lead). Unlagged correlations are applied
+    through a Gaussian copula, lagged ones as causal propagation.
+    """
     source: str
     target: str
     coefficient: float
@@ -141,7 +148,11 @@ class CorrelationConfig:
 
 @dataclass
 class DependencyConfig:
-    """Causal dependency between metrics"""
+    """Causal dependency between metrics
+    
+    The child follows the parent ``delay_minutes`` later, correlating
+    with it at about ``influence_factor``; dependencies must form a DAG.
+    """
     parent: str
     child: str
     influence_factor: float
@@ -224,6 +235,10 @@ class AnomalyConfig:
     epicenter: str
     propagate: bool = False
     affected_entities: List[str] = field(default_factory=list)
+    # Dependency hops followed when propagating (None follows every
+    # dependent transitively); severity is scaled by the decay per hop
+    max_hops: Optional[int] = None
+    propagation_decay: float = 0.5
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -234,7 +249,44 @@ class AnomalyConfig:
             'severity': self.severity,
             'epicenter': self.epicenter,
             'propagate': self.propagate,
-            'affected_entities': self.affected_entities
+            'affected_entities': self.affected_entities,
+            'max_hops': self.max_hops,
+            'propagation_decay': self.propagation_decay
+        }
+
+
+@dataclass
+class AnomalyScheduleConfig:
+    """Anomalies of one type drawn at random instead of listed one by one
+    
+    Events arrive as a Poisson process at ``rate_per_day`` over the whole
+    run, each on a random epicenter (any metric column when ``epicenters``
+    is empty). Durations are log-normal around ``mean_duration_minutes``,
+    severities uniform between ``severity_min`` and ``severity_max``.
+    """
+    anomaly_type: str
+    rate_per_day: float
+    mean_duration_minutes: float = 30.0
+    duration_sigma: float = 0.5
+    severity_min: float = 0.2
+    severity_max: float = 0.8
+    epicenters: List[str] = field(default_factory=list)
+    propagate: bool = False
+    max_hops: Optional[int] = None
+    propagation_decay: float = 0.5
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'anomaly_type': self.anomaly_type,
+            'rate_per_day': self.rate_per_day,
+            'mean_duration_minutes': self.mean_duration_minutes,
+            'duration_sigma': self.duration_sigma,
+            'severity_min': self.severity_min,
+            'severity_max': self.severity_max,
+            'epicenters': self.epicenters,
+            'propagate': self.propagate,
+            'max_hops': self.max_hops,
+            'propagation_decay': self.propagation_decay
         }
 
 
@@ -283,13 +335,51 @@ class OutputConfig:
     include_metadata: bool = True
     chunk_size: Optional[int] = None
     
+    # Codec and level used when compress is set (format default if None)
+    compression: Optional[str] = None
+    compression_level: Optional[int] = None
+    
+    # Parquet encoding of float columns: dictionary, byte_stream_split, plain
+    float_encoding: Optional[str] = None
+    
+    # CSV float format (e.g. '%.6f') and NDJSON layout (records or columns)
+    float_format: Optional[str] = None
+    json_layout: Optional[str] = None
+    
+    # Summary quantiles: exact, approximate, or None to decide by size
+    statistics: Optional[str] = None
+    
+    # Point budget of the downsampled timeseries in the API response
+    timeseries_points: Optional[int] = None
+    
+    # Also keep a memory-mapped column store for viewing the results
+    column_store: bool = True
+    
+    # Report wall time, CPU time and peak memory per stage in the metadata;
+    # servers reject this unless ALLOW_PROFILING is set
+    profile: bool = False
+    
+    # Write ground-truth anomaly labels beside the data: a bitmask of the
+    # anomaly types active in each row and a table of the events
+    labels: bool = False
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'output_dir': self.output_dir,
             'format': self.format,
             'compress': self.compress,
             'include_metadata': self.include_metadata,
-            'chunk_size': self.chunk_size
+            'chunk_size': self.chunk_size,
+            'compression': self.compression,
+            'compression_level': self.compression_level,
+            'float_encoding': self.float_encoding,
+            'float_format': self.float_format,
+            'json_layout': self.json_layout,
+            'statistics': self.statistics,
+            'timeseries_points': self.timeseries_points,
+            'column_store': self.column_store,
+            'profile': self.profile,
+            'labels': self.labels
         }
 
 
@@ -300,12 +390,15 @@ class GeneratorConfig:
     domain_type: str = "custom"
     entities: List[EntityConfig] = field(default_factory=list)
     time_window: Optional[TimeWindowConfig] = None
-    seasonality: Optional[SeasonalityConfig] = None
+    # One pattern, or several (e.g. daily + weekly) whose terms add up
+    seasonality: Optional[Union[SeasonalityConfig, List[SeasonalityConfig]]] = None
     arima: Optional[ARIMAConfig] = None
     correlations: List[CorrelationConfig] = field(default_factory=list)
     dependencies: List[DependencyConfig] = field(default_factory=list)
     change_points: List[ChangePointConfig] = field(default_factory=list)
     anomalies: List[AnomalyConfig] = field(default_factory=list)
+    # Randomly drawn anomalies, applied after the listed ones
+    anomaly_schedule: List[AnomalyScheduleConfig] = field(default_factory=list)
     validation: Optional[ValidationConfig] = None
     output: Optional[OutputConfig] = None
     
@@ -318,7 +411,10 @@ class GeneratorConfig:
         if self.time_window:
             result['time_window'] = self.time_window.to_dict()
         if self.seasonality:
-            result['seasonality'] = self.seasonality.to_dict()
+            if isinstance(self.seasonality, list):
+                result['seasonality'] = [s.to_dict() for s in self.seasonality]
+            else:
+                result['seasonality'] = self.seasonality.to_dict()
         if self.arima:
             result['arima'] = self.arima.to_dict()
         if self.correlations:
@@ -329,6 +425,8 @@ class GeneratorConfig:
             result['change_points'] = [cp.to_dict() for cp in self.change_points]
         if self.anomalies:
             result['anomalies'] = [a.to_dict() for a in self.anomalies]
+        if self.anomaly_schedule:
+            result['anomaly_schedule'] = [s.to_dict() for s in self.anomaly_schedule]
         if self.validation:
             result['validation'] = self.validation.to_dict()
         if self.output:
@@ -390,7 +488,10 @@ class GeneratorConfig:
         seasonality = None
         if 'seasonality' in data and data['seasonality']:
             s_data = data['seasonality']
-            seasonality = SeasonalityConfig(**s_data)
+            if isinstance(s_data, list):
+                seasonality = [SeasonalityConfig(**s) for s in s_data]
+            else:
+                seasonality = SeasonalityConfig(**s_data)
         
         arima = None
         if 'arima' in data and data['arima']:
@@ -410,6 +511,10 @@ class GeneratorConfig:
             a_data['start_time'] = datetime.fromisoformat(a_data['start_time'])
             anomalies.append(AnomalyConfig(**a_data))
         
+        anomaly_schedule = [
+            AnomalyScheduleConfig(**s) for s in data.get('anomaly_schedule', [])
+        ]
+        
         validation = None
         if 'validation' in data and data['validation']:
             validation = ValidationConfig(**data['validation'])
@@ -429,6 +534,7 @@ class GeneratorConfig:
             dependencies=dependencies,
             change_points=change_points,
             anomalies=anomalies,
+            anomaly_schedule=anomaly_schedule,
             validation=validation,
             output=output
         )
\ No newline at end of file
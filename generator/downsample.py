@@ -0,0 +1,131 @@
+"""
+Downsampling
+Largest-Triangle-Three-Buckets selection of rows for plotting
+"""
+
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+class LTTBSampler:
+    """Largest-Triangle-Three-Buckets over many columns, fed chunk by chunk
+    
+    All columns share the kept rows so they plot against one time axis.
+    In every bucket the row forming the largest triangle in any column
+    wins, with areas scaled by each column's running range, so a spike in
+    a single column survives. Only the rows of the current and the next
+    bucket are buffered; every bucket is one vectorized step over all of
+    its rows and columns. Budgets below ``min_points`` are raised to it.
+    """
+    
+    # The first and last row plus at least one bucket
+    min_points = 3
+    
+    def __init__(self, num_rows: int, points: int):
+        self.num_rows = num_rows
+        self.points = max(points, self.min_points)
+        self._keep_all = self.points >= num_rows
+        if not self._keep_all:
+            # Bucket i holds rows [edges[i], edges[i + 1]); the first and
+            # last row are always kept on their own
+            every = (num_rows - 2) / (self.points - 2)
+            edges = (np.arange(self.points - 1) * every).astype(np.int64) + 1
+            edges[-1] = num_rows - 1
+            self._edges = np.append(edges, num_rows)
+        self._bucket = 0
+        self._offset = 0
+        self._values: Optional[np.ndarray] = None
+        self._keys: Optional[np.ndarray] = None
+        self._low = self._high = None
+        self._rows: List[int] = []
+        self._kept_values: List[np.ndarray] = []
+        self._kept_keys: List[np.ndarray] = []
+    
+    def add(self, values: np.ndarray, keys: np.ndarray) -> None:
+        """Append the next ``(rows, columns)`` values and their row keys
+        
+        ``keys`` (e.g. timestamps) are carried along and returned for the
+        kept rows.
+        """
+        if len(values) == 0:
+            return
+        if self._keep_all:
+            self._keep(np.arange(len(values)), values, keys, self._offset)
+            self._offset += len(values)
+            return
+        
+        if self._values is None:
+            self._low, self._high = values.min(axis=0), values.max(axis=0)
+            self._keep(np.array([0]), values, keys, 0)
+            self._values, self._keys = values, keys
+        else:
+            self._low = np.minimum(self._low, values.min(axis=0))
+            self._high = np.maximum(self._high, values.max(axis=0))
+            self._values = np.concatenate([self._values, values])
+            self._keys = np.concatenate([self._keys, keys])
+        self._select()
+    
+    def result(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Kept row numbers, keys and values, in row order"""
+        if not self._keep_all and self._values is not None:
+            # The last row seen closes the series
+            last = len(self._values) - 1
+            if self._rows[-1] < self._offset + last:
+                self._keep(np.array([last]), self._values, self._keys, self._offset)
+        if not self._rows:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty((0, 0))
+        return (
+            np.asarray(self._rows, dtype=np.int64),
+            np.concatenate(self._kept_keys),
+            np.concatenate(self._kept_values)
+        )
+    
+    def _select(self) -> None:
+        edges = self._edges
+        available = self._offset + len(self._values)
+        scale = self._high - self._low
+        scale[scale <= 0] = 1.0
+        
+        while self._bucket < self.points - 2 and edges[self._bucket + 2] <= available:
+            lo, hi, after = edges[self._bucket:self._bucket + 3] - self._offset
+            anchor_row = self._rows[-1] - self._offset
+            anchor = self._values[anchor_row]
+            # Average of the next bucket is the third corner
+            target = self._values[hi:after].mean(axis=0)
+            target_row = (hi + after - 1) / 2
+            
+            # Twice the triangle area is linear in the candidate's row and
+            # value: |b * y + d * x + k|, with the column scale folded in
+            b = (anchor_row - target_row) / scale
+            d = (target - anchor) / scale
+            k = -b * anchor - anchor_row * d
+            areas = self._values[lo:hi] * b
+            areas += np.multiply.outer(np.arange(lo, hi), d)
+            areas += k
+            np.abs(areas, out=areas)
+            # Without columns every row is as good; take the first
+            best = lo + int(np.argmax(areas.max(axis=1))) if areas.shape[1] else lo
+            self._keep(np.array([best]), self._values, self._keys, self._offset)
+            self._bucket += 1
+        
+        # Rows before the current bucket are no longer needed
+        start = edges[min(self._bucket, self.points - 2)] - self._offset
+        start = min(start, self._rows[-1] - self._offset)
+        if start > 0:
+            self._values = self._values[start:]
+            self._keys = self._keys[start:]
+            self._offset += start
+    
+    def _keep(self, rows: np.ndarray, values: np.ndarray, keys: np.ndarray,
+              offset: int) -> None:
+        self._rows.extend((rows + offset).tolist())
+        self._kept_values.append(values[rows].copy())
+        self._kept_keys.append(keys[rows].copy())
+
+
+def lttb(values: np.ndarray, points: int,
+         keys: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows of ``values`` kept by multi-column LTTB"""
+    sampler = LTTBSampler(len(values), points)
+    sampler.add(values, np.arange(len(values)) if keys is None else keys)
+    return sampler.result()[0]
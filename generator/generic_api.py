@@ -4,22 +4,144 @@ Domain-agnostic REST API with template support
 """
 
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import (Blueprint, Response, request, jsonify, send_file, current_app,
+                   stream_with_context)
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import contextlib
 import json
+import shutil
+import time
 import traceback
+import uuid
 
 # UPDATED IMPORTS - use relative imports
-from .domain_schema import GeneratorConfig
+from .domain_schema import GeneratorConfig, OutputConfig
 from .domain_templates import DomainTemplates
-from .generic_core import SyntheticDataGenerator
+from .generic_core import SyntheticDataGenerator, GENERATOR_VERSION, TimeGrid
+from .anomaly_kernels import ANOMALY_KERNELS, LABEL_BITS
+from .writers import (WRITERS, NDJSONChunkWriter, ParquetChunkWriter, TextChunkWriter,
+                      get_writer_class, stream_chunks)
+from .jobs import Job, JobCancelled, JobManager, JobQueueFull
+from .cache import ResultCache, config_key
+from .artifacts import Artifact, ArtifactRegistry
+from .summary import SummaryStatistics
+from .downsample import LTTBSampler
+from .readers import ChunkReader, get_reader_class
+from .column_store import ColumnStoreReader, ColumnStoreWriter
+from .metrics import GeneratorMetrics
+from .cost_model import CostEstimate, CostModel
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
 
+class _ChunkSummary:
+    """Preview, visualization sample and statistics gathered chunk by chunk"""
+    
+    preview_rows = 10
+    timeseries_points = 100
+    
+    def __init__(self, num_records: int, statistics: Optional[str] = None,
+                 timeseries_points: Optional[int] = None):
+        self.num_records = 0
+        self.columns = []
+        self.preview = []
+        self._statistics_method = statistics
+        self._statistics = None
+        
+        # Largest-Triangle-Three-Buckets keeps spikes that an evenly spaced
+        # sample would miss
+        self._sampler = LTTBSampler(
+            num_records, timeseries_points or self.timeseries_points
+        )
+    
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Fold one time-ordered chunk into the summary"""
+        if not self.columns:
+            self.columns = list(chunk.columns)
+            self._statistics = SummaryStatistics(
+                self.metric_columns, method=self._statistics_method
+            )
+        self.num_records += len(chunk)
+        
+        if len(self.preview) < self.preview_rows:
+            self.preview.extend(
+                chunk.head(self.preview_rows - len(self.preview)).to_dict('records')
+            )
+        
+        values = chunk[self.metric_columns].to_numpy(dtype=float)
+        self._statistics.add(values)
+        self._sampler.add(values, chunk['timestamp'].to_numpy())
+    
+    @property
+    def metric_columns(self) -> List[str]:
+        return [col for col in self.columns if col != 'timestamp']
+    
+    @property
+    def timeseries(self) -> List[dict]:
+        """Downsampled rows for visualizations"""
+        _, timestamps, values = self._sampler.result()
+        return _timeseries_records(self.metric_columns, timestamps, values)
+    
+    @property
+    def statistics_exact(self) -> bool:
+        """Whether the reported quantiles are exact"""
+        return self._statistics is None or self._statistics.exact
+    
+    def statistics(self) -> dict:
+        """Per-column summary statistics"""
+        if self._statistics is None:
+            return {}
+        return self._statistics.result()
+
+
+def _stage_hook(*hooks: Optional[Callable[[str, float], None]]
+                ) -> Optional[Callable[[str, float], None]]:
+    """One stage hook calling each of ``hooks`` that is set"""
+    hooks = [hook for hook in hooks if hook is not None]
+    if len(hooks) <= 1:
+        return hooks[0] if hooks else None
+    
+    def call_all(name: str, seconds: float) -> None:
+        for hook in hooks:
+            hook(name, seconds)
+    
+    return call_all
+
+
+def _optional_store(directory: Optional[Path], grid: TimeGrid):
+    """Column store writer for ``directory``, or a null context without one"""
+    if directory is None:
+        return contextlib.nullcontext()
+    return ColumnStoreWriter(directory, grid)
+
+
+def _label_paths(metadata: dict) -> List[Path]:
+    """Label and event files recorded in an artifact's metadata"""
+    labels = metadata.get('labels') or {}
+    return [Path(labels[key]) for key in ('labels_path', 'events_path') if key in labels]
+
+
+def _optional_writer(path: Optional[Path], writer_cls: type, output):
+    """Chunk writer for ``path``, or a null context without one"""
+    if path is None:
+        return contextlib.nullcontext()
+    return writer_cls.from_config(path, output)
+
+
+def _timeseries_records(columns: List[str], timestamps: np.ndarray,
+                        values: np.ndarray) -> List[dict]:
+    """Rows as records with the timestamp first"""
+    if len(timestamps) == 0:
+        return []
+    frame = pd.DataFrame(values, columns=columns)
+    frame.insert(0, 'timestamp', timestamps)
+    return frame.to_dict('records')
+
+
 @api_bp.route('/templates', methods=['GET'])
 def list_templates():
     """List all available domain templates"""
@@ -63,6 +185,399 @@ def get_template(domain_type):
         }), 500
 
 
+def _run_generation(config: GeneratorConfig, job: Optional[Job] = None,
+                    cache: Optional[ResultCache] = None,
+                    registry: Optional[ArtifactRegistry] = None,
+                    metrics: Optional[GeneratorMetrics] = None) -> dict:
+    """Generate, write and summarize a dataset
+    
+    Returns the ``/api/generate`` response payload. When run as a job,
+    stage timings and written rows are reported on ``job`` and
+    cancellation is honoured between stages and chunks. With a ``cache``,
+    identical seeded configurations reuse the earlier artifact. Written files
+    are indexed in ``registry`` for downloads, and stage latencies and
+    throughput are recorded in ``metrics``.
+    """
+    key = config_key(config, GENERATOR_VERSION)
+    suffix = key[:12]
+    if config.seed is None:
+        # Without a seed every request asks for fresh random data, written
+        # to files of its own
+        cache = None
+        suffix = uuid.uuid4().hex[:12]
+    
+    # Determine output format
+    output_format = config.output.format if config.output else 'csv'
+    writer_cls = get_writer_class(output_format)
+    
+    if cache is not None:
+        payload = cache.get(key)
+        if payload is not None:
+            if registry is not None and registry.get(payload['artifact_id']) is None:
+                # Forgotten by the registry while still cached
+                registry.register(
+                    payload['artifact_id'], payload['metadata']['file_path'],
+                    mimetype=writer_cls.mimetype_for(config.output),
+                    output_format=output_format,
+                    grid=TimeGrid.from_window(config.time_window),
+                    columns=payload['metadata']['columns'],
+                    store_path=payload['metadata']['column_store_path'],
+                    extra_paths=_label_paths(payload['metadata'])
+                )
+            payload['cache'] = {'hit': True, 'key': key}
+            if metrics is not None:
+                metrics.count('cached')
+            return payload
+    
+    # Stream generated chunks straight into the output file
+    output = config.output
+    generator = SyntheticDataGenerator(
+        config,
+        stage_hook=_stage_hook(
+            job.record_stage if job else None,
+            metrics.observe_stage if metrics else None
+        ),
+        profile=bool(output and output.profile)
+    )
+    if job:
+        job.rows_total = generator.num_windows
+    
+    output_dir = Path(config.output.output_dir if config.output else './output')
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    # The suffix keeps same-second runs of different configs apart
+    extension = writer_cls.extension_for(config.output)
+    filename = f'synthetic_data_{timestamp}_{suffix}.{extension}'
+    filepath = output_dir / filename
+    files = [filepath]
+    
+    summary = _ChunkSummary(
+        generator.num_windows,
+        statistics=output.statistics if output else None,
+        timeseries_points=output.timeseries_points if output else None
+    )
+    # Column-major copy for memory-mapped reads of the results
+    store_dir = None
+    if output is None or output.column_store:
+        store_dir = output_dir / f'columns_{timestamp}_{suffix}'
+        files.append(store_dir)
+    # Ground-truth anomaly labels per row, and the events behind them
+    labels_path = events_path = None
+    if output is not None and output.labels:
+        labels_path = output_dir / f'labels_{timestamp}_{suffix}.{extension}'
+        events_path = output_dir / f'events_{timestamp}_{suffix}.{extension}'
+        files += [labels_path, events_path]
+    
+    start = time.perf_counter()
+    try:
+        with writer_cls.from_config(filepath, config.output) as writer, \
+                _optional_store(store_dir, generator.grid) as store, \
+                _optional_writer(labels_path, writer_cls, config.output) as labels:
+            for chunk in generator.generate_chunks():
+                with generator.stage('writing'):
+                    writer.write(chunk)
+                    if store is not None:
+                        store.write(chunk)
+                    if labels is not None:
+                        labels.write(pd.DataFrame({
+                            'timestamp': chunk['timestamp'],
+                            'anomaly_labels': generator.labels(
+                                chunk.index[0], chunk.index[-1] + 1
+                            )
+                        }, index=chunk.index))
+                with generator.stage('summary'):
+                    summary.add(chunk)
+                if job:
+                    job.advance(len(chunk))
+        if events_path is not None:
+            with writer_cls.from_config(events_path, config.output) as events:
+                events.write(generator.event_table())
+    except BaseException as e:
+        # Don't leave a truncated file behind
+        filepath.unlink(missing_ok=True)
+        for path in (labels_path, events_path):
+            if path is not None:
+                path.unlink(missing_ok=True)
+        if store_dir is not None:
+            shutil.rmtree(store_dir, ignore_errors=True)
+        if metrics is not None:
+            metrics.count('cancelled' if isinstance(e, JobCancelled) else 'failed')
+        raise
+    seconds = time.perf_counter() - start
+    if metrics is not None:
+        metrics.observe_generation(summary.num_records, seconds)
+    
+    # Generate metadata
+    artifact_id = f'{timestamp}_{suffix}'
+    metadata = {
+        'artifact_id': artifact_id,
+        'generation_time': datetime.now().isoformat(),
+        'num_records': summary.num_records,
+        'num_entities': len(config.entities),
+        'num_metrics': sum(len(e.metrics) for e in config.entities),
+        'time_range': {
+            'start': config.time_window.start_time.isoformat(),
+            'end': config.time_window.end_time.isoformat(),
+            'granularity_minutes': config.time_window.granularity_minutes
+        },
+        'domain_type': config.domain_type,
+        'config_seed': config.seed,
+        'file_path': str(filepath),
+        'file_size_mb': filepath.stat().st_size / (1024 * 1024),
+        'column_store_path': str(store_dir) if store_dir is not None else None,
+        'columns': summary.columns,
+        'statistics_exact': summary.statistics_exact
+    }
+    if labels_path is not None:
+        metadata['labels'] = {
+            'labels_path': str(labels_path),
+            'events_path': str(events_path),
+            'num_events': len(generator.events),
+            'bits': LABEL_BITS
+        }
+    if generator.profiler is not None:
+        metadata['profile'] = {
+            'wall_seconds': seconds,
+            'rows_per_second': summary.num_records / seconds if seconds > 0 else None,
+            **generator.profiler.to_dict()
+        }
+    
+    # Save metadata if configured
+    metadata_file = None
+    if config.output and config.output.include_metadata:
+        metadata_file = output_dir / f'metadata_{timestamp}_{suffix}.json'
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        files.append(metadata_file)
+    
+    if registry is not None:
+        registry.register(
+            artifact_id, filepath, metadata_file,
+            mimetype=writer_cls.mimetype_for(config.output),
+            output_format=output_format,
+            grid=generator.grid,
+            columns=summary.columns,
+            store_path=store_dir,
+            extra_paths=_label_paths(metadata)
+        )
+    
+    # Preview (first 10 rows), time-series sample for visualizations
+    # and basic statistics were collected while writing
+    preview_data = summary.preview
+    timeseries_data = summary.timeseries
+    stats = summary.statistics()
+    
+    # Extract entity and metric information for better visualization
+    metrics_info = []
+    for entity in config.entities:
+        for metric in entity.metrics:
+            column_name = f"{entity.entity_id}_{metric.name}"
+            if column_name in summary.columns:
+                metrics_info.append({
+                    'column': column_name,
+                    'entity_id': entity.entity_id,
+                    'entity_type': entity.entity_type,
+                    'metric_name': metric.name,
+                    'display_name': metric.display_name or metric.name,
+                    'unit': metric.unit or '',
+                    'category': metric.category or 'general'
+                })
+    
+    payload = {
+        'success': True,
+        'metadata': metadata,
+        'preview': preview_data,
+        'timeseries': timeseries_data,
+        'statistics': stats,
+        'metrics_info': metrics_info,
+        'artifact_id': artifact_id,
+        'download_url': f'/api/download/{filename}'
+    }
+    if labels_path is not None:
+        payload['labels_url'] = f'/api/download/{labels_path.name}'
+        payload['events_url'] = f'/api/download/{events_path.name}'
+    if cache is not None:
+        cache.put(key, payload, files)
+    return dict(payload, cache={'hit': False, 'key': key})
+
+
+def _job_manager() -> JobManager:
+    """Job manager of the current app, created on first use"""
+    manager = current_app.extensions.get('generator_jobs')
+    if manager is None:
+        manager = JobManager(
+            max_workers=current_app.config.get('JOB_WORKERS', 2),
+            max_queued=current_app.config.get('JOB_MAX_QUEUED', 16),
+            max_finished=current_app.config.get('JOB_MAX_FINISHED', 100)
+        )
+        current_app.extensions['generator_jobs'] = manager
+    return manager
+
+
+def _result_cache() -> Optional[ResultCache]:
+    """Result cache of the current app, or None when disabled"""
+    if not current_app.config.get('RESULT_CACHE_ENABLED', True):
+        return None
+    cache = current_app.extensions.get('generator_cache')
+    if cache is None:
+        cache = ResultCache(
+            max_entries=current_app.config.get('RESULT_CACHE_MAX_ENTRIES', 128),
+            max_bytes=current_app.config.get('RESULT_CACHE_MAX_BYTES', 1 << 30)
+        )
+        current_app.extensions['generator_cache'] = cache
+    return cache
+
+
+def _artifact_registry() -> ArtifactRegistry:
+    """Artifact registry of the current app, created on first use"""
+    registry = current_app.extensions.get('generator_artifacts')
+    if registry is None:
+        registry = ArtifactRegistry(
+            search_dirs=current_app.config.get('ARTIFACT_SEARCH_DIRS', ['./output']),
+            max_entries=current_app.config.get('ARTIFACT_MAX_ENTRIES', 10000)
+        )
+        current_app.extensions['generator_artifacts'] = registry
+    return registry
+
+
+def _generator_metrics() -> GeneratorMetrics:
+    """Service metrics of the current app, created on first use"""
+    metrics = current_app.extensions.get('generator_metrics')
+    if metrics is None:
+        metrics = GeneratorMetrics()
+        current_app.extensions['generator_metrics'] = metrics
+    return metrics
+
+
+def _cost_model() -> CostModel:
+    """Cost model of the current app, loaded on first use"""
+    model = current_app.extensions.get('generator_cost_model')
+    if model is None:
+        model = CostModel.load(current_app.config.get('COST_MODEL_PATH'))
+        current_app.extensions['generator_cost_model'] = model
+    return model
+
+
+def _admission(estimate: CostEstimate) -> Tuple[str, List[str]]:
+    """Whether to run a request now ('sync'), as a job ('job') or not at
+    all ('rejected'), and why
+    """
+    limits = [
+        ('time', estimate.seconds, current_app.config.get('ADMISSION_MAX_SECONDS'), 's'),
+        ('peak memory', estimate.peak_memory_mb,
+         current_app.config.get('ADMISSION_MAX_MEMORY_MB'), 'MB'),
+        ('output size', estimate.output_size_mb,
+         current_app.config.get('ADMISSION_MAX_OUTPUT_MB'), 'MB'),
+    ]
+    reasons = [
+        f'estimated {name} of {value:,.1f} {unit} exceeds the limit of {limit:,} {unit}'
+        for name, value, limit, unit in limits
+        if limit is not None and value > limit
+    ]
+    if reasons:
+        return 'rejected', reasons
+    
+    sync_limit = current_app.config.get('ADMISSION_SYNC_MAX_SECONDS')
+    if sync_limit is not None and estimate.seconds > sync_limit:
+        return 'job', [
+            f'estimated time of {estimate.seconds:,.1f} s exceeds {sync_limit:,} s '
+            f'for synchronous requests'
+        ]
+    return 'sync', []
+
+
+def _needs_admission(config: GeneratorConfig) -> bool:
+    """Cached configurations cost nothing to serve again"""
+    cache = _result_cache()
+    return cache is None or config_key(config, GENERATOR_VERSION) not in cache
+
+
+def _estimate(config: GeneratorConfig) -> CostEstimate:
+    """Cost estimate of ``config``
+    
+    Estimating plans the run (time grid, shards, causal graphs, anomaly
+    events), so it raises ValueError for configurations the generator
+    rejects, such as a dependency cycle.
+    """
+    return _cost_model().estimate(config)
+
+
+def _output_errors(output: Optional[OutputConfig],
+                   output_format: Optional[str] = None) -> List[str]:
+    """Writer, statistics and profiling options nothing would accept,
+    found before any work starts; ``output_format`` overrides the
+    configured format
+    """
+    if output is None:
+        return []
+    writer_cls = get_writer_class(output_format or output.format)
+    checks = [
+        ('JSON layout', output.json_layout, NDJSONChunkWriter.layouts),
+        ('float encoding', output.float_encoding, ParquetChunkWriter.float_encodings),
+        ('statistics method', output.statistics, SummaryStatistics.methods),
+    ]
+    if output.compress:
+        checks.append((f'{writer_cls.extension} compression', output.compression,
+                       writer_cls.compressions))
+    errors = [
+        f"Unknown {name} '{value}', expected one of {', '.join(known)}"
+        for name, value, known in checks
+        if value is not None and value not in known
+    ]
+    if output.profile and not current_app.config.get('ALLOW_PROFILING', False):
+        errors.append('Profiling is disabled on this server')
+    return errors
+
+
+def _invalid(message: str):
+    return jsonify({
+        'success': False,
+        'error': message
+    }), 400
+
+
+def _rejected(estimate: CostEstimate, reasons: List[str]):
+    _generator_metrics().count('rejected')
+    return jsonify({
+        'success': False,
+        'error': 'Request exceeds the generation limits: ' + '; '.join(reasons),
+        'estimates': estimate.to_dict()
+    }), 413
+
+
+def _submit_job(config: GeneratorConfig) -> Job:
+    """Queue a generation job; raises JobQueueFull"""
+    cache = _result_cache()
+    registry = _artifact_registry()
+    metrics = _generator_metrics()
+    return _job_manager().submit(
+        lambda job: _run_generation(config, job, cache, registry, metrics)
+    )
+
+
+def _send_artifact_file(artifact: Artifact, path: Path):
+    """Send an artifact file with Range and conditional GET support"""
+    is_data = path == artifact.path
+    return send_file(
+        path,
+        mimetype=artifact.mimetype if is_data else None,
+        as_attachment=True,
+        download_name=path.name,
+        conditional=True,
+        etag=artifact.etag if is_data else True,
+        max_age=None
+    )
+
+
+def _job_urls(job: Job) -> dict:
+    return {
+        'status_url': f'/api/jobs/{job.job_id}',
+        'result_url': f'/api/jobs/{job.job_id}/result'
+    }
+
+
 @api_bp.route('/generate', methods=['POST'])
 def generate_data():
     """Generate synthetic data from configuration"""
@@ -71,148 +586,407 @@ def generate_data():
         
         # Parse configuration
         config = GeneratorConfig.from_dict(config_data)
+        errors = _output_errors(config.output)
+        if errors:
+            return _invalid('; '.join(errors))
         
-        # Generate data
-        generator = SyntheticDataGenerator(config)
-        df = generator.generate()
-        
-        # Save to file
-        output_dir = Path(config.output.output_dir if config.output else './output')
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Determine output format
-        output_format = config.output.format if config.output else 'csv'
-        
-        if output_format == 'parquet':
-            filename = f'synthetic_data_{timestamp}.parquet'
-            filepath = output_dir / filename
-            df.to_parquet(filepath, index=False)
-        elif output_format == 'json':
-            filename = f'synthetic_data_{timestamp}.json'
-            filepath = output_dir / filename
-            df.to_json(filepath, orient='records', date_format='iso', indent=2)
-        else:  # csv
-            filename = f'synthetic_data_{timestamp}.csv'
-            filepath = output_dir / filename
-            df.to_csv(filepath, index=False)
-        
-        # Generate metadata
-        metadata = {
-            'generation_time': datetime.now().isoformat(),
-            'num_records': len(df),
-            'num_entities': len(config.entities),
-            'num_metrics': sum(len(e.metrics) for e in config.entities),
-            'time_range': {
-                'start': config.time_window.start_time.isoformat(),
-                'end': config.time_window.end_time.isoformat(),
-                'granularity_minutes': config.time_window.granularity_minutes
-            },
-            'domain_type': config.domain_type,
-            'config_seed': config.seed,
-            'file_path': str(filepath),
-            'file_size_mb': filepath.stat().st_size / (1024 * 1024),
-            'columns': list(df.columns)
-        }
-        
-        # Save metadata if configured
-        if config.output and config.output.include_metadata:
-            metadata_file = output_dir / f'metadata_{timestamp}.json'
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
-        
-        # Generate preview (first 10 rows)
-        preview_data = df.head(10).to_dict('records')
-
-        # Generate time-series sample for visualizations (evenly distributed sample)
-        sample_size = min(100, len(df))  # Sample up to 100 points
-        if len(df) > sample_size:
-            # Evenly distributed sample across the time range
-            indices = np.linspace(0, len(df) - 1, sample_size, dtype=int)
-            timeseries_data = df.iloc[indices].to_dict('records')
-        else:
-            timeseries_data = df.to_dict('records')
-
-        # Basic statistics
-        stats = {}
-        for col in df.columns:
-            if col != 'timestamp':
-                stats[col] = {
-                    'mean': float(df[col].mean()),
-                    'std': float(df[col].std()),
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                    'median': float(df[col].median())
-                }
-
-        # Extract entity and metric information for better visualization
-        metrics_info = []
-        for entity in config.entities:
-            for metric in entity.metrics:
-                column_name = f"{entity.entity_id}_{metric.name}"
-                if column_name in df.columns:
-                    metrics_info.append({
-                        'column': column_name,
-                        'entity_id': entity.entity_id,
-                        'entity_type': entity.entity_type,
-                        'metric_name': metric.name,
-                        'display_name': metric.display_name or metric.name,
-                        'unit': metric.unit or '',
-                        'category': metric.category or 'general'
-                    })
+        if _needs_admission(config):
+            try:
+                estimate = _estimate(config)
+            except ValueError as e:
+                return _invalid(str(e))
+            decision, reasons = _admission(estimate)
+            if decision == 'rejected':
+                return _rejected(estimate, reasons)
+            if decision == 'job':
+                # Too slow to hold the request open; poll the job instead
+                try:
+                    job = _submit_job(config)
+                except JobQueueFull as e:
+                    return jsonify({
+                        'success': False,
+                        'error': str(e)
+                    }), 429
+                return jsonify({
+                    'success': True,
+                    'queued': True,
+                    'reason': reasons[0],
+                    'job_id': job.job_id,
+                    'status': job.status,
+                    'estimates': estimate.to_dict(),
+                    **_job_urls(job)
+                }), 202
         
+        return jsonify(_run_generation(
+            config, cache=_result_cache(), registry=_artifact_registry(),
+            metrics=_generator_metrics()
+        ))
+    
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'metadata': metadata,
-            'preview': preview_data,
-            'timeseries': timeseries_data,
-            'statistics': stats,
-            'metrics_info': metrics_info,
-            'download_url': f'/api/download/{filename}'
-        })
-        
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+@api_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a generation job and return its id"""
+    try:
+        config = GeneratorConfig.from_dict(request.json)
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e),
             'traceback': traceback.format_exc()
+        }), 400
+    errors = _output_errors(config.output)
+    if errors:
+        return _invalid('; '.join(errors))
+    
+    if _needs_admission(config):
+        try:
+            estimate = _estimate(config)
+        except ValueError as e:
+            return _invalid(str(e))
+        decision, reasons = _admission(estimate)
+        if decision == 'rejected':
+            return _rejected(estimate, reasons)
+    
+    try:
+        job = _submit_job(config)
+    except JobQueueFull as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 429
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status': job.status,
+        **_job_urls(job)
+    }), 202
+
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Stage-level progress and timings of a job"""
+    job = _job_manager().get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(),
+        **_job_urls(job)
+    })
+
+
+@api_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = _job_manager().cancel(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
+
+
+@api_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Result of a finished job, same payload as /api/generate"""
+    job = _job_manager().get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    if job.status == 'completed':
+        return jsonify(job.result)
+    if job.status == 'failed':
+        return jsonify({
+            'success': False,
+            'error': job.error,
+            'job': job.to_dict()
         }), 500
+    if job.status == 'cancelled':
+        return jsonify({
+            'success': False,
+            'error': 'Job was cancelled',
+            'job': job.to_dict()
+        }), 409
+    
+    # Still queued or running
+    return jsonify({
+        'success': False,
+        'error': 'Job has not finished yet',
+        'job': job.to_dict(),
+        **_job_urls(job)
+    }), 202
+
+
+@api_bp.route('/cache', methods=['GET'])
+def cache_stats():
+    """Result cache hit/miss counters and occupancy"""
+    cache = _result_cache()
+    return jsonify({
+        'success': True,
+        'enabled': cache is not None,
+        'cache': cache.stats() if cache is not None else {}
+    })
+
+
+@api_bp.route('/metrics', methods=['GET'])
+def service_metrics():
+    """Stage latency and throughput histograms for Prometheus to scrape"""
+    return Response(
+        _generator_metrics().render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
 
 
 @api_bp.route('/download/<filename>', methods=['GET'])
 def download_file(filename):
-    """Download generated file"""
+    """Download a generated file
+    
+    Supports Range requests and conditional GET (ETag, Last-Modified).
+    """
+    found = _artifact_registry().find(filename)
+    if found is None:
+        return jsonify({
+            'success': False,
+            'error': 'File not found'
+        }), 404
+    
+    return _send_artifact_file(*found)
+
+
+@api_bp.route('/artifacts/<artifact_id>', methods=['GET'])
+def download_artifact(artifact_id):
+    """Download the data file of a generated artifact"""
+    artifact = _artifact_registry().get(artifact_id)
+    if artifact is None:
+        return jsonify({
+            'success': False,
+            'error': 'Artifact not found'
+        }), 404
+    
+    return _send_artifact_file(artifact, artifact.path)
+
+
+def _artifact_window(artifact: Artifact) -> Tuple[int, int, List[str]]:
+    """Row range and metric columns selected by ``from``, ``to`` and ``columns``
+    
+    ``from`` and ``to`` are inclusive timestamps. Raises ValueError for
+    malformed parameters.
+    """
+    grid = artifact.grid
+    start, stop = 0, grid.n_windows
+    if 'from' in request.args:
+        start = grid.index_of(request.args['from'])
+    if 'to' in request.args:
+        # First row after the inclusive end
+        end = pd.Timestamp(request.args['to']) + pd.Timedelta(1, unit='ns')
+        stop = grid.index_of(end)
+    
+    columns = [col for col in request.args.get('columns', '').split(',') if col]
+    unknown = set(columns) - set(artifact.columns or columns)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+    if not columns:
+        columns = [col for col in artifact.columns or [] if col != 'timestamp']
+    return start, max(start, stop), columns
+
+
+def _artifact_reader(artifact: Artifact, columns: List[str]) -> ChunkReader:
+    """Reader of the column store when there is one, else of the data file"""
+    if artifact.store_path is not None and artifact.store_path.exists():
+        return ColumnStoreReader(artifact.store_path, columns)
+    return get_reader_class(artifact.output_format)(artifact.path, columns)
+
+
+def _artifact_query(artifact_id: str, handler: Callable[[Artifact], dict]):
+    """Run a read-only query on an artifact with the usual error responses"""
+    artifact = _artifact_registry().get(artifact_id)
+    if artifact is None:
+        return jsonify({
+            'success': False,
+            'error': 'Artifact not found'
+        }), 404
+    if artifact.grid is None:
+        return jsonify({
+            'success': False,
+            'error': 'Time grid of this artifact is unknown'
+        }), 409
+    
     try:
-        # Look for file in output directories
-        possible_dirs = ['./output', './output/telecom', './output/finance', 
-                        './output/healthcare', './output/manufacturing',
-                        './output/ecommerce', './output/iot', './output/custom']
-        
-        filepath = None
-        for dir_path in possible_dirs:
-            potential_path = Path(dir_path) / filename
-            if potential_path.exists():
-                filepath = potential_path
-                break
+        return jsonify(dict({'success': True, 'artifact_id': artifact_id}, **handler(artifact)))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+def _window_info(artifact: Artifact, start: int, stop: int) -> dict:
+    grid = artifact.grid
+    empty = stop == start
+    return {
+        'from': None if empty else (grid.start + start * grid.step).isoformat(),
+        'to': None if empty else (grid.start + (stop - 1) * grid.step).isoformat(),
+        'rows': stop - start
+    }
+
+
+@api_bp.route('/artifacts/<artifact_id>/timeseries', methods=['GET'])
+def artifact_timeseries(artifact_id):
+    """Downsampled time series of an artifact, optionally zoomed in
+    
+    Query parameters: ``from`` and ``to`` (inclusive timestamps),
+    ``points`` (the point budget) and ``columns`` (comma separated).
+    Only the rows of the window are read from the stored artifact.
+    """
+    def handler(artifact: Artifact) -> dict:
+        start, stop, columns = _artifact_window(artifact)
+        points = min(
+            max(int(request.args.get('points', 500)), LTTBSampler.min_points),
+            current_app.config.get('TIMESERIES_MAX_POINTS', 10000)
+        )
+        sampler = LTTBSampler(stop - start, points)
+        if stop > start:
+            for chunk in _artifact_reader(artifact, columns).read(start, stop):
+                sampler.add(
+                    chunk[columns].to_numpy(dtype=float),
+                    chunk['timestamp'].to_numpy()
+                )
+        _, timestamps, values = sampler.result()
+        return dict(
+            _window_info(artifact, start, stop),
+            points=len(timestamps),
+            timeseries=_timeseries_records(columns, timestamps, values)
+        )
+    
+    return _artifact_query(artifact_id, handler)
+
+
+@api_bp.route('/artifacts/<artifact_id>/rows', methods=['GET'])
+def artifact_rows(artifact_id):
+    """A page of rows: ``offset`` and ``limit`` within the ``from``/``to`` window"""
+    def handler(artifact: Artifact) -> dict:
+        start, stop, columns = _artifact_window(artifact)
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(
+            max(int(request.args.get('limit', 100)), 0),
+            current_app.config.get('ARTIFACT_MAX_ROWS', 10000)
+        )
+        lo = min(start + offset, stop)
+        hi = min(lo + limit, stop)
+        frames = list(_artifact_reader(artifact, columns).read(lo, hi)) if hi > lo else []
+        records = pd.concat(frames).to_dict('records') if frames else []
+        return dict(
+            _window_info(artifact, start, stop),
+            offset=offset,
+            limit=limit,
+            data=records
+        )
+    
+    return _artifact_query(artifact_id, handler)
+
+
+@api_bp.route('/artifacts/<artifact_id>/statistics', methods=['GET'])
+def artifact_statistics(artifact_id):
+    """Summary statistics of a window; ``method`` is exact or approximate"""
+    def handler(artifact: Artifact) -> dict:
+        start, stop, columns = _artifact_window(artifact)
+        statistics = SummaryStatistics(columns, method=request.args.get('method'))
+        if stop > start:
+            for chunk in _artifact_reader(artifact, columns).read(start, stop):
+                statistics.add(chunk[columns].to_numpy(dtype=float))
+        return dict(
+            _window_info(artifact, start, stop),
+            statistics=statistics.result(),
+            statistics_exact=statistics.exact
+        )
+    
+    return _artifact_query(artifact_id, handler)
+
+
+@api_bp.route('/generate/stream', methods=['GET', 'POST'])
+def stream_data():
+    """Stream generated rows as CSV, JSON or NDJSON without writing a file
+    
+    The configuration is the POSTed JSON body, or for GET the ``config``
+    query parameter (JSON) or a ``template`` name. ``format`` overrides
+    the configured output format and defaults to NDJSON for formats that
+    cannot be streamed. Streams cannot be queued, so configurations that
+    would run as a background job are rejected like oversized ones.
+    """
+    try:
+        if request.method == 'POST':
+            config = GeneratorConfig.from_dict(request.json)
+        elif 'config' in request.args:
+            config = GeneratorConfig.from_dict(json.loads(request.args['config']))
+        else:
+            config = DomainTemplates.get_template(request.args.get('template', 'custom'))
         
-        if filepath is None:
-            return jsonify({
-                'success': False,
-                'error': 'File not found'
-            }), 404
+        output_format = request.args.get('format')
+        if output_format is None:
+            output_format = config.output.format if config.output else 'ndjson'
+            if not issubclass(get_writer_class(output_format), TextChunkWriter):
+                output_format = 'ndjson'
+        writer_cls = get_writer_class(output_format)
+        allowed = current_app.config.get('ALLOWED_FORMATS', list(WRITERS))
+        if output_format not in allowed or not issubclass(writer_cls, TextChunkWriter):
+            raise ValueError(f"Format '{output_format}' cannot be streamed")
+        errors = _output_errors(config.output, output_format)
+        if errors:
+            raise ValueError('; '.join(errors))
         
-        return send_file(
-            filepath,
-            as_attachment=True,
-            download_name=filename
+        estimate = _estimate(config)
+        generator = SyntheticDataGenerator(
+            config, stage_hook=_generator_metrics().observe_stage
         )
-        
     except Exception as e:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        }), 400
+    
+    decision, reasons = _admission(estimate)
+    if decision != 'sync':
+        return _rejected(estimate, reasons)
+    
+    # Rows are encoded and sent one chunk at a time
+    body = stream_chunks(generator.generate_chunks(), output_format, config.output)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'synthetic_data_{timestamp}.{writer_cls.extension_for(config.output)}'
+    return Response(
+        stream_with_context(body),
+        mimetype=writer_cls.mimetype_for(config.output),
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'X-Total-Rows': str(generator.num_windows)
+        }
+    )
 
 
 @api_bp.route('/validate', methods=['POST'])
@@ -232,6 +1006,9 @@ def validate_config():
         if not config.entities:
             errors.append("At least one entity is required")
         
+        # Check output options
+        errors.extend(_output_errors(config.output))
+        
         # Check time window
         if not config.time_window:
             errors.append("Time window configuration is required")
@@ -257,26 +1034,67 @@ def validate_config():
             if abs(corr.coefficient) > 1:
                 errors.append(f"Correlation coefficient must be between -1 and 1")
         
+        # Check dependencies
+        for dep in config.dependencies:
+            if dep.parent not in all_metric_names:
+                warnings.append(f"Dependency parent '{dep.parent}' not found in metrics")
+            if dep.child not in all_metric_names:
+                warnings.append(f"Dependency child '{dep.child}' not found in metrics")
+            if dep.delay_minutes < 0:
+                errors.append("Dependency delay must not be negative")
+        
         # Check anomalies
         for anomaly in config.anomalies:
+            if anomaly.anomaly_type not in ANOMALY_KERNELS:
+                warnings.append(f"Unknown anomaly type '{anomaly.anomaly_type}' is ignored")
             if anomaly.epicenter not in all_metric_names:
                 warnings.append(f"Anomaly epicenter '{anomaly.epicenter}' not found in metrics")
             if not (0 <= anomaly.severity <= 1):
                 warnings.append(f"Anomaly severity should be between 0 and 1")
+            if anomaly.propagate and not (0 <= anomaly.propagation_decay <= 1):
+                warnings.append(f"Anomaly propagation decay should be between 0 and 1")
+        
+        # Check the anomaly schedule
+        for schedule in config.anomaly_schedule:
+            if schedule.anomaly_type not in ANOMALY_KERNELS:
+                errors.append(f"Unknown scheduled anomaly type '{schedule.anomaly_type}'")
+            if schedule.rate_per_day < 0:
+                errors.append("Scheduled anomaly rate must not be negative")
+            if schedule.mean_duration_minutes <= 0 or schedule.duration_sigma < 0:
+                errors.append("Scheduled anomaly durations need a positive mean "
+                              "and a non-negative sigma")
+            if not (0 <= schedule.severity_min <= schedule.severity_max <= 1):
+                warnings.append("Scheduled anomaly severities should satisfy "
+                                "0 <= severity_min <= severity_max <= 1")
+            for name in schedule.epicenters:
+                if name not in all_metric_names:
+                    warnings.append(f"Scheduled anomaly epicenter '{name}' not found in metrics")
+            if schedule.propagate and not (0 <= schedule.propagation_decay <= 1):
+                warnings.append(f"Anomaly propagation decay should be between 0 and 1")
         
-        # Estimate generation time and size
-        if config.time_window:
-            duration_minutes = (config.time_window.end_time - config.time_window.start_time).total_seconds() / 60
-            num_windows = int(duration_minutes / config.time_window.granularity_minutes)
-            estimated_rows = num_windows
-            estimated_size_mb = (estimated_rows * total_metrics * 8) / (1024 * 1024)  # Rough estimate
-            
+        # Estimate generation time, memory and size
+        if config.time_window and not errors:
+            estimate = _cost_model().estimate(
+                config, current_app.config.get('ALLOWED_FORMATS')
+            )
+            decision, reasons = _admission(estimate)
+            report = estimate.to_dict()
             estimates = {
-                'num_windows': num_windows,
-                'estimated_rows': estimated_rows,
-                'estimated_size_mb': round(estimated_size_mb, 2),
-                'estimated_time_seconds': round(num_windows / 1000, 2)  # Rough estimate
+                'num_windows': estimate.rows,
+                'estimated_rows': estimate.rows,
+                'estimated_size_mb': round(estimate.output_size_mb, 2),
+                'estimated_file_size_mb': round(estimate.file_size_mb, 2),
+                'estimated_column_store_mb': round(estimate.column_store_mb, 2),
+                'estimated_time_seconds': round(estimate.seconds, 2),
+                'estimated_peak_memory_mb': round(estimate.peak_memory_mb, 2),
+                'output_format': estimate.output_format,
+                'stages': report['stages'],
+                'formats': report['formats'],
+                'calibrated': estimate.calibrated,
+                'admission': {'decision': decision, 'reasons': reasons}
             }
+            if decision == 'rejected':
+                warnings.extend(reasons)
         else:
             estimates = {}
         
@@ -291,11 +1109,12 @@ def validate_config():
                 'num_metrics': total_metrics,
                 'num_correlations': len(config.correlations),
                 'num_anomalies': len(config.anomalies),
+                'num_anomaly_schedules': len(config.anomaly_schedule),
                 'has_seasonality': config.seasonality is not None,
                 'has_arima': config.arima is not None
             }
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -311,7 +1130,7 @@ def health_check():
     return jsonify({
         'success': True,
         'status': 'healthy',
-        'version': '2.0.0',
+        'version': GENERATOR_VERSION,
         'type': 'generic_synthetic_data_generator'
     })
 
@@ -323,7 +1142,7 @@ def get_info():
         'success': True,
         'generator': {
             'name': 'Generic Synthetic Data Generator',
-            'version': '2.0.0',
+            'version': GENERATOR_VERSION,
             'description': 'Domain-agnostic synthetic data generation system',
             'features': [
                 'Multiple probability distributions',
@@ -339,10 +1158,7 @@ def get_info():
                 'normal', 'gamma', 'lognormal', 'beta', 
                 'poisson', 'exponential', 'uniform'
             ],
-            'supported_anomalies': [
-                'spike', 'drop', 'oscillation', 'congestion',
-                'degradation', 'outage', 'drift'
-            ],
-            'output_formats': ['csv', 'parquet', 'json']
+            'supported_anomalies': list(ANOMALY_KERNELS),
+            'output_formats': ['csv', 'parquet', 'json', 'ndjson']
         }
     })
\ No newline at end of file
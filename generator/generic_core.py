@@ -3,19 +3,237 @@ Generic Synthetic Data Generator - Core Module
 Domain-agnostic implementation with configurable patterns
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field, fields
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Callable, Union
+import time
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
-from scipy import stats
 from scipy.linalg import cholesky
+from scipy.signal import lfilter
+from scipy.special import ndtr, ndtri
 
 # UPDATED IMPORTS - use relative imports
 from .domain_schema import (
-    GeneratorConfig, EntityConfig, MetricConfig, DistributionConfig,
-    DistributionType, AnomalyType, ChangeType
+    GeneratorConfig, MetricConfig, DistributionConfig, DistributionType, ChangeType
 )
+from .anomaly_kernels import ANOMALY_KERNELS, LABEL_BITS, LABEL_DTYPE, kernel_course
+from .profiling import StageProfiler
+
+# Bump whenever the same configuration would generate different data
+GENERATOR_VERSION = '2.3.0'
+
+
+@dataclass(frozen=True)
+class TimeGrid:
+    """Regular timestamp grid: ``n_windows`` rows ``step`` apart from ``start``
+    
+    Lets engines resolve event windows to absolute row numbers even when
+    they only see one block of a longer series.
+    """
+    start: pd.Timestamp
+    step: pd.Timedelta
+    n_windows: int
+    
+    @classmethod
+    def from_window(cls, time_window: Any) -> 'TimeGrid':
+        """Grid covering a TimeWindowConfig, inclusive of its end time"""
+        start = pd.Timestamp(time_window.start_time)
+        step = pd.Timedelta(minutes=time_window.granularity_minutes)
+        span = pd.Timestamp(time_window.end_time) - start
+        n_windows = span // step + 1 if span >= pd.Timedelta(0) else 0
+        return cls(start, step, int(n_windows))
+    
+    def index_of(self, when: Any) -> int:
+        """Row of the first timestamp at or after ``when`` (n_windows if none)"""
+        offset = (pd.Timestamp(when) - self.start).value
+        rows = -(-offset // self.step.value)
+        return int(min(max(rows, 0), self.n_windows))
+    
+    def locate(self, start_time: datetime,
+               duration_minutes: int) -> Optional[Tuple[int, int]]:
+        """Resolve an event's [start, end) row range
+        
+        Returns None when the event starts after the last timestamp.
+        """
+        start_idx = self.index_of(start_time)
+        if start_idx >= self.n_windows:
+            return None
+        end_idx = self.index_of(start_time + timedelta(minutes=duration_minutes))
+        return start_idx, end_idx
+    
+    def locate_all(self, start_times: List[datetime],
+                   duration_minutes: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Resolve the [start, end) row ranges of many events at once
+        
+        Events starting after the last timestamp get ``start == n_windows``.
+        """
+        starts = pd.DatetimeIndex(start_times).as_unit('ns').asi8
+        ends = starts + pd.to_timedelta(
+            np.asarray(duration_minutes, dtype=float), unit='m'
+        ).as_unit('ns').asi8
+        return self._rows(starts), self._rows(ends)
+    
+    def _rows(self, nanoseconds: np.ndarray) -> np.ndarray:
+        offsets = nanoseconds - self.start.as_unit('ns').value
+        rows = -(-offsets // self.step.value)
+        return np.clip(rows, 0, self.n_windows).astype(np.intp)
+    
+    def timestamps(self, lo: int = 0, hi: Optional[int] = None) -> pd.DatetimeIndex:
+        """Timestamps of rows [lo, hi) as a datetime64[ns] index"""
+        hi = self.n_windows if hi is None else hi
+        return pd.date_range(
+            start=self.start + lo * self.step, periods=hi - lo, freq=self.step
+        ).as_unit('ns')
+
+
+def _timestamp_rows(timestamps: pd.DatetimeIndex, start_times: List[Any],
+                    duration_minutes: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """[start, end) rows of many events in a sorted, possibly uneven index
+    
+    Naive event times are taken as UTC against a time zone aware index;
+    aware ones lose their zone against a naive index.
+    """
+    starts = pd.DatetimeIndex(start_times)
+    if timestamps.tz is not None and starts.tz is None:
+        starts = starts.tz_localize('UTC')
+    elif timestamps.tz is None and starts.tz is not None:
+        starts = starts.tz_localize(None)
+    ends = starts + pd.to_timedelta(np.asarray(duration_minutes, dtype=float), unit='m')
+    return (timestamps.searchsorted(starts).astype(np.intp),
+            timestamps.searchsorted(ends).astype(np.intp))
+
+
+def _linspace_segment(start: float, stop: float, num: int,
+                      lo: int, hi: int) -> np.ndarray:
+    """``np.linspace(start, stop, num)[lo:hi]`` without building the full ramp
+    
+    Uses the same arithmetic as numpy so a ramp evaluated piecewise over
+    consecutive blocks is bit-identical to the one-shot ramp.
+    """
+    positions = np.arange(lo, hi, dtype=float)
+    delta = stop - start
+    if num > 1:
+        step = delta / (num - 1)
+        if step == 0:
+            segment = positions / (num - 1) * delta + start
+        else:
+            segment = positions * step + start
+        if hi == num and hi > lo:
+            segment[-1] = stop
+    else:
+        segment = positions * delta + start
+    return segment
+
+
+def _linspace_at(stop: Any, num: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Element ``positions[i]`` of ``np.linspace(0, stop[i], num[i])``
+    
+    Vectorized over many ramps; matches ``_linspace_segment`` bit for bit.
+    """
+    stop = np.broadcast_to(np.asarray(stop, dtype=float), positions.shape)
+    values = np.zeros(positions.shape)
+    multi = num > 1
+    values[multi] = positions[multi] * (stop[multi] / (num[multi] - 1))
+    last = multi & (positions == num - 1)
+    values[last] = stop[last]
+    return values
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Owning range and offset into it for every row of many [lo, hi) ranges"""
+    lengths = hi - lo
+    owner = np.repeat(np.arange(len(lo)), lengths)
+    offset = np.arange(owner.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, offset
+
+
+def _multiply_at(data: Mapping, names: List[str], columns: np.ndarray,
+                 rows: np.ndarray, factors: np.ndarray) -> None:
+    """``data[names[c]][row] *= factor`` for every entry, in entry order
+    
+    Repeated rows (overlapping events) are multiplied once per entry, exactly
+    as if each event had been applied to its slice one after another.
+    """
+    if len(rows) == 0:
+        return
+    order = np.argsort(columns, kind='stable')
+    columns, rows, factors = columns[order], rows[order], factors[order]
+    bounds = np.flatnonzero(np.diff(columns)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(rows)]))
+    for lo, hi in zip(starts, ends):
+        np.multiply.at(data[names[columns[lo]]], rows[lo:hi], factors[lo:hi])
+
+
+def _append(lists: Tuple[list, ...], *values: Any) -> None:
+    """Append one record to a tuple of parallel lists"""
+    for target, value in zip(lists, values):
+        target.append(value)
+
+
+class MetricMatrix(Mapping):
+    """Columnar store for all metrics of a generation run
+    
+    Values live in one column-major ``(n_windows, n_metrics)`` float array
+    with a column-name index. Indexing by name returns a view of that
+    column, so engines that modify ``matrix[name]`` in place write straight
+    into the shared buffer.
+    """
+    
+    def __init__(self, columns: List[str], values: np.ndarray):
+        self.columns = list(columns)
+        self.index = {name: j for j, name in enumerate(self.columns)}
+        self.values = values
+    
+    @classmethod
+    def empty(cls, columns: List[str], n_windows: int,
+              dtype: Any = np.float64) -> 'MetricMatrix':
+        """Allocate an uninitialized column-major matrix"""
+        values = np.empty((n_windows, len(columns)), dtype=dtype, order='F')
+        return cls(columns, values)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, np.ndarray]) -> 'MetricMatrix':
+        """Copy a dict of equally sized series into a new matrix"""
+        columns = list(data)
+        n_windows = len(data[columns[0]]) if columns else 0
+        matrix = cls.empty(columns, n_windows)
+        for j, name in enumerate(columns):
+            matrix.values[:, j] = data[name]
+        return matrix
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[:, self.index[name]]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+    
+    def __len__(self) -> int:
+        return len(self.columns)
+    
+    @property
+    def n_windows(self) -> int:
+        return self.values.shape[0]
+    
+    def rows(self, lo: int, hi: int) -> 'MetricMatrix':
+        """View of rows [lo, hi) sharing this matrix's buffer"""
+        return MetricMatrix(self.columns, self.values[lo:hi])
+    
+    def to_frame(self, timestamps: pd.DatetimeIndex,
+                 row_offset: int = 0) -> pd.DataFrame:
+        """Wrap the buffer in a DataFrame without copying it"""
+        df = pd.DataFrame(
+            self.values, columns=self.columns, copy=False,
+            index=pd.RangeIndex(row_offset, row_offset + self.n_windows)
+        )
+        df.insert(0, 'timestamp', timestamps)
+        return df
 
 
 class DistributionGenerator:
@@ -100,73 +318,100 @@ class DistributionGenerator:
 
 
 class CorrelationEngine:
-    """Handle correlations between metrics using Gaussian copula"""
+    """Handle correlations between metrics using Gaussian copula
     
-    def __init__(self, seed: Optional[int] = None):
+    ``dtype`` sets the precision of the normal scores; float32 halves the
+    copula's working memory at the cost of slightly coarser rank mapping.
+    """
+    
+    # Rows multiplied by the Cholesky factor per step
+    matmul_rows = 16384
+    
+    # Factor each connected component of the correlation graph separately
+    # instead of the full n_metrics x n_metrics matrix
+    block_sparse = True
+    
+    def __init__(self, seed: Optional[int] = None, dtype: Any = np.float64):
         self.rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
     
-    def apply_correlations(self, data: Dict[str, np.ndarray], 
-                          correlations: List[Any]) -> Dict[str, np.ndarray]:
-        """Apply correlation structure to generated data"""
+    def apply_correlations(self, data: Mapping,
+                          correlations: List[Any]) -> MetricMatrix:
+        """Apply correlation structure to generated data
+        
+        A ``MetricMatrix`` is updated in place; plain dicts are copied into
+        a new matrix first. Lagged correlations are left to
+        ``PropagationEngine``.
+        """
         
         if not correlations:
             return data
         
-        # Build correlation matrix
-        metrics = list(data.keys())
-        n_metrics = len(metrics)
-        corr_matrix = np.eye(n_metrics)
+        if not isinstance(data, MetricMatrix):
+            data = MetricMatrix.from_dict(data)
+        values = data.values
         
-        metric_to_idx = {m: i for i, m in enumerate(metrics)}
+        # Correlation structure as hashable (i, j, coefficient) entries
+        n_metrics = len(data)
+        metric_to_idx = data.index
+        pairs = tuple(
+            (metric_to_idx[corr.source], metric_to_idx[corr.target], corr.coefficient)
+            for corr in correlations
+            if corr.source in metric_to_idx and corr.target in metric_to_idx
+            and not getattr(corr, 'lag', 0)
+        )
+        if not pairs:
+            return data
         
-        for corr in correlations:
-            if corr.source in metric_to_idx and corr.target in metric_to_idx:
-                i = metric_to_idx[corr.source]
-                j = metric_to_idx[corr.target]
-                corr_matrix[i, j] = corr.coefficient
-                corr_matrix[j, i] = corr.coefficient
-        
-        # Make matrix positive definite
-        corr_matrix = self._nearest_positive_definite(corr_matrix)
-        
-        # Apply correlation using Gaussian copula
-        size = len(data[metrics[0]])
-        
-        # Convert data to uniform using empirical CDF
-        uniform_data = np.zeros((size, n_metrics))
-        for i, metric in enumerate(metrics):
-            sorted_indices = np.argsort(data[metric])
-            ranks = np.empty_like(sorted_indices)
-            ranks[sorted_indices] = np.arange(size)
-            uniform_data[:, i] = (ranks + 1) / (size + 1)
-        
-        # Transform to normal
-        normal_data = stats.norm.ppf(uniform_data)
-        
-        # Apply correlation
-        try:
-            L = cholesky(corr_matrix, lower=True)
-            correlated_normal = normal_data @ L.T
-        except:
-            # If Cholesky fails, use original data
-            correlated_normal = normal_data
-        
-        # Transform back to uniform
-        correlated_uniform = stats.norm.cdf(correlated_normal)
-        
-        # Map back to original distributions
-        result = {}
-        for i, metric in enumerate(metrics):
-            sorted_values = np.sort(data[metric])
+        # Normal scores of the empirical CDF depend only on the rank, so
+        # compute them once and scatter them through each column's argsort
+        size = data.n_windows
+        scores = ndtri(np.arange(1, size + 1) / (size + 1)).astype(self.dtype)
+        
+        # Apply correlation using one Gaussian copula per connected
+        # component; metrics no correlation touches keep their values
+        if self.block_sparse:
+            components = _correlation_components(pairs)
+        else:
+            components = ((tuple(range(n_metrics)), pairs),)
+        for columns, local_pairs in components:
+            L = _copula_factor(len(columns), local_pairs)
+            self._apply_copula(values, list(columns), L, scores)
+        
+        return data
+    
+    def _apply_copula(self, values: np.ndarray, columns: List[int],
+                      L: Optional[np.ndarray], scores: np.ndarray) -> None:
+        """Correlate ``values[:, columns]`` in place through factor ``L``"""
+        size = len(values)
+        n_columns = len(columns)
+        index_dtype = np.int32 if size < 2 ** 31 else np.intp
+        order = np.empty((size, n_columns), dtype=index_dtype, order='F')
+        normal_data = np.empty((size, n_columns), dtype=self.dtype, order='F')
+        for k, i in enumerate(columns):
+            order[:, k] = np.argsort(values[:, i])
+            normal_data[order[:, k], k] = scores
+        
+        # Apply correlation, a slab of rows at a time to stay in place
+        if L is not None:
+            L_T = L.T.astype(self.dtype)
+            for lo in range(0, size, self.matmul_rows):
+                rows = normal_data[lo:lo + self.matmul_rows]
+                rows[:] = rows @ L_T
+        
+        # Transform back to uniform and map back to the original
+        # distributions, reusing the argsort to read the sorted values
+        correlated_uniform = ndtr(normal_data, out=normal_data)
+        for k, i in enumerate(columns):
+            sorted_values = values[order[:, k], i]
             indices = np.clip(
-                (correlated_uniform[:, i] * size).astype(int),
+                (correlated_uniform[:, k] * size).astype(int),
                 0, size - 1
             )
-            result[metric] = sorted_values[indices]
-        
-        return result
+            values[:, i] = sorted_values[indices]
     
-    def _nearest_positive_definite(self, A: np.ndarray) -> np.ndarray:
+    @staticmethod
+    def _nearest_positive_definite(A: np.ndarray) -> np.ndarray:
         """Find nearest positive definite matrix"""
         B = (A + A.T) / 2
         eigval, eigvec = np.linalg.eigh(B)
@@ -174,305 +419,1395 @@ class CorrelationEngine:
         return eigvec @ np.diag(eigval) @ eigvec.T
 
 
+@lru_cache(maxsize=128)
+def _correlation_components(
+    pairs: Tuple[Tuple[int, int, float], ...]
+) -> Tuple[Tuple[Tuple[int, ...], Tuple[Tuple[int, int, float], ...]], ...]:
+    """Split a correlation graph into connected components
+    
+    Returns ``(columns, local_pairs)`` per component, with sorted column
+    indices and the pairs renumbered to positions within ``columns``.
+    """
+    parent = {}
+    
+    def find(i: int) -> int:
+        parent.setdefault(i, i)
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for i, j, _ in pairs:
+        parent[find(i)] = find(j)
+    
+    members = {}
+    for i in sorted(parent):
+        members.setdefault(find(i), []).append(i)
+    local = {}
+    for root, columns in members.items():
+        local.update((i, k) for k, i in enumerate(columns))
+    component_pairs = {root: [] for root in members}
+    for i, j, coefficient in pairs:
+        component_pairs[find(i)].append((local[i], local[j], coefficient))
+    return tuple(
+        (tuple(columns), tuple(component_pairs[root]))
+        for root, columns in members.items()
+    )
+
+
+@lru_cache(maxsize=128)
+def _copula_factor(n_metrics: int,
+                   pairs: Tuple[Tuple[int, int, float], ...]) -> Optional[np.ndarray]:
+    """Cholesky factor of the PD-repaired correlation matrix
+    
+    Cached per correlation structure so later blocks, shards with the same
+    layout and repeated runs skip the eigendecomposition. Returns None when
+    the factorization fails and the data should stay uncorrelated.
+    """
+    # Build correlation matrix
+    corr_matrix = np.eye(n_metrics)
+    for i, j, coefficient in pairs:
+        corr_matrix[i, j] = coefficient
+        corr_matrix[j, i] = coefficient
+    
+    # Make matrix positive definite
+    corr_matrix = CorrelationEngine._nearest_positive_definite(corr_matrix)
+    try:
+        L = cholesky(corr_matrix, lower=True)
+    except Exception:
+        return None
+    L.flags.writeable = False
+    return L
+
+
+@dataclass(frozen=True)
+class CausalGraph:
+    """Lagged influence edges between the columns of one shard
+    
+    Edge ``e`` adds ``weights[e]`` standard deviations of the child per
+    standard deviation of the parent, ``lags[e]`` rows later. ``order``
+    lists the edges grouped by child, children in topological order, so
+    every parent is final before it is read.
+    """
+    parents: np.ndarray
+    children: np.ndarray
+    weights: np.ndarray
+    lags: np.ndarray
+    order: np.ndarray
+    keep: np.ndarray
+    sources: np.ndarray
+    max_lag: int
+    
+    @classmethod
+    def build(cls, columns: List[str],
+              edges: List[Tuple[str, str, float, int]]) -> Optional['CausalGraph']:
+        """Graph of ``(parent, child, weight, lag)`` edges over ``columns``
+        
+        Raises ValueError when the edges form a cycle; even lagged cycles
+        would need a row-by-row recursion.
+        """
+        index = {name: j for j, name in enumerate(columns)}
+        edges = [e for e in edges if e[0] in index and e[1] in index]
+        if not edges:
+            return None
+        n_columns = len(columns)
+        parents = np.array([index[e[0]] for e in edges], dtype=np.intp)
+        children = np.array([index[e[1]] for e in edges], dtype=np.intp)
+        weights = np.array([e[2] for e in edges], dtype=float)
+        lags = np.array([e[3] for e in edges], dtype=np.intp)
+        if (lags < 0).any():
+            raise ValueError("Dependency delays must not be negative")
+        
+        # Kahn's algorithm, one frontier of finished columns at a time
+        by_parent = np.argsort(parents, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(parents, minlength=n_columns))))
+        remaining = np.bincount(children, minlength=n_columns)
+        depth = np.zeros(n_columns, dtype=np.intp)
+        frontier = np.flatnonzero(remaining == 0)
+        while len(frontier):
+            owner, within = _expand_ranges(bounds[frontier], bounds[frontier + 1])
+            out = by_parent[bounds[frontier][owner] + within]
+            np.maximum.at(depth, children[out], depth[parents[out]] + 1)
+            np.subtract.at(remaining, children[out], 1)
+            frontier = np.unique(children[out][remaining[children[out]] == 0])
+        if remaining.any():
+            cycle = ', '.join(columns[j] for j in np.flatnonzero(remaining))
+            raise ValueError(f"Dependencies form a cycle through {cycle}")
+        
+        # Incoming weights beyond unit variance are scaled down together;
+        # the child keeps what is left of its own variation
+        power = np.bincount(children, weights=weights ** 2, minlength=n_columns)
+        weights = weights / np.sqrt(np.maximum(power, 1.0))[children]
+        keep = np.sqrt(np.clip(1 - power, 0.0, 1.0))
+        return cls(
+            parents=parents, children=children, weights=weights, lags=lags,
+            order=np.lexsort((children, depth[children])), keep=keep,
+            sources=np.unique(parents), max_lag=int(lags.max())
+        )
+
+
+@dataclass
+class PropagationState:
+    """Column statistics and parent history carried between blocks"""
+    gain: Optional[np.ndarray] = None
+    offset: Optional[np.ndarray] = None
+    history: Optional[np.ndarray] = None
+
+
+class PropagationEngine:
+    """Blend parents into their children along a causal DAG
+    
+    A child becomes ``keep * child + sum(weight * parent[t - lag])`` in
+    standardized units, so a single parent correlates with its child at
+    about ``weight`` and the child keeps its mean and variance. Every
+    edge is one shifted, scaled add of whole column slices, O(rows x
+    edges) in total.
+    """
+    
+    @classmethod
+    def apply_propagation(cls, values: np.ndarray, graph: Optional[CausalGraph],
+                          state: Optional[PropagationState] = None) -> np.ndarray:
+        """Apply ``graph`` to the columns of ``values`` in place
+        
+        Pass the same ``state`` for consecutive blocks of a series so lags
+        reach into the previous block. Column means and spreads are
+        measured on the first block; rows before the start of the series
+        count as the parent's mean, i.e. no influence.
+        """
+        if graph is None or len(values) == 0:
+            return values
+        if state is None:
+            state = PropagationState()
+        if state.gain is None:
+            cls._measure(values, graph, state)
+        n_rows = len(values)
+        slots = np.searchsorted(graph.sources, graph.parents)
+        scratch = np.empty(n_rows)
+        
+        child = -1
+        for e in graph.order:
+            if graph.children[e] != child:
+                # Scale the child down to make room for its parents
+                child = graph.children[e]
+                target = values[:, child]
+                target *= graph.keep[child]
+                target += state.offset[child]
+            lag = min(graph.lags[e], n_rows)
+            gain = state.gain[e]
+            if lag:
+                past = graph.max_lag - graph.lags[e]
+                target[:lag] += gain * state.history[past:past + lag, slots[e]]
+            shifted = np.multiply(values[:n_rows - lag, graph.parents[e]], gain,
+                                  out=scratch[:n_rows - lag])
+            target[lag:] += shifted
+        
+        # Keep the last max_lag rows of every parent for the next block
+        kept = min(n_rows, graph.max_lag)
+        if kept:
+            recent = values[n_rows - kept:, graph.sources]
+            state.history = np.concatenate((state.history[kept:], recent))
+        return values
+    
+    @staticmethod
+    def _measure(values: np.ndarray, graph: CausalGraph,
+                 state: PropagationState) -> None:
+        """Per-edge gains and per-child offsets from the first block"""
+        # Column by column, which is faster than a reduction over the
+        # (column-major) block and skips columns without edges
+        mean = np.zeros(values.shape[1])
+        std = np.zeros(values.shape[1])
+        for j in np.union1d(graph.parents, graph.children):
+            mean[j] = values[:, j].mean()
+            std[j] = values[:, j].std()
+        parent_std = std[graph.parents]
+        gain = np.divide(
+            graph.weights * std[graph.children], parent_std,
+            out=np.zeros(len(graph.parents)), where=parent_std > 0
+        )
+        # Centering each parent is folded into one constant per child
+        offset = (1 - graph.keep) * mean
+        np.subtract.at(offset, graph.children, gain * mean[graph.parents])
+        state.gain = gain
+        state.offset = offset
+        state.history = np.tile(mean[graph.sources], (graph.max_lag, 1))
+
+
 class SeasonalityEngine:
     """Add seasonal patterns using Fourier series"""
     
     @staticmethod
-    def add_seasonality(data: np.ndarray, timestamps: np.ndarray,
-                       config: Any) -> np.ndarray:
-        """Add seasonal pattern to data"""
+    def add_seasonality(data: np.ndarray, timestamps: pd.DatetimeIndex,
+                       config: Any, out: Optional[np.ndarray] = None,
+                       origin: Optional[datetime] = None) -> np.ndarray:
+        """Add seasonal pattern to data
         
-        if config is None:
+        ``data`` may be a single series or a ``(n_windows, n_metrics)``
+        matrix; pass ``out=data`` to scale it in place. ``origin`` is the
+        start of the full series when ``timestamps`` covers a later block.
+        ``config`` is one seasonality config or a list of them (e.g. daily,
+        weekly and yearly) whose seasonal terms add up.
+        """
+        
+        if not config or len(timestamps) == 0:
             return data
         
-        # Convert timestamps to hours since start
-        start_time = timestamps[0]
-        hours = np.array([(t - start_time).total_seconds() / 3600 
-                         for t in timestamps])
+        configs = config if isinstance(config, (list, tuple)) else [config]
+        components = tuple(
+            (c.period_hours, c.amplitude, c.harmonics, getattr(c, 'phase_shift', 0))
+            for c in configs
+        )
         
-        # Create seasonal component
-        seasonal = np.zeros_like(data)
-        period = config.period_hours
+        # Nanoseconds since the start of the series
+        timestamps = pd.DatetimeIndex(timestamps).as_unit('ns')
+        origin = timestamps[0] if origin is None else pd.Timestamp(origin)
+        origin_ns = origin.as_unit('ns').value
         
-        for k in range(1, config.harmonics + 1):
-            phase = config.phase_shift if hasattr(config, 'phase_shift') else 0
-            seasonal += (config.amplitude / k) * np.sin(
-                2 * np.pi * k * hours / period + phase
+        # A regular index is described by its first timestamp and step, so
+        # its curve is cached and shared by every shard covering the block
+        if isinstance(timestamps.freq, pd.tseries.offsets.Tick):
+            factor = _seasonal_factor(
+                timestamps[0].value - origin_ns, timestamps.freq.nanos,
+                len(timestamps), components
             )
+        else:
+            factor = _fourier_factor(timestamps.asi8 - origin_ns, components)
         
         # Apply seasonality multiplicatively
-        return data * (1 + seasonal)
+        factor = factor.reshape((-1,) + (1,) * (np.ndim(data) - 1))
+        return np.multiply(data, factor, out=out)
+
+
+def _fourier_factor(offsets_ns: np.ndarray,
+                    components: Tuple[Tuple[float, float, int, float], ...]) -> np.ndarray:
+    """Multiplicative seasonal factor at the given offsets from the origin"""
+    # Convert offsets to hours since start
+    hours = offsets_ns / 3_600_000_000_000
+    
+    # Create seasonal component
+    seasonal = np.zeros(len(hours))
+    for period, amplitude, harmonics, phase in components:
+        for k in range(1, harmonics + 1):
+            seasonal += (amplitude / k) * np.sin(
+                2 * np.pi * k * hours / period + phase
+            )
+    return 1 + seasonal
+
+
+@lru_cache(maxsize=16)
+def _seasonal_factor(first_ns: int, step_ns: int, n_windows: int,
+                     components: Tuple[Tuple[float, float, int, float], ...]) -> np.ndarray:
+    """Cached ``_fourier_factor`` of a regular grid of ``n_windows`` rows"""
+    offsets = first_ns + np.arange(n_windows, dtype=np.int64) * step_ns
+    factor = _fourier_factor(offsets, components)
+    factor.flags.writeable = False
+    return factor
+
+
+@dataclass
+class ARIMAState:
+    """Filter state carried between consecutive blocks of one series"""
+    rows_seen: int = 0
+    scale: Optional[np.ndarray] = None
+    ar_history: Optional[np.ndarray] = None
+    ar_state: Optional[np.ndarray] = None
+    noise_history: Optional[np.ndarray] = None
 
 
 class ARIMAEngine:
     """Apply ARIMA smoothing for temporal coherence"""
     
+    block_columns = 64
+    
     def __init__(self, seed: Optional[int] = None):
         self.rng = np.random.default_rng(seed)
     
-    def apply_arima(self, data: np.ndarray, config: Any) -> np.ndarray:
-        """Apply ARIMA model to smooth data"""
+    def apply_arima(self, data: np.ndarray, config: Any,
+                    out: Optional[np.ndarray] = None,
+                    state: Optional[ARIMAState] = None) -> np.ndarray:
+        """Apply ARIMA model to smooth data
+        
+        ``data`` may be a single series or a ``(n_windows, n_metrics)``
+        matrix; all columns are filtered together along the time axis.
+        Pass ``out=data`` to smooth a float array in place, and the same
+        ``state`` for consecutive blocks of a series so that the filter
+        continues across block boundaries. Lags that reach before the
+        start of the series count as zero.
+        """
         
         if config is None:
             return data
         
-        result = data.copy()
+        if state is None:
+            state = ARIMAState()
         
-        # AR component
-        for i in range(config.ar_order, len(result)):
-            ar_contribution = sum(
-                coef * result[i - j - 1] 
-                for j, coef in enumerate(config.ar_coef)
-            )
-            result[i] = 0.3 * ar_contribution + 0.7 * result[i]
+        # Noise is scaled by the spread of the unsmoothed input, measured
+        # on the first block of the series
+        if state.scale is None:
+            state.scale = np.atleast_1d(config.noise_std * np.std(data, axis=0))
+        
+        if out is None:
+            result = np.array(data, dtype=float)
+        else:
+            result = out
+            if result is not data:
+                result[...] = data
+        series = result.reshape(len(result), -1)
+        
+        n_metrics = series.shape[1]
+        if state.ar_history is None:
+            state.ar_history = np.zeros((len(config.ar_coef), n_metrics))
+            state.noise_history = np.zeros((len(config.ma_coef), n_metrics))
+        
+        # Filter a bounded block of columns at a time so temporaries stay
+        # small relative to the metric matrix
+        for lo in range(0, n_metrics, self.block_columns):
+            columns = slice(lo, lo + self.block_columns)
+            self._smooth_block(series[:, columns], config, state, columns)
+        
+        state.rows_seen += len(series)
+        return result
+    
+    def _smooth_block(self, block: np.ndarray, config: Any,
+                      state: ARIMAState, columns: slice) -> None:
+        """Apply the AR filter and MA noise to a 2-D block in place"""
+        n_windows, n_metrics = block.shape
+        
+        # AR component: y[i] = 0.3 * sum(a_j * y[i-j-1]) + 0.7 * x[i] for
+        # i >= ar_order, evaluated as an IIR filter over the whole block
+        ar_coef = np.asarray(config.ar_coef, dtype=float)
+        passthrough = min(max(config.ar_order - state.rows_seen, 0), n_windows)
+        if ar_coef.size:
+            a = np.concatenate(([1.0], -0.3 * ar_coef))
+            if passthrough:
+                # Rows before ar_order are left as-is but seed the filter
+                history = np.concatenate(
+                    (block[passthrough - 1::-1], state.ar_history[:, columns])
+                )
+                state.ar_history[:, columns] = history[:ar_coef.size]
+            if passthrough < n_windows:
+                if state.rows_seen > config.ar_order:
+                    zi = state.ar_state[:, columns]
+                else:
+                    zi = self._filter_state(a, state.ar_history[:, columns])
+                block[passthrough:], zf = lfilter(
+                    [0.7], a, block[passthrough:], axis=0, zi=zi
+                )
+                if state.ar_state is None:
+                    state.ar_state = np.zeros((ar_coef.size, state.scale.size))
+                state.ar_state[:, columns] = zf
+        else:
+            block[passthrough:] *= 0.7
         
         # MA component (add noise with moving average smoothing)
         if config.ma_order > 0:
-            noise = self.rng.normal(0, config.noise_std * np.std(data), len(data))
-            ma_noise = np.zeros_like(noise)
+            # One row of draws per metric keeps the stream identical to
+            # drawing each metric's noise in turn
+            noise = self.rng.standard_normal((n_metrics, n_windows)).T
+            noise *= state.scale[columns]
             
-            for i in range(config.ma_order, len(noise)):
-                ma_noise[i] = sum(
-                    coef * noise[i - j - 1]
-                    for j, coef in enumerate(config.ma_coef)
-                )
+            # Moving average as a convolution of shifted noise, continuing
+            # from the noise tail of the previous block
+            n_lags = len(config.ma_coef)
+            padded = np.concatenate((state.noise_history[:, columns], noise))
+            ma_noise = np.zeros_like(noise)
+            for lag, coef in enumerate(config.ma_coef, start=1):
+                ma_noise += coef * padded[n_lags - lag:n_lags - lag + n_windows]
+            ma_noise[:max(config.ma_order - state.rows_seen, 0)] = 0.0
+            if n_lags:
+                state.noise_history[:, columns] = padded[-n_lags:]
             
-            result += ma_noise
+            block += ma_noise
+    
+    @staticmethod
+    def _filter_state(a: np.ndarray, history: np.ndarray) -> np.ndarray:
+        """Initial lfilter state for an all-pole filter given past outputs
         
-        return result
+        ``history[k]`` holds the output ``k + 1`` steps back, one column per
+        series (the 2-D equivalent of ``scipy.signal.lfiltic``).
+        """
+        order = len(a) - 1
+        zi = np.empty((order,) + history.shape[1:])
+        for m in range(order):
+            zi[m] = -np.tensordot(a[m + 1:], history[:order - m], axes=1)
+        return zi
 
 
 class ChangePointEngine:
     """Apply change points to data"""
     
     @staticmethod
-    def apply_change_points(data: Dict[str, np.ndarray], 
-                           timestamps: np.ndarray,
-                           change_points: List[Any]) -> Dict[str, np.ndarray]:
-        """Apply change points to metrics"""
+    def apply_change_points(data: Mapping, 
+                           timestamps: pd.DatetimeIndex,
+                           change_points: List[Any],
+                           grid: Optional[TimeGrid] = None) -> Mapping:
+        """Apply change points to metrics in place
         
-        if not change_points:
+        ``data`` may hold one block of a longer series described by
+        ``grid``; windows are resolved on the full grid so ramps continue
+        across block boundaries. Without a grid, windows are looked up in
+        ``timestamps`` themselves, which need not be evenly spaced.
+        """
+        
+        if not change_points or len(timestamps) == 0:
             return data
         
-        result = {k: v.copy() for k, v in data.items()}
+        timestamps = pd.DatetimeIndex(timestamps)
+        n_rows = len(timestamps)
         
-        for cp in change_points:
-            # Find affected time windows
-            start_idx = None
-            end_idx = None
-            
-            for i, ts in enumerate(timestamps):
-                if start_idx is None and ts >= cp.start_time:
-                    start_idx = i
-                if ts >= cp.start_time + timedelta(minutes=cp.duration_minutes):
-                    end_idx = i
-                    break
-            
-            if start_idx is None:
+        # Find affected time windows of all change points at once
+        start_times = [cp.start_time for cp in change_points]
+        durations = [cp.duration_minutes for cp in change_points]
+        if grid is None:
+            starts, ends = _timestamp_rows(timestamps, start_times, durations)
+            offset, n_windows = 0, n_rows
+        else:
+            starts, ends = grid.locate_all(start_times, durations)
+            offset, n_windows = grid.index_of(timestamps[0]), grid.n_windows
+        
+        # Every change is a level shift from some row onwards ("jump"),
+        # preceded by a linear ramp segment for RAMP changes
+        names = []
+        column_of = {}
+        jumps = ([], [], [])
+        ramps = ([], [], [], [], [], [])
+        for cp, start_idx, end_idx in zip(change_points, starts, ends):
+            if start_idx >= n_windows:
                 continue
-            if end_idx is None:
-                end_idx = len(timestamps)
+            lo = max(start_idx - offset, 0)
+            hi = max(end_idx - offset, 0)
             
-            # Apply change to affected metrics
             for metric_name in cp.affected_metrics:
-                if metric_name not in result:
+                if metric_name not in data:
                     continue
+                column = column_of.setdefault(metric_name, len(names))
+                if column == len(names):
+                    names.append(metric_name)
                 
                 if cp.change_type == ChangeType.STEP:
                     # Instant change
-                    result[metric_name][start_idx:] *= (1 + cp.magnitude)
+                    _append(jumps, column, lo, 1 + cp.magnitude)
                 
                 elif cp.change_type == ChangeType.RAMP:
                     # Gradual change
                     duration = end_idx - start_idx
                     if duration > 0:
-                        ramp = np.linspace(0, cp.magnitude, duration)
-                        result[metric_name][start_idx:end_idx] *= (1 + ramp)
-                        if end_idx < len(result[metric_name]):
-                            result[metric_name][end_idx:] *= (1 + cp.magnitude)
+                        block_hi = min(hi, n_rows)
+                        if lo < block_hi:
+                            _append(ramps, column, lo, block_hi,
+                                    offset + lo - start_idx, duration,
+                                    cp.magnitude)
+                        if end_idx < n_windows:
+                            _append(jumps, column, hi, 1 + cp.magnitude)
+        
+        if ramps[0]:
+            column, lo, hi, position, duration, magnitude = map(np.asarray, ramps)
+            owner, within = _expand_ranges(lo, hi)
+            ramp = _linspace_at(
+                magnitude[owner], duration[owner], position[owner] + within
+            )
+            _multiply_at(data, names, column[owner], lo[owner] + within, 1 + ramp)
         
+        if jumps[0]:
+            # Cumulative product of all jumps gives each column's level factor
+            column, row, factor = map(np.asarray, jumps)
+            keep = row < n_rows
+            column, row, factor = column[keep], row[keep], factor[keep]
+            for j in np.unique(column):
+                mine = np.flatnonzero(column == j)
+                first = row[mine].min()
+                if len(mine) == 1:
+                    data[names[j]][first:] *= factor[mine[0]]
+                    continue
+                levels = np.ones(n_rows - first)
+                np.multiply.at(levels, row[mine] - first, factor[mine])
+                data[names[j]][first:] *= np.cumprod(levels)
+        
+        return data
+
+
+class DependencyIndex:
+    """Dependents of every column as CSR adjacency arrays
+    
+    Compiled once from the dependency list. ``reachable`` walks it breadth
+    first with one vectorized frontier per hop and remembers the result,
+    so repeated anomalies on an epicenter cost a dictionary lookup.
+    """
+    
+    def __init__(self, columns: List[str], dependencies: List[Any]):
+        self.columns = list(columns)
+        self.index = {name: j for j, name in enumerate(self.columns)}
+        edges = [
+            (self.index[dep.parent], self.index[dep.child]) for dep in dependencies
+            if dep.parent in self.index and dep.child in self.index
+        ]
+        parents = np.array([p for p, _ in edges], dtype=np.intp)
+        children = np.array([c for _, c in edges], dtype=np.intp)
+        
+        # A stable sort keeps each column's dependents in configuration order
+        self.indices = children[np.argsort(parents, kind='stable')]
+        self.indptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(parents, minlength=len(self.columns))))
+        )
+        self._reachable: Dict[Tuple[str, Optional[int]], Tuple[np.ndarray, np.ndarray]] = {}
+    
+    def reachable(self, metric: str,
+                  max_hops: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns of ``metric`` and its dependents, with their hop counts
+        
+        Every column appears once, at its fewest hops, in breadth-first
+        order; ``max_hops`` None follows dependents transitively.
+        """
+        key = (metric, max_hops)
+        if key in self._reachable:
+            return self._reachable[key]
+        if metric not in self.index:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        
+        visited = np.zeros(len(self.columns), dtype=bool)
+        frontier = np.array([self.index[metric]], dtype=np.intp)
+        visited[frontier] = True
+        found, hops = [frontier], [np.zeros(1, dtype=np.intp)]
+        hop = 0
+        while len(frontier) and (max_hops is None or hop < max_hops):
+            hop += 1
+            owner, within = _expand_ranges(self.indptr[frontier], self.indptr[frontier + 1])
+            reached = self.indices[self.indptr[frontier][owner] + within]
+            reached = reached[~visited[reached]]
+            # First sighting of each column, in discovery order
+            _, first = np.unique(reached, return_index=True)
+            frontier = reached[np.sort(first)]
+            visited[frontier] = True
+            found.append(frontier)
+            hops.append(np.full(len(frontier), hop, dtype=np.intp))
+        
+        result = (np.concatenate(found), np.concatenate(hops))
+        self._reachable[key] = result
         return result
 
 
+# Spawn key of the scheduler's random stream, clear of the shards' 0, 1, ...
+SCHEDULE_SPAWN_KEY = (2 ** 32 - 1,)
+
+
+@dataclass
+class AnomalyEvents:
+    """Anomalies as parallel arrays, one entry per event
+    
+    ``start`` and ``end`` are the [start, end) rows of each event on the
+    generation grid and ``epicenter`` its column position. ``max_hops``
+    is 0 for events that stay on their epicenter and -1 for events that
+    reach every dependent.
+    """
+    anomaly_id: np.ndarray
+    kind: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    epicenter: np.ndarray
+    severity: np.ndarray
+    max_hops: np.ndarray
+    decay: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.start)
+    
+    def take(self, index: Any) -> 'AnomalyEvents':
+        """Events selected by a mask or by positions"""
+        return AnomalyEvents(*(getattr(self, f.name)[index] for f in fields(self)))
+    
+    @classmethod
+    def empty(cls) -> 'AnomalyEvents':
+        return cls(
+            np.empty(0, dtype=object), np.empty(0, dtype=object),
+            np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=np.intp), np.empty(0), np.empty(0, dtype=np.intp),
+            np.empty(0)
+        )
+    
+    @classmethod
+    def concat(cls, parts: List['AnomalyEvents']) -> 'AnomalyEvents':
+        parts = [cls.empty()] + list(parts)
+        return cls(*(
+            np.concatenate([getattr(part, f.name) for part in parts])
+            for f in fields(cls)
+        ))
+    
+    @classmethod
+    def from_anomalies(cls, anomalies: List[Any],
+                       grid: Union[TimeGrid, pd.DatetimeIndex],
+                       columns: List[str]) -> 'AnomalyEvents':
+        """Events of configured anomalies, in configuration order
+        
+        ``grid`` is the time grid of the series, or its sorted timestamp
+        index when that is not evenly spaced. Anomalies on unknown
+        epicenters or starting after the last timestamp are left out.
+        """
+        index = {name: j for j, name in enumerate(columns)}
+        anomalies = [anomaly for anomaly in anomalies if anomaly.epicenter in index]
+        if not anomalies:
+            return cls.empty()
+        start_times = [anomaly.start_time for anomaly in anomalies]
+        durations = [anomaly.duration_minutes for anomaly in anomalies]
+        if isinstance(grid, TimeGrid):
+            starts, ends = grid.locate_all(start_times, durations)
+            n_windows = grid.n_windows
+        else:
+            starts, ends = _timestamp_rows(grid, start_times, durations)
+            n_windows = len(grid)
+        events = cls.at_rows(
+            anomalies, starts, ends,
+            np.array([index[anomaly.epicenter] for anomaly in anomalies], dtype=np.intp)
+        )
+        return events.take(starts < n_windows)
+    
+    @classmethod
+    def at_rows(cls, anomalies: List[Any], starts: np.ndarray, ends: np.ndarray,
+                epicenter: np.ndarray) -> 'AnomalyEvents':
+        """Events of anomaly configs already resolved to rows and columns"""
+        hops = [
+            (-1 if getattr(anomaly, 'max_hops', None) is None else anomaly.max_hops)
+            if getattr(anomaly, 'propagate', False) else 0
+            for anomaly in anomalies
+        ]
+        return cls(
+            np.array([getattr(anomaly, 'anomaly_id', '') for anomaly in anomalies],
+                     dtype=object),
+            np.array([getattr(anomaly.anomaly_type, 'value', anomaly.anomaly_type)
+                      for anomaly in anomalies], dtype=object),
+            starts, ends, epicenter,
+            np.array([anomaly.severity for anomaly in anomalies], dtype=float),
+            np.array(hops, dtype=np.intp),
+            np.array([getattr(anomaly, 'propagation_decay', 0.5)
+                      for anomaly in anomalies], dtype=float)
+        )
+
+
+class AnomalyScheduler:
+    """Draw anomaly events from per-type rates
+    
+    Every schedule is sampled with a handful of vectorized draws (count,
+    starts, durations, severities, epicenters), so tens of thousands of
+    events cost about as much as a few.
+    """
+    
+    def __init__(self, seed: Optional[Any] = None):
+        self.rng = np.random.default_rng(seed)
+    
+    def sample(self, schedules: List[Any], grid: TimeGrid,
+               columns: List[str]) -> AnomalyEvents:
+        """Events of all ``schedules`` over ``grid``, ordered by start"""
+        index = {name: j for j, name in enumerate(columns)}
+        n = grid.n_windows
+        step_minutes = grid.step / pd.Timedelta(minutes=1)
+        days = n * step_minutes / (24 * 60)
+        parts = []
+        for k, schedule in enumerate(schedules):
+            eligible = np.array(
+                [index[name] for name in schedule.epicenters if name in index]
+                if schedule.epicenters else range(len(columns)),
+                dtype=np.intp
+            )
+            count = self.rng.poisson(schedule.rate_per_day * days)
+            if count == 0 or len(eligible) == 0 or n == 0:
+                continue
+            
+            starts = self.rng.integers(0, n, count)
+            # Log-normal with the configured mean
+            sigma = schedule.duration_sigma
+            minutes = self.rng.lognormal(
+                np.log(schedule.mean_duration_minutes) - sigma ** 2 / 2, sigma, count
+            )
+            rows = np.maximum(np.ceil(minutes / step_minutes), 1).astype(np.intp)
+            severity = self.rng.uniform(schedule.severity_min, schedule.severity_max, count)
+            epicenter = eligible[self.rng.integers(0, len(eligible), count)]
+            
+            if not schedule.propagate:
+                hops = 0
+            else:
+                hops = -1 if schedule.max_hops is None else schedule.max_hops
+            parts.append(AnomalyEvents(
+                np.array([f'scheduled_{k}_{i}' for i in range(count)], dtype=object),
+                np.full(count, getattr(schedule.anomaly_type, 'value',
+                                       schedule.anomaly_type), dtype=object),
+                starts.astype(np.intp), np.minimum(starts + rows, n),
+                epicenter, severity,
+                np.full(count, hops, dtype=np.intp),
+                np.full(count, schedule.propagation_decay)
+            ))
+        
+        events = AnomalyEvents.concat(parts)
+        return events.take(np.argsort(events.start, kind='stable'))
+
+
 class AnomalyEngine:
-    """Inject anomalies into data"""
+    """Inject anomalies into data in place
+    
+    Every entry point multiplies the given float arrays (a matrix, a dict
+    of series or a single array) in place and returns them; nothing else
+    is copied. Rows of all events are resolved together and the patterns
+    come from the kernel registry in ``anomaly_kernels``.
+    """
     
     def __init__(self, seed: Optional[int] = None):
         self.rng = np.random.default_rng(seed)
     
-    def inject_anomalies(self, data: Dict[str, np.ndarray],
-                        timestamps: np.ndarray,
+    def inject_anomalies(self, data: Mapping,
+                        timestamps: pd.DatetimeIndex,
                         anomalies: List[Any],
-                        dependencies: List[Any]) -> Dict[str, np.ndarray]:
-        """Inject configured anomalies"""
+                        dependencies: Union[DependencyIndex, List[Any]],
+                        grid: Optional[TimeGrid] = None) -> Mapping:
+        """Inject configured anomalies in place
         
-        if not anomalies:
+        ``data`` may hold one block of a longer series described by
+        ``grid``; an anomaly spanning several blocks receives the matching
+        part of its pattern in each. Without a grid, windows are looked up
+        in ``timestamps`` themselves, which need not be evenly spaced.
+        ``dependencies`` is a ``DependencyIndex`` over the columns of
+        ``data``, or the dependency list to build one from.
+        """
+        
+        if not anomalies or len(timestamps) == 0:
             return data
         
-        result = {k: v.copy() for k, v in data.items()}
+        timestamps = pd.DatetimeIndex(timestamps)
+        columns = (dependencies.columns if isinstance(dependencies, DependencyIndex)
+                   else list(data))
+        if grid is None:
+            events = AnomalyEvents.from_anomalies(anomalies, timestamps, columns)
+            return self.inject_events(data, events, dependencies, 0, len(timestamps))
+        events = AnomalyEvents.from_anomalies(anomalies, grid, columns)
+        return self.inject_events(data, events, dependencies,
+                                  grid.index_of(timestamps[0]), len(timestamps))
+    
+    def inject_series(self, values: np.ndarray, timestamps: pd.DatetimeIndex,
+                      anomalies: List[Any], block_rows: int = 65536) -> np.ndarray:
+        """Inject anomalies into every column of a float array in place
         
-        for anomaly in anomalies:
-            # Find affected time windows
-            start_idx = None
-            end_idx = None
-            
-            for i, ts in enumerate(timestamps):
-                if start_idx is None and ts >= anomaly.start_time:
-                    start_idx = i
-                if ts >= anomaly.start_time + timedelta(minutes=anomaly.duration_minutes):
-                    end_idx = i
-                    break
-            
-            if start_idx is None:
-                continue
-            if end_idx is None:
-                end_idx = len(timestamps)
-            
-            # Apply anomaly to epicenter
-            if anomaly.epicenter in result:
-                result = self._apply_anomaly_pattern(
-                    result, anomaly.epicenter, start_idx, end_idx,
-                    anomaly.anomaly_type, anomaly.severity
-                )
-            
-            # Propagate if configured
-            if anomaly.propagate:
-                affected = self._get_dependent_metrics(
-                    anomaly.epicenter, dependencies
-                )
-                for metric in affected:
-                    if metric in result:
-                        # Reduced severity for propagated anomalies
-                        propagated_severity = anomaly.severity * 0.5
-                        result = self._apply_anomaly_pattern(
-                            result, metric, start_idx, end_idx,
-                            anomaly.anomaly_type, propagated_severity
-                        )
+        ``values`` is one series or a ``(rows, columns)`` array. Each
+        anomaly hits the rows whose timestamp falls in [start, start +
+        duration) in all columns; ``timestamps`` must be sorted but need
+        not be evenly spaced. Rows are processed ``block_rows`` at a time,
+        which bounds the temporaries however much the events overlap.
+        """
+        if not anomalies or len(timestamps) == 0:
+            return values
         
-        return result
+        matrix = values[:, None] if values.ndim == 1 else values
+        columns = [str(j) for j in range(matrix.shape[1])]
+        starts, ends = _timestamp_rows(
+            pd.DatetimeIndex(timestamps),
+            [anomaly.start_time for anomaly in anomalies],
+            [anomaly.duration_minutes for anomaly in anomalies]
+        )
+        
+        # Every anomaly once per column, in anomaly order
+        n_columns = len(columns)
+        events = AnomalyEvents.at_rows(
+            anomalies, starts, ends, np.zeros(len(anomalies), dtype=np.intp)
+        ).take(np.repeat(np.arange(len(anomalies)), n_columns))
+        events.epicenter = np.tile(np.arange(n_columns), len(anomalies))
+        events.max_hops[:] = 0
+        dependencies = DependencyIndex(columns, [])
+        for lo in range(0, len(matrix), block_rows):
+            block = MetricMatrix(columns, matrix[lo:lo + block_rows])
+            self.inject_events(block, events, dependencies, lo, len(block.values))
+        return values
     
-    def _apply_anomaly_pattern(self, data: Dict[str, np.ndarray],
-                               metric: str, start_idx: int, end_idx: int,
-                               anomaly_type: str, severity: float) -> Dict[str, np.ndarray]:
-        """Apply specific anomaly pattern"""
+    def inject_events(self, data: Mapping, events: AnomalyEvents,
+                      dependencies: Union[DependencyIndex, List[Any]],
+                      row_offset: int, n_rows: int) -> Mapping:
+        """Inject anomaly events into rows [row_offset, row_offset + n_rows)
+        
+        Events are applied in order. Runs of events that stay on one
+        column are applied together; an event that reaches dependents is
+        applied to all its columns as one block, with a severity that
+        decays with every hop.
+        """
+        block_starts = np.maximum(events.start - row_offset, 0)
+        block_ends = np.minimum(events.end - row_offset, n_rows)
+        hits = np.flatnonzero(block_starts < block_ends)
+        if len(hits) == 0:
+            return data
         
-        duration = end_idx - start_idx
+        if not isinstance(dependencies, DependencyIndex):
+            dependencies = DependencyIndex(list(data), dependencies)
         
-        if anomaly_type == AnomalyType.SPIKE:
-            # Sharp increase
-            spike = 1 + severity * (1 + 0.5 * np.sin(np.linspace(0, np.pi, duration)))
-            data[metric][start_idx:end_idx] *= spike
+        events = events.take(hits)
+        lo, hi = block_starts[hits], block_ends[hits]
         
-        elif anomaly_type == AnomalyType.DROP:
-            # Sharp decrease
-            drop = 1 - severity * (1 + 0.5 * np.sin(np.linspace(0, np.pi, duration)))
-            data[metric][start_idx:end_idx] *= np.maximum(drop, 0.1)
+        # The pattern's course over time is shared by all of an event's
+        # columns; evaluate it once per row for every event together
+        owner, within = _expand_ranges(lo, hi)
+        shapes = self._pattern_shapes(
+            events.kind, row_offset + lo - events.start,
+            events.end - events.start, owner, within
+        )
+        bounds = np.concatenate(([0], np.cumsum(hi - lo)))
         
-        elif anomaly_type == AnomalyType.OSCILLATION:
-            # Oscillating pattern
-            oscillation = 1 + severity * np.sin(np.linspace(0, 4 * np.pi, duration))
-            data[metric][start_idx:end_idx] *= oscillation
+        # Each cell still receives its events' factors in event order
+        kinds, codes = np.unique(events.kind, return_inverse=True)
+        first = 0
+        for k in [*np.flatnonzero(events.max_hops != 0), len(events)]:
+            if first < k:
+                rows = slice(bounds[first], bounds[k])
+                self._multiply_rows(data, dependencies, kinds, codes[first:k],
+                                    owner[rows] - first, shapes[rows],
+                                    events.severity[owner[rows]],
+                                    events.epicenter[owner[rows]], lo[owner[rows]] + within[rows])
+            if k < len(events):
+                hops = None if events.max_hops[k] < 0 else int(events.max_hops[k])
+                columns, hop_counts = dependencies.reachable(
+                    dependencies.columns[events.epicenter[k]], hops
+                )
+                severities = events.severity[k] * events.decay[k] ** hop_counts.astype(float)
+                factors = self._pattern_factors(
+                    events.kind[k], shapes[bounds[k]:bounds[k + 1], None], severities[None, :]
+                )
+                if factors is not None:
+                    self._multiply_block(data, dependencies, columns,
+                                         slice(lo[k], hi[k]), factors)
+            first = k + 1
         
-        elif anomaly_type == AnomalyType.DEGRADATION:
-            # Gradual decline
-            degradation = 1 - severity * np.linspace(0, 1, duration)
-            data[metric][start_idx:end_idx] *= np.maximum(degradation, 0.2)
+        return data
+    
+    def _multiply_rows(self, data: Mapping, dependencies: DependencyIndex,
+                       kinds: np.ndarray, codes: np.ndarray, owner: np.ndarray,
+                       shape: np.ndarray, severity: np.ndarray,
+                       columns: np.ndarray, rows: np.ndarray) -> None:
+        """Apply single-column events given row by row, in row order
         
-        elif anomaly_type == AnomalyType.OUTAGE:
-            # Complete failure
-            data[metric][start_idx:end_idx] *= (1 - severity)
+        ``kinds[codes[owner]]`` is the anomaly type of each row.
+        """
+        factors = np.ones(len(rows))
+        row_codes = codes[owner]
+        for code in np.unique(codes):
+            mine = np.flatnonzero(row_codes == code)
+            pattern = self._pattern_factors(kinds[code], shape[mine], severity[mine])
+            if pattern is not None:
+                factors[mine] = pattern
+        _multiply_at(data, dependencies.columns, columns, rows, factors)
+    
+    @staticmethod
+    def _multiply_block(data: Mapping, dependencies: DependencyIndex,
+                        columns: np.ndarray, rows: slice, factors: np.ndarray) -> None:
+        """``data[rows, columns] *= factors`` for a matrix or a dict of series"""
+        if isinstance(data, MetricMatrix):
+            data.values[rows, columns] *= factors
+            return
+        factors = np.broadcast_to(factors, (rows.stop - rows.start, len(columns)))
+        for k, column in enumerate(columns):
+            data[dependencies.columns[column]][rows] *= factors[:, k]
+    
+    @staticmethod
+    def _pattern_shapes(kind: np.ndarray, position: np.ndarray,
+                        duration: np.ndarray, owner: np.ndarray,
+                        within: np.ndarray) -> np.ndarray:
+        """Severity-independent course of the pattern at every affected row
         
-        elif anomaly_type == AnomalyType.CONGESTION:
-            # Increased variance
-            noise = self.rng.normal(1, severity * 0.3, duration)
-            data[metric][start_idx:end_idx] *= noise
+        Per-event arrays (``kind``, ``position``, ``duration``) are
+        expanded to rows through ``owner``; ``within`` is each row's
+        offset into its event. The course of a ``duration``-row event is
+        taken from its kernel's cache ``position`` rows into it, for all
+        events with one gather.
+        """
+        courses = []
+        offsets = np.empty(len(kind), dtype=np.intp)
+        found = {}
+        size = 0
+        for k, key in enumerate(zip(kind, duration.tolist())):
+            if key not in found:
+                # Unsupported types leave the data unchanged, any course will do
+                course = (kernel_course(*key) if key[0] in ANOMALY_KERNELS
+                          else np.zeros(key[1]))
+                found[key] = size
+                courses.append(course)
+                size += len(course)
+            offsets[k] = found[key]
+        if not courses:
+            return np.zeros(len(owner))
+        return np.concatenate(courses)[offsets[owner] + position[owner] + within]
+    
+    def _pattern_factors(self, kind: str, shape: np.ndarray,
+                         severity: np.ndarray) -> Optional[np.ndarray]:
+        """Multiplicative factors of anomalies of one type
         
-        return data
+        ``shape`` (the course over the affected rows) and ``severity``
+        broadcast to the shape of the result: ``(rows, columns)`` for one
+        event's block, or one value per row. Returns None for anomaly
+        types without a registered kernel, which leave the data unchanged.
+        """
+        kernel = ANOMALY_KERNELS.get(kind)
+        if kernel is None:
+            return None
+        noise = None
+        if kernel.noisy:
+            # Drawn column by column in event order
+            size = np.broadcast_shapes(np.shape(shape), np.shape(severity))
+            noise = self.rng.standard_normal(size[::-1]).T
+        return kernel.factor(shape, severity, noise)
+
+
+@dataclass
+class Shard:
+    """Group of entities generated independently of all other shards
+    
+    Entities linked by a correlation or a dependency (or sharing a column
+    key) belong to the same shard. ``correlations`` are the copula's
+    (unlagged) ones; lagged correlations and dependencies make up
+    ``causal``. ``events`` are the configured and scheduled anomalies
+    centered in the shard, by shard column position. Each shard draws
+    from its own random streams, so shards can be generated in any order
+    or in parallel.
+    """
+    columns: List[str]
+    positions: np.ndarray
+    metric_specs: List[Tuple[str, MetricConfig]]
+    correlations: List[Any]
+    events: AnomalyEvents
+    seed: np.random.SeedSequence
+    causal: Optional[CausalGraph] = None
+    dependency_index: Optional[DependencyIndex] = None
+    
+    @property
+    def contiguous(self) -> bool:
+        """Whether the shard's columns form one slice of the full matrix"""
+        return bool(np.all(np.diff(self.positions) == 1))
+
+
+@dataclass
+class _ShardRun:
+    """Engines and carried state for one shard during one generation run"""
+    shard: Shard
+    copula_dtype: Any = np.float64
+    dist_gen: DistributionGenerator = field(init=False)
+    corr_engine: CorrelationEngine = field(init=False)
+    arima_engine: ARIMAEngine = field(init=False)
+    anomaly_engine: AnomalyEngine = field(init=False)
+    arima_state: ARIMAState = field(default_factory=ARIMAState)
+    propagation_state: PropagationState = field(default_factory=PropagationState)
     
-    def _get_dependent_metrics(self, metric: str, 
-                               dependencies: List[Any]) -> List[str]:
-        """Get metrics that depend on given metric"""
-        dependents = []
-        for dep in dependencies:
-            if dep.parent == metric:
-                dependents.append(dep.child)
-        return dependents
+    def __post_init__(self):
+        self.dist_gen = DistributionGenerator(self.shard.seed)
+        self.corr_engine = CorrelationEngine(self.shard.seed, self.copula_dtype)
+        self.arima_engine = ARIMAEngine(self.shard.seed)
+        self.anomaly_engine = AnomalyEngine(self.shard.seed)
 
 
 class SyntheticDataGenerator:
     """Main generator orchestrator"""
     
-    def __init__(self, config: GeneratorConfig):
+    # Rows generated per pipeline pass. The copula ranks and the ARIMA noise
+    # scale are computed per block, so this is fixed rather than tied to
+    # the output chunk size: one-shot and chunked runs produce the same data.
+    block_rows = 65536
+    
+    # Precision of the copula's normal scores (np.float32 halves its memory)
+    copula_dtype = np.float64
+    
+    def __init__(self, config: GeneratorConfig,
+                 stage_hook: Optional[Callable[[str, float], None]] = None,
+                 profile: bool = False):
         self.config = config
-        self.dist_gen = DistributionGenerator(config.seed)
-        self.corr_engine = CorrelationEngine(config.seed)
-        self.arima_engine = ARIMAEngine(config.seed)
-        self.anomaly_engine = AnomalyEngine(config.seed)
+        # Called as stage_hook(stage_name, seconds) after every pipeline
+        # stage that runs in this process
+        self.stage_hook = stage_hook
+        # With profile=True, wall time, CPU time and peak memory of those
+        # stages are collected by stage and by metric
+        self.profiler = StageProfiler() if profile else None
+        self.grid = TimeGrid.from_window(config.time_window)
+        self.metric_specs = self._metric_specs()
+        self.columns = list(dict.fromkeys(key for key, _ in self.metric_specs))
+        self.events = self._anomaly_events()
+        self.shards = self._build_shards()
+    
+    @property
+    def num_windows(self) -> int:
+        return self.grid.n_windows
+    
+    def labels(self, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        """Bitmask of the anomaly types active in each of rows [lo, hi)
+        
+        Bit ``LABEL_BITS[type]`` is set in a row while an event of that
+        type covers it, on any column.
+        """
+        hi = self.num_windows if hi is None else hi
+        events = self.events
+        starts = np.clip(events.start - lo, 0, hi - lo)
+        ends = np.clip(events.end - lo, 0, hi - lo)
+        mask = np.zeros(hi - lo, dtype=LABEL_DTYPE)
+        for kind, bit in LABEL_BITS.items():
+            mine = (events.kind == kind) & (starts < ends)
+            if mine.any():
+                # Events of this type open at each row
+                open_events = np.cumsum(
+                    np.bincount(starts[mine], minlength=hi - lo + 1)
+                    - np.bincount(ends[mine], minlength=hi - lo + 1)
+                )[:-1]
+                mask[open_events > 0] |= bit
+        return mask
+    
+    def event_table(self) -> pd.DataFrame:
+        """Every anomaly event in application order, with the metrics it reaches"""
+        events = self.events
+        shard_of = np.empty(len(self.columns), dtype=np.intp)
+        for k, shard in enumerate(self.shards):
+            shard_of[shard.positions] = k
+        affected = np.empty(len(events), dtype=np.intp)
+        for i, (epicenter, hops) in enumerate(zip(events.epicenter, events.max_hops)):
+            index = self.shards[shard_of[epicenter]].dependency_index
+            affected[i] = len(index.reachable(
+                self.columns[epicenter], None if hops < 0 else int(hops)
+            )[0])
+        return pd.DataFrame({
+            'event_id': np.arange(len(events)),
+            'anomaly_id': events.anomaly_id,
+            'anomaly_type': events.kind,
+            'start_time': self.grid.start + events.start * self.grid.step,
+            'end_time': self.grid.start + events.end * self.grid.step,
+            'start_row': events.start,
+            'end_row': events.end,
+            'epicenter': np.array(self.columns, dtype=object)[events.epicenter],
+            'severity': events.severity,
+            'affected_metrics': affected
+        })
+    
+    def generate(self, workers: Optional[int] = None) -> pd.DataFrame:
+        """Generate synthetic dataset
+        
+        With ``workers`` > 1 the shards are spread over a process pool that
+        writes into a shared-memory matrix. The output is bit-identical for
+        any number of workers.
+        """
+        
+        if workers and workers > 1 and len(self.shards) > 1:
+            values = self._generate_parallel(workers)
+            matrix = MetricMatrix(self.columns, values)
+        else:
+            # Generate all metrics into one columnar buffer, block by block
+            matrix = MetricMatrix.empty(self.columns, self.num_windows)
+            with self._profiling():
+                self._fill_shards(matrix, range(len(self.shards)))
+        
+        # Create DataFrame
+        return matrix.to_frame(self.grid.timestamps())
     
-    def generate(self) -> pd.DataFrame:
-        """Generate synthetic dataset"""
+    def generate_chunks(self, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Generate the dataset as time-ordered frames of ``chunk_size`` rows
         
-        # Generate time windows
-        timestamps = self._generate_timestamps()
-        n_windows = len(timestamps)
+        Defaults to ``OutputConfig.chunk_size``. Only one pipeline block and
+        one chunk are held in memory at a time, and concatenating the chunks
+        gives exactly the frame returned by ``generate``.
+        """
+        if chunk_size is None and self.config.output:
+            chunk_size = self.config.output.chunk_size
+        chunk_size = chunk_size or self.block_rows
+        
+        pending = []
+        runs = [_ShardRun(shard, self.copula_dtype) for shard in self.shards]
+        with self._profiling():
+            for lo, hi in self._blocks():
+                block = MetricMatrix.empty(self.columns, hi - lo)
+                self._fill_block(block, lo, runs)
+                frame = block.to_frame(self.grid.timestamps(lo, hi), row_offset=lo)
+                
+                # Cut the block at global chunk boundaries
+                position = lo
+                while position < hi:
+                    boundary = min((position // chunk_size + 1) * chunk_size, hi)
+                    pending.append(frame.iloc[position - lo:boundary - lo])
+                    position = boundary
+                    if boundary % chunk_size == 0 or boundary == self.num_windows:
+                        yield pending[0] if len(pending) == 1 else pd.concat(pending)
+                        pending = []
+    
+    def _generate_parallel(self, workers: int) -> np.ndarray:
+        """Fill the metric matrix with a process pool via shared memory
+        
+        The returned array views the shared block itself, which stays
+        mapped until the last array or frame over it is released.
+        """
+        shape = (self.num_windows, len(self.columns))
+        nbytes = max(shape[0] * shape[1] * np.dtype(np.float64).itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            # A few batches per worker balances uneven shard sizes
+            n_batches = min(len(self.shards), workers * 4)
+            batches = [
+                batch.tolist()
+                for batch in np.array_split(np.arange(len(self.shards)), n_batches)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_shard_worker,
+                initargs=(self.config, shm.name, shape)
+            ) as pool:
+                for _ in pool.map(_generate_shard_batch, batches):
+                    pass
+        except BaseException:
+            shm.close()
+            raise
+        finally:
+            shm.unlink()
+        return np.asarray(_SharedMatrix(shm, shape))
+    
+    def _fill_shards(self, matrix: MetricMatrix, shard_ids: Any) -> None:
+        """Generate the given shards over the full time range into ``matrix``"""
+        runs = [_ShardRun(self.shards[i], self.copula_dtype) for i in shard_ids]
+        for lo, hi in self._blocks():
+            self._fill_block(matrix.rows(lo, hi), lo, runs)
+    
+    def _blocks(self) -> Iterator[Tuple[int, int]]:
+        """Row ranges of consecutive pipeline blocks"""
+        for lo in range(0, self.num_windows, self.block_rows):
+            yield lo, min(lo + self.block_rows, self.num_windows)
+    
+    def _fill_block(self, matrix: MetricMatrix, row_offset: int,
+                    runs: List[_ShardRun]) -> None:
+        """Generate one block of rows for each shard in ``runs``"""
+        timestamps = self.grid.timestamps(row_offset, row_offset + matrix.n_windows)
+        for run in runs:
+            shard = run.shard
+            if shard.contiguous:
+                lo = shard.positions[0]
+                view = MetricMatrix(shard.columns, matrix.values[:, lo:lo + len(shard.columns)])
+                self._fill_shard_block(run, view, timestamps)
+            else:
+                part = MetricMatrix.empty(shard.columns, matrix.n_windows)
+                self._fill_shard_block(run, part, timestamps)
+                matrix.values[:, shard.positions] = part.values
+    
+    def _fill_shard_block(self, run: _ShardRun, matrix: MetricMatrix,
+                          timestamps: pd.DatetimeIndex) -> None:
+        """Run every pipeline stage over one shard's block in place"""
+        n_windows = matrix.n_windows
+        shard = run.shard
         
         # Generate base data for all metrics
-        data = {}
-        for entity in self.config.entities:
-            for metric in entity.metrics:
-                metric_key = f"{entity.entity_id}_{metric.name}"
-                values = self.dist_gen.generate(
-                    metric.distribution, n_windows
-                )
-                data[metric_key] = values
+        with self.stage('distributions'):
+            for metric_key, metric in shard.metric_specs:
+                with self._metric_stage('distributions', metric_key):
+                    matrix[metric_key][:] = run.dist_gen.generate(
+                        metric.distribution, n_windows
+                    )
         
         # Apply correlations
-        if self.config.correlations:
-            data = self.corr_engine.apply_correlations(
-                data, self.config.correlations
-            )
+        if shard.correlations:
+            with self.stage('correlation'):
+                run.corr_engine.apply_correlations(matrix, shard.correlations)
         
         # Apply seasonality
         if self.config.seasonality:
-            for key in data:
-                data[key] = SeasonalityEngine.add_seasonality(
-                    data[key], timestamps, self.config.seasonality
+            with self.stage('seasonality'):
+                SeasonalityEngine.add_seasonality(
+                    matrix.values, timestamps, self.config.seasonality,
+                    out=matrix.values, origin=self.grid.start
                 )
         
-        # Apply ARIMA smoothing
+        # Apply ARIMA smoothing to all metrics in one filter pass
         if self.config.arima:
-            for key in data:
-                data[key] = self.arima_engine.apply_arima(
-                    data[key], self.config.arima
+            with self.stage('arima'):
+                run.arima_engine.apply_arima(
+                    matrix.values, self.config.arima, out=matrix.values,
+                    state=run.arima_state
+                )
+        
+        # Propagate parents into their children along the dependency DAG
+        if shard.causal is not None:
+            with self.stage('propagation'):
+                PropagationEngine.apply_propagation(
+                    matrix.values, shard.causal, state=run.propagation_state
                 )
         
         # Apply change points
         if self.config.change_points:
-            data = ChangePointEngine.apply_change_points(
-                data, timestamps, self.config.change_points
-            )
+            with self.stage('change_points'):
+                ChangePointEngine.apply_change_points(
+                    matrix, timestamps, self.config.change_points, grid=self.grid
+                )
         
         # Inject anomalies
-        if self.config.anomalies:
-            data = self.anomaly_engine.inject_anomalies(
-                data, timestamps, self.config.anomalies,
-                self.config.dependencies
-            )
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        df.insert(0, 'timestamp', timestamps)
+        if len(shard.events):
+            with self.stage('anomalies'):
+                run.anomaly_engine.inject_events(
+                    matrix, shard.events, shard.dependency_index,
+                    self.grid.index_of(timestamps[0]), n_windows
+                )
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a pipeline stage for the stage hook and the profiler
         
-        return df
+        Also usable by callers for work done on the generated chunks,
+        such as writing them out.
+        """
+        if self.stage_hook is None and self.profiler is None:
+            yield
+            return
+        with self.profiler.measure(name) if self.profiler else nullcontext():
+            start = time.perf_counter()
+            yield
+            seconds = time.perf_counter() - start
+        if self.stage_hook is not None:
+            self.stage_hook(name, seconds)
     
-    def _generate_timestamps(self) -> List[datetime]:
-        """Generate timestamp sequence"""
-        timestamps = []
-        current = self.config.time_window.start_time
-        delta = timedelta(minutes=self.config.time_window.granularity_minutes)
+    def _metric_stage(self, name: str, metric: str):
+        """Profile one metric's share of a stage"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure(name, metric)
+    
+    def _profiling(self):
+        """Memory tracking for the duration of a profiled run"""
+        return self.profiler if self.profiler is not None else nullcontext()
+    
+    def _metric_specs(self) -> List[Tuple[str, MetricConfig]]:
+        """Column key and metric config for every configured metric"""
+        return [
+            (f"{entity.entity_id}_{metric.name}", metric)
+            for entity in self.config.entities
+            for metric in entity.metrics
+        ]
+    
+    def _causal_edges(self) -> List[Tuple[str, str, float, int]]:
+        """(parent, child, weight, lag in rows) of every lagged influence"""
+        edges = []
+        for corr in self.config.correlations:
+            # A negative lag means the target leads the source
+            if corr.lag > 0:
+                edges.append((corr.source, corr.target, corr.coefficient, corr.lag))
+            elif corr.lag < 0:
+                edges.append((corr.target, corr.source, corr.coefficient, -corr.lag))
+        step = self.config.time_window.granularity_minutes
+        for dep in self.config.dependencies:
+            edges.append((dep.parent, dep.child, dep.influence_factor,
+                          int(round(dep.delay_minutes / step))))
+        return edges
+    
+    def _anomaly_events(self) -> AnomalyEvents:
+        """Configured anomalies, then the scheduled ones, by column position"""
+        events = AnomalyEvents.from_anomalies(self.config.anomalies, self.grid, self.columns)
+        if not self.config.anomaly_schedule:
+            return events
+        seed = np.random.SeedSequence(self.config.seed, spawn_key=SCHEDULE_SPAWN_KEY)
+        scheduled = AnomalyScheduler(seed).sample(
+            self.config.anomaly_schedule, self.grid, self.columns
+        )
+        return AnomalyEvents.concat([events, scheduled])
+    
+    def _build_shards(self) -> List[Shard]:
+        """Partition entities into independently generated shards"""
+        entity_of = {}
+        parent = list(range(len(self.config.entities)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        def union(i: int, j: int) -> None:
+            parent[find(i)] = find(j)
+        
+        # Entities that write the same column key stay together
+        for i, entity in enumerate(self.config.entities):
+            for metric in entity.metrics:
+                key = f"{entity.entity_id}_{metric.name}"
+                union(i, entity_of.setdefault(key, i))
+        
+        correlations = [
+            corr for corr in self.config.correlations
+            if corr.source in entity_of and corr.target in entity_of
+        ]
+        for corr in correlations:
+            union(entity_of[corr.source], entity_of[corr.target])
+        
+        # Values and anomalies propagate along dependencies, keep both ends together
+        for dep in self.config.dependencies:
+            if dep.parent in entity_of and dep.child in entity_of:
+                union(entity_of[dep.parent], entity_of[dep.child])
         
-        while current <= self.config.time_window.end_time:
-            timestamps.append(current)
-            current += delta
+        groups = {}
+        for spec in self.metric_specs:
+            groups.setdefault(find(entity_of[spec[0]]), []).append(spec)
+        shard_correlations = {}
+        for corr in correlations:
+            if not corr.lag:
+                shard_correlations.setdefault(find(entity_of[corr.source]), []).append(corr)
+        shard_edges = {}
+        for edge in self._causal_edges():
+            if edge[0] in entity_of and edge[1] in entity_of:
+                shard_edges.setdefault(find(entity_of[edge[0]]), []).append(edge)
+        # Every dependent of an epicenter shares its shard; a stable sort
+        # keeps each shard's events in application order
+        event_roots = np.array(
+            [find(entity_of[key]) for key in self.columns], dtype=np.intp
+        )[self.events.epicenter]
+        event_order = np.argsort(event_roots, kind='stable')
+        event_roots = event_roots[event_order]
+        shard_dependencies = {}
+        for dep in self.config.dependencies:
+            if dep.parent in entity_of and dep.child in entity_of:
+                shard_dependencies.setdefault(find(entity_of[dep.parent]), []).append(dep)
         
-        return timestamps
\ No newline at end of file
+        seeds = np.random.SeedSequence(self.config.seed).spawn(len(groups))
+        position = {name: j for j, name in enumerate(self.columns)}
+        local = np.empty(len(self.columns), dtype=np.intp)
+        shards = []
+        for (root, specs), seed in zip(groups.items(), seeds):
+            columns = sorted(dict.fromkeys(key for key, _ in specs), key=position.get)
+            positions = np.array([position[key] for key in columns], dtype=np.intp)
+            local[positions] = np.arange(len(columns))
+            events = self.events.take(event_order[
+                np.searchsorted(event_roots, root, 'left'):
+                np.searchsorted(event_roots, root, 'right')
+            ])
+            events.epicenter = local[events.epicenter]
+            shards.append(Shard(
+                columns=columns,
+                positions=positions,
+                metric_specs=specs,
+                correlations=shard_correlations.get(root, []),
+                events=events,
+                seed=seed,
+                causal=CausalGraph.build(columns, shard_edges.get(root, [])),
+                dependency_index=DependencyIndex(
+                    columns, shard_dependencies.get(root, [])
+                ) if len(events) else None
+            ))
+        return shards
+
+
+class _SharedMatrix:
+    """Owner of a shared-memory matrix, closed when no array views it
+    
+    Arrays built from it with ``np.asarray`` keep it as their base, so
+    the block is unmapped only after the last view is gone.
+    """
+    
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, int]):
+        self._shm = shm
+        self._values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+        self.__array_interface__ = self._values.__array_interface__
+    
+    def __del__(self):
+        del self._values
+        self._shm.close()
+
+
+# Per-process state of a parallel generation worker
+_shard_worker: Dict[str, Any] = {}
+
+
+def _init_shard_worker(config: GeneratorConfig, shm_name: str,
+                       shape: Tuple[int, int]) -> None:
+    """Attach a pool worker to the shared output matrix"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    generator = SyntheticDataGenerator(config)
+    values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+    _shard_worker.update(
+        shm=shm, generator=generator,
+        matrix=MetricMatrix(generator.columns, values)
+    )
+
+
+def _generate_shard_batch(shard_ids: List[int]) -> None:
+    """Generate a batch of shards into the shared output matrix"""
+    _shard_worker['generator']._fill_shards(_shard_worker['matrix'], shard_ids)
@@ -0,0 +1,186 @@
+"""
+Generation Jobs
+Bounded background worker pool with progress tracking and cancellation
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import threading
+import time
+import uuid
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation was requested"""
+    pass
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting"""
+    pass
+
+
+class Job:
+    """State of one background job, updated by the worker thread"""
+    
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stage: Optional[str] = None
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.rows_done = 0
+        self.rows_total = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+    
+    @property
+    def done(self) -> bool:
+        return self.status in ('completed', 'failed', 'cancelled')
+    
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+    
+    def check_cancelled(self) -> None:
+        """Abort the running job if cancellation was requested"""
+        if self._cancel.is_set():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+    
+    def record_stage(self, name: str, seconds: float) -> None:
+        """Accumulate time spent in a stage (usable as a stage hook)"""
+        with self._lock:
+            self.stage = name
+            timing = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            timing['seconds'] += seconds
+            timing['calls'] += 1
+        self.check_cancelled()
+    
+    def advance(self, rows: int) -> None:
+        """Mark more output rows as finished"""
+        with self._lock:
+            self.rows_done += rows
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable status report"""
+        with self._lock:
+            stages = {
+                name: {
+                    'seconds': round(timing['seconds'], 6),
+                    'calls': int(timing['calls'])
+                }
+                for name, timing in self.stages.items()
+            }
+            rows_done = self.rows_done
+        
+        if self.started_at is None:
+            elapsed = None
+        else:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        progress = rows_done / self.rows_total if self.rows_total else 0.0
+        if self.status == 'completed':
+            progress = 1.0
+        
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(progress, 4),
+            'rows_done': rows_done,
+            'rows_total': self.rows_total,
+            'stages': stages,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'elapsed_seconds': elapsed,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Run jobs on a fixed number of worker threads
+    
+    At most ``max_queued`` jobs may wait for a worker; finished jobs are
+    kept for polling until ``max_finished`` newer ones have completed.
+    """
+    
+    def __init__(self, max_workers: int = 2, max_queued: int = 16,
+                 max_finished: int = 100):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='generator-job'
+        )
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, fn: Callable[[Job], Dict[str, Any]]) -> Job:
+        """Queue ``fn(job)``; its return value becomes the job result"""
+        with self._lock:
+            queued = sum(job.status == 'queued' for job in self._jobs.values())
+            if queued >= self.max_queued:
+                raise JobQueueFull(
+                    f"{queued} jobs are already waiting, try again later"
+                )
+            job = Job(uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = self._executor.submit(self._run, job, fn)
+            self._evict()
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return job
+            job._cancel.set()
+            if self._futures[job_id].cancel():
+                self._finish(job, 'cancelled')
+        return job
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel outstanding jobs and stop the workers"""
+        with self._lock:
+            for job in self._jobs.values():
+                job._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def _run(self, job: Job, fn: Callable[[Job], Dict[str, Any]]) -> None:
+        if job.cancel_requested:
+            self._finish(job, 'cancelled')
+            return
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            result = fn(job)
+        except JobCancelled:
+            self._finish(job, 'cancelled')
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, 'failed')
+        else:
+            job.result = result
+            self._finish(job, 'completed')
+    
+    def _finish(self, job: Job, status: str) -> None:
+        job.finished_at = time.time()
+        job.status = status
+    
+    def _evict(self) -> None:
+        """Forget the oldest finished jobs beyond ``max_finished``"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+            del self._futures[job_id]
@@ -0,0 +1,152 @@
+"""
+Service Metrics
+Stage latency and throughput histograms in the Prometheus text format
+"""
+
+from typing import Dict, List, Sequence, Tuple
+import bisect
+import threading
+
+
+# Stage calls run per pipeline block, generations per request
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+GENERATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+ROWS_PER_SECOND_BUCKETS = (1e3, 5e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count per label combination"""
+    
+    kind = 'counter'
+    
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def samples(self) -> List[str]:
+        return [
+            f'{self.name}{_labels(self.label_names, labels)} {_number(value)}'
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float],
+                 label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = tuple(label_names)
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.setdefault(labels, [0] * (len(self.buckets) + 1))
+        # The last slot counts values above every bucket
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] = self._sums.get(labels, 0.0) + value
+    
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f'{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}'
+                )
+            lines.append(f'{self.name}_sum{_labels(self.label_names, labels)} {self._sums[labels]!r}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, labels)} {cumulative}')
+        return lines
+
+
+class GeneratorMetrics:
+    """Process-local metrics of the generation endpoints
+    
+    Everything is kept in memory and exposed with ``render``, so no
+    external service is involved; counts start over with the process.
+    """
+    
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            'synthdata_stage_duration_seconds',
+            'Wall time of one pipeline stage call (one block of one shard).',
+            STAGE_BUCKETS, ('stage',)
+        )
+        self.generation_seconds = Histogram(
+            'synthdata_generation_duration_seconds',
+            'Wall time to generate and write one dataset.',
+            GENERATION_BUCKETS
+        )
+        self.rows_per_second = Histogram(
+            'synthdata_generation_rows_per_second',
+            'Rows generated and written per second, per dataset.',
+            ROWS_PER_SECOND_BUCKETS
+        )
+        self.rows = Counter(
+            'synthdata_rows_generated_total',
+            'Rows generated and written.'
+        )
+        self.generations = Counter(
+            'synthdata_generations_total',
+            'Generation requests by result (generated, cached, failed, cancelled or rejected).',
+            ('result',)
+        )
+        self._lock = threading.Lock()
+    
+    def observe_stage(self, name: str, seconds: float) -> None:
+        """Record a stage call (usable as a stage hook)"""
+        with self._lock:
+            self.stage_seconds.observe(seconds, name)
+    
+    def observe_generation(self, rows: int, seconds: float) -> None:
+        """Record a finished generation"""
+        with self._lock:
+            self.generation_seconds.observe(seconds)
+            if seconds > 0:
+                self.rows_per_second.observe(rows / seconds)
+            self.rows.inc(rows)
+            self.generations.inc(1, 'generated')
+    
+    def count(self, result: str) -> None:
+        """Count a generation request that did not generate data"""
+        with self._lock:
+            self.generations.inc(1, result)
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for metric in (self.stage_seconds, self.generation_seconds,
+                           self.rows_per_second, self.rows, self.generations):
+                lines.append(f'# HELP {metric.name} {metric.documentation}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+                lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,126 @@
+"""
+Stage Profiling
+Wall time, CPU time and peak memory of pipeline stages
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional
+import threading
+import time
+import tracemalloc
+
+
+# Profilers sharing tracemalloc; it is stopped when the last one is done
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+@dataclass
+class StageTiming:
+    """Accumulated cost of one stage"""
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_bytes: int = 0
+    
+    def add(self, wall: float, cpu: float, peak: int) -> None:
+        self.calls += 1
+        self.wall_seconds += wall
+        self.cpu_seconds += cpu
+        self.peak_bytes = max(self.peak_bytes, peak)
+
+
+class StageProfiler:
+    """Record stages measured with ``measure`` by stage and by metric
+    
+    CPU time is that of the calling thread. Peak memory is the highest
+    traced allocation above the level at the start of the stage. It is
+    only tracked while the profiler is entered as a context manager,
+    which starts ``tracemalloc`` if needed; tracing is process-wide, so
+    concurrent profiled runs see each other's memory. Measurements may
+    nest, e.g. one per metric inside a stage.
+    """
+    
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.stages: Dict[str, StageTiming] = {}
+        self.metrics: Dict[str, Dict[str, StageTiming]] = {}
+        self._open: List[List[int]] = []
+        self._active = False
+        self.memory_tracked = False
+    
+    def __enter__(self) -> 'StageProfiler':
+        global _tracing_users, _tracing_started
+        if self.track_memory and not self._active:
+            with _tracing_lock:
+                if _tracing_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing_started = True
+                _tracing_users += 1
+            self._active = True
+            self.memory_tracked = True
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        global _tracing_users, _tracing_started
+        if not self._active:
+            return
+        self._active = False
+        with _tracing_lock:
+            _tracing_users -= 1
+            if _tracing_users == 0 and _tracing_started:
+                tracemalloc.stop()
+                _tracing_started = False
+    
+    @contextmanager
+    def measure(self, stage: str, metric: Optional[str] = None) -> Iterator[None]:
+        """Measure the enclosed block as ``stage`` (of ``metric``)"""
+        frame = self._enter()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            peak = self._exit(frame)
+            if metric is None:
+                timing = self.stages.setdefault(stage, StageTiming())
+            else:
+                timing = self.metrics.setdefault(metric, {}).setdefault(stage, StageTiming())
+            timing.add(wall, cpu, peak)
+    
+    def to_dict(self) -> dict:
+        """JSON-serializable report"""
+        return {
+            'stages': {name: asdict(timing) for name, timing in self.stages.items()},
+            'metrics': {
+                metric: {name: asdict(timing) for name, timing in stages.items()}
+                for metric, stages in self.metrics.items()
+            },
+            'memory_tracked': self.memory_tracked
+        }
+    
+    def _enter(self) -> Optional[List[int]]:
+        if not self._active:
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        if self._open:
+            # Resetting the peak below would lose the enclosing stage's
+            self._open[-1][1] = max(self._open[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        self._open.append(frame)
+        return frame
+    
+    def _exit(self, frame: Optional[List[int]]) -> int:
+        if frame is None:
+            return 0
+        base, peak = frame
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        self._open.pop()
+        if self._open:
+            self._open[-1][1] = max(self._open[-1][1], peak)
+        return max(peak - base, 0)
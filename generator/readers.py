@@ -0,0 +1,153 @@
+"""
+Artifact Readers
+Read generated files back chunk by chunk
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+import io
+import itertools
+import json
+import pandas as pd
+
+
+class ChunkReader:
+    """Base class for readers that yield a written file as DataFrame chunks
+    
+    Files are time-ordered, so reading stops as soon as ``stop_row`` is
+    reached. ``columns`` limits the metric columns; the timestamp column
+    is always included.
+    """
+    
+    def __init__(self, filepath: Path, columns: Optional[List[str]] = None):
+        self.filepath = Path(filepath)
+        self.columns = list(columns) if columns else None
+    
+    @property
+    def selected_columns(self) -> Optional[List[str]]:
+        if self.columns is None:
+            return None
+        return ['timestamp'] + [col for col in self.columns if col != 'timestamp']
+    
+    def read(self, start_row: int = 0,
+             stop_row: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Chunks covering rows ``[start_row, stop_row)``"""
+        for offset, frame in self._frames(start_row, stop_row):
+            end = offset + len(frame)
+            if stop_row is not None and offset >= stop_row:
+                break
+            if end <= start_row:
+                continue
+            lo = max(start_row - offset, 0)
+            hi = len(frame) if stop_row is None else min(stop_row - offset, len(frame))
+            yield self._select(frame.iloc[lo:hi])
+            if stop_row is not None and end >= stop_row:
+                break
+    
+    def _frames(self, start_row: int,
+                stop_row: Optional[int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """``(row offset, frame)`` pairs in file order, at least covering the range"""
+        raise NotImplementedError
+    
+    def _select(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if self.selected_columns is not None:
+            frame = frame[self.selected_columns]
+        if frame['timestamp'].dtype.kind != 'M':
+            frame = frame.assign(timestamp=pd.to_datetime(frame['timestamp']))
+        return frame.reset_index(drop=True)
+    
+    def _open(self):
+        import pyarrow as pa
+        
+        # Compression is detected from the file extension
+        return pa.input_stream(str(self.filepath), compression='detect')
+
+
+class CSVChunkReader(ChunkReader):
+    """CSV files, parsed incrementally by Arrow"""
+    
+    block_size = 1 << 24
+    
+    def _frames(self, start_row: int,
+                stop_row: Optional[int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        import pyarrow.csv as pacsv
+        
+        convert = pacsv.ConvertOptions(include_columns=self.selected_columns or [])
+        with self._open() as stream:
+            reader = pacsv.open_csv(
+                stream,
+                read_options=pacsv.ReadOptions(block_size=self.block_size),
+                convert_options=convert
+            )
+            offset = 0
+            for batch in reader:
+                yield offset, batch.to_pandas()
+                offset += batch.num_rows
+
+
+class JSONChunkReader(ChunkReader):
+    """JSON arrays, which have to be parsed as a whole"""
+    
+    def _frames(self, start_row: int,
+                stop_row: Optional[int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        with self._open() as stream:
+            frame = pd.read_json(io.BytesIO(stream.read()), orient='records')
+        yield 0, frame
+
+
+class NDJSONChunkReader(ChunkReader):
+    """NDJSON in either layout written by NDJSONChunkWriter"""
+    
+    def _frames(self, start_row: int,
+                stop_row: Optional[int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        import pyarrow.json as pajson
+        
+        with io.TextIOWrapper(self._open(), encoding='utf-8') as text:
+            first = text.readline()
+            if not first.strip():
+                return
+            if isinstance(json.loads(first).get('timestamp'), list):
+                # Columns layout: every line holds one chunk
+                offset = 0
+                for line in itertools.chain([first], text):
+                    frame = pd.DataFrame(json.loads(line))
+                    yield offset, frame
+                    offset += len(frame)
+                return
+        
+        # Records layout: one object per row, parsed by Arrow
+        with self._open() as stream:
+            offset = 0
+            for batch in pajson.open_json(stream):
+                yield offset, batch.to_pandas()
+                offset += batch.num_rows
+
+
+class ParquetChunkReader(ChunkReader):
+    """Parquet files, reading only the row groups that are needed"""
+    
+    def _frames(self, start_row: int,
+                stop_row: Optional[int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(self.filepath)
+        offset = 0
+        for i in range(parquet_file.num_row_groups):
+            rows = parquet_file.metadata.row_group(i).num_rows
+            if offset + rows > start_row:
+                table = parquet_file.read_row_group(i, columns=self.selected_columns)
+                yield offset, table.to_pandas()
+            offset += rows
+
+
+READERS: Dict[str, Type[ChunkReader]] = {
+    'csv': CSVChunkReader,
+    'json': JSONChunkReader,
+    'ndjson': NDJSONChunkReader,
+    'parquet': ParquetChunkReader,
+}
+
+
+def get_reader_class(output_format: Optional[str]) -> Type[ChunkReader]:
+    """Chunk reader for an output format (CSV by default)"""
+    return READERS.get(output_format, CSVChunkReader)
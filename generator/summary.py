@@ -0,0 +1,208 @@
+"""
+Summary Statistics
+Single-pass column moments and mergeable quantile sketches
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+
+class QuantileDigest:
+    """Merging t-digest over many columns at once
+    
+    Centroids are kept as ``(centroids, columns)`` arrays, so adding a
+    chunk or merging another digest is a handful of vectorized sorts and
+    bincounts whatever the number of columns. Centroid sizes follow the
+    arcsine scale function, which keeps the tails fine-grained; each
+    column holds at most ``compression / 2 + 1`` centroids.
+    """
+    
+    def __init__(self, n_columns: int, compression: float = 200):
+        self.n_columns = n_columns
+        self.compression = compression
+        self.count = 0
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+        self._means = np.empty((0, n_columns))
+        self._weights = np.empty((0, n_columns))
+    
+    def add(self, values: np.ndarray) -> None:
+        """Fold a ``(rows, columns)`` block of finite values into the digest"""
+        n = len(values)
+        if n == 0:
+            return
+        ordered = np.sort(values, axis=0)
+        self.min = np.minimum(self.min, ordered[0])
+        self.max = np.maximum(self.max, ordered[-1])
+        
+        # Every column has the same ranks, so each centroid is one
+        # contiguous range of sorted rows
+        bucket = self._bucket((np.arange(n) + 0.5) / n)
+        starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+        weights = np.diff(np.append(starts, n)).astype(float)
+        means = np.add.reduceat(ordered, starts, axis=0) / weights[:, None]
+        self._compress(means, np.repeat(weights[:, None], self.n_columns, axis=1))
+        self.count += n
+    
+    def merge(self, other: 'QuantileDigest') -> None:
+        """Fold another digest over the same columns into this one"""
+        if other.count == 0:
+            return
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self._compress(other._means, other._weights)
+        self.count += other.count
+    
+    def quantile(self, q: Sequence[float]) -> np.ndarray:
+        """Estimated quantiles, shape ``(len(q), columns)``"""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        result = np.full((len(q), self.n_columns), np.nan)
+        if self.count == 0:
+            return result
+        
+        # Interpolate between centroid centres, anchored at min and max
+        centres = np.cumsum(self._weights, axis=0) - self._weights / 2
+        for j in range(self.n_columns):
+            used = self._weights[:, j] > 0
+            ranks = np.concatenate(([0.0], centres[used, j], [self.count]))
+            values = np.concatenate(([self.min[j]], self._means[used, j], [self.max[j]]))
+            result[:, j] = np.interp(q * self.count, ranks, values)
+        return result
+    
+    def _bucket(self, q: np.ndarray) -> np.ndarray:
+        # Arcsine scale function, shifted to start at zero
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        return np.floor(k + self.compression / 4).astype(np.int64)
+    
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        means = np.concatenate([self._means, means])
+        weights = np.concatenate([self._weights, weights])
+        order = np.argsort(means, axis=0, kind='stable')
+        means = np.take_along_axis(means, order, axis=0)
+        weights = np.take_along_axis(weights, order, axis=0)
+        
+        total = weights.sum(axis=0)
+        q = (np.cumsum(weights, axis=0) - weights / 2) / np.maximum(total, 1)
+        bucket = self._bucket(np.clip(q, 0, 1))
+        
+        # Sum weights and weighted values per (bucket, column)
+        n_buckets = int(bucket.max()) + 1
+        cells = (bucket * self.n_columns + np.arange(self.n_columns)).ravel()
+        size = n_buckets * self.n_columns
+        merged_weights = np.bincount(cells, weights.ravel(), size)
+        merged_sums = np.bincount(cells, (weights * means).ravel(), size)
+        merged_weights = merged_weights.reshape(n_buckets, self.n_columns)
+        merged_sums = merged_sums.reshape(n_buckets, self.n_columns)
+        
+        used = merged_weights.any(axis=1)
+        self._weights = merged_weights[used]
+        self._means = np.divide(
+            merged_sums[used], self._weights,
+            out=np.zeros_like(self._weights), where=self._weights > 0
+        )
+
+
+class SummaryStatistics:
+    """Per-column mean, std, min, max and quantiles in a single pass
+    
+    Chunks of the metric matrix are folded in as they are generated;
+    moments are merged with Chan et al.'s parallel update. Quantiles are
+    exact for ``method='exact'`` and estimated with a QuantileDigest for
+    ``method='approximate'``. The default ``'auto'`` buffers values for
+    exact quantiles until more than ``exact_limit`` cells are seen, then
+    switches to the digest.
+    """
+    
+    methods = ('auto', 'exact', 'approximate')
+    
+    def __init__(self, columns: List[str], quantiles: Sequence[float] = (0.5,),
+                 method: Optional[str] = None, exact_limit: int = 1 << 22,
+                 compression: float = 200):
+        method = method or 'auto'
+        if method not in self.methods:
+            raise ValueError(
+                f"Unknown statistics method '{method}', expected one of "
+                f"{', '.join(self.methods)}"
+            )
+        self.columns = list(columns)
+        self.quantiles = tuple(quantiles)
+        self.method = method
+        self.exact_limit = exact_limit
+        self.compression = compression
+        self.count = 0
+        self._mean = np.zeros(len(self.columns))
+        self._m2 = np.zeros(len(self.columns))
+        self._min = np.full(len(self.columns), np.inf)
+        self._max = np.full(len(self.columns), -np.inf)
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+        self._digest = None
+        if method == 'approximate':
+            self._digest = QuantileDigest(len(self.columns), compression)
+    
+    @property
+    def exact(self) -> bool:
+        """Whether the quantiles reported so far are exact"""
+        return self._digest is None
+    
+    def add(self, values: np.ndarray) -> None:
+        """Fold a ``(rows, columns)`` block of values into the summary"""
+        values = np.asarray(values, dtype=float)
+        count = len(values)
+        if count == 0:
+            return
+        
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean = self._mean + delta * count / total
+        self._m2 = self._m2 + m2 + delta ** 2 * self.count * count / total
+        self._min = np.minimum(self._min, values.min(axis=0))
+        self._max = np.maximum(self._max, values.max(axis=0))
+        self.count = total
+        
+        if self._digest is not None:
+            self._digest.add(values)
+            return
+        # Kept column-major so the exact quantiles partition contiguous rows
+        self._buffer.append(values.T)
+        self._buffered += values.size
+        if self.method == 'auto' and self._buffered > self.exact_limit:
+            # Too large to keep, sketch what was buffered and continue
+            self._digest = QuantileDigest(len(self.columns), self.compression)
+            for block in self._buffer:
+                self._digest.add(block.T)
+            self._buffer = []
+    
+    def result(self) -> Dict[str, Dict[str, float]]:
+        """Statistics by column name"""
+        if self.count == 0:
+            return {}
+        if self.count > 1:
+            std = np.sqrt(self._m2 / (self.count - 1))
+        else:
+            std = np.full_like(self._m2, np.nan)
+        if self._digest is not None:
+            quantiles = self._digest.quantile(self.quantiles)
+        else:
+            quantiles = np.quantile(
+                np.concatenate(self._buffer, axis=1), self.quantiles, axis=1
+            ).reshape(len(self.quantiles), -1)
+        names = [quantile_name(q) for q in self.quantiles]
+        
+        return {
+            col: {
+                'mean': float(self._mean[j]),
+                'std': float(std[j]),
+                'min': float(self._min[j]),
+                'max': float(self._max[j]),
+                **{name: float(quantiles[i, j]) for i, name in enumerate(names)}
+            }
+            for j, col in enumerate(self.columns)
+        }
+
+
+def quantile_name(q: float) -> str:
+    """Statistic name of a quantile: 'median' or e.g. 'p95'"""
+    return 'median' if q == 0.5 else f'p{q * 100:g}'
@@ -0,0 +1,443 @@
+"""
+Output Writers
+Append generated chunks to a single output file
+"""
+
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Type
+import bz2
+import csv
+import gzip
+import io
+import json
+import re
+import numpy as np
+import pandas as pd
+
+
+class ChunkWriter:
+    """Base class for writers that append DataFrame chunks to one file"""
+    
+    extension = ''
+    mimetype = 'application/octet-stream'
+    
+    # Values OutputConfig.compression may take when compress is set
+    compressions: Tuple[str, ...] = ()
+    
+    def __init__(self, filepath: Path):
+        self.filepath = Path(filepath)
+        self.rows_written = 0
+    
+    @classmethod
+    def from_config(cls, filepath: Path, output: Optional[Any] = None) -> 'ChunkWriter':
+        """Writer configured from an OutputConfig"""
+        return cls(filepath)
+    
+    @classmethod
+    def extension_for(cls, output: Optional[Any] = None) -> str:
+        """File extension of the output ``from_config`` would write"""
+        return cls.extension
+    
+    @classmethod
+    def mimetype_for(cls, output: Optional[Any] = None) -> str:
+        """Media type of the output ``from_config`` would write"""
+        return cls.mimetype
+    
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Append a chunk of rows"""
+        if len(chunk) == 0:
+            return
+        self._write(chunk)
+        self.rows_written += len(chunk)
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Finish the file"""
+        pass
+    
+    def __enter__(self) -> 'ChunkWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+
+class _FrameCompressor(io.RawIOBase):
+    """Binary sink that compresses every write as an independent frame
+    
+    Used for zstd and lz4, whose concatenated frames decode as one stream.
+    The target file is not closed.
+    """
+    
+    def __init__(self, target: BinaryIO, codec: str, level: Optional[int]):
+        import pyarrow as pa
+        
+        self._codec = pa.Codec(codec, level)
+        self._target = target
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data: bytes) -> int:
+        self._target.write(self._codec.compress(data, asbytes=True))
+        return len(data)
+
+
+class TextChunkWriter(ChunkWriter):
+    """Base class for text formats, optionally compressed on the fly
+    
+    Each chunk is rendered to one string and written at once, so memory is
+    bounded by the chunk size rather than the dataset. Output goes to
+    ``fileobj`` instead of ``filepath`` when one is given; it is left open.
+    """
+    
+    compression_suffixes = {'gzip': 'gz', 'bz2': 'bz2', 'zstd': 'zst', 'lz4': 'lz4'}
+    compressions = tuple(compression_suffixes)
+    
+    def __init__(self, filepath: Path, compression: Optional[str] = None,
+                 compression_level: Optional[int] = None,
+                 fileobj: Optional[BinaryIO] = None):
+        super().__init__(filepath)
+        if compression and compression not in self.compression_suffixes:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of "
+                f"{', '.join(self.compression_suffixes)}"
+            )
+        self.compression = compression
+        self._owns_target = fileobj is None
+        self._target = open(self.filepath, 'wb') if fileobj is None else fileobj
+        self._file = self._wrap(self._target, compression, compression_level)
+    
+    @classmethod
+    def from_config(cls, filepath: Path, output: Optional[Any] = None,
+                    fileobj: Optional[BinaryIO] = None) -> 'TextChunkWriter':
+        if output is None:
+            return cls(filepath, fileobj=fileobj)
+        return cls(filepath, fileobj=fileobj, **cls._options(output))
+    
+    @classmethod
+    def extension_for(cls, output: Optional[Any] = None) -> str:
+        compression = cls._compression(output)
+        if compression in cls.compression_suffixes:
+            return f'{cls.extension}.{cls.compression_suffixes[compression]}'
+        return cls.extension
+    
+    @classmethod
+    def mimetype_for(cls, output: Optional[Any] = None) -> str:
+        if cls._compression(output) in cls.compression_suffixes:
+            return ChunkWriter.mimetype
+        return cls.mimetype
+    
+    @classmethod
+    def _compression(cls, output: Optional[Any]) -> Optional[str]:
+        # Text stays uncompressed unless a codec is named explicitly
+        if output is None or not output.compress:
+            return None
+        return output.compression
+    
+    @classmethod
+    def _options(cls, output: Any) -> Dict[str, Any]:
+        """Constructor arguments taken from an OutputConfig"""
+        return {
+            'compression': cls._compression(output),
+            'compression_level': output.compression_level
+        }
+    
+    def _wrap(self, target: BinaryIO, compression: Optional[str],
+              level: Optional[int]) -> BinaryIO:
+        # None of the compressors close the target they write to
+        if compression == 'gzip':
+            return gzip.GzipFile(
+                self.filepath.name, 'wb', 6 if level is None else level, target
+            )
+        if compression == 'bz2':
+            return bz2.BZ2File(target, 'wb', compresslevel=9 if level is None else level)
+        if compression:
+            return _FrameCompressor(target, compression, level)
+        return target
+    
+    def _emit(self, text: str) -> None:
+        self._file.write(text.encode('utf-8'))
+    
+    def close(self) -> None:
+        if self._file is not self._target:
+            self._file.close()
+        if self._owns_target:
+            self._target.close()
+
+
+class CSVChunkWriter(TextChunkWriter):
+    """CSV with a single header row
+    
+    Written through Arrow's CSV writer when pyarrow is installed. A
+    ``'%.<n>f'`` ``float_format`` rounds floats to n decimals on that path
+    (trailing zeros are not padded); other formats fall back to pandas.
+    """
+    
+    extension = 'csv'
+    mimetype = 'text/csv'
+    
+    def __init__(self, filepath: Path, compression: Optional[str] = None,
+                 compression_level: Optional[int] = None,
+                 float_format: Optional[str] = None,
+                 fileobj: Optional[BinaryIO] = None):
+        super().__init__(filepath, compression, compression_level, fileobj)
+        self.float_format = float_format
+        match = re.fullmatch(r'%\.(\d+)f', float_format or '')
+        self._decimals = int(match.group(1)) if match else None
+        try:
+            import pyarrow.csv
+            self._arrow = float_format is None or match is not None
+        except ImportError:
+            self._arrow = False
+    
+    @classmethod
+    def _options(cls, output: Any) -> Dict[str, Any]:
+        return dict(super()._options(output), float_format=output.float_format)
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        if not self._arrow:
+            self._emit(chunk.to_csv(
+                index=False, header=self.rows_written == 0,
+                float_format=self.float_format
+            ))
+            return
+        
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        
+        if self.rows_written == 0:
+            header = io.StringIO()
+            csv.writer(header, lineterminator='\n').writerow(chunk.columns)
+            self._emit(header.getvalue())
+        
+        arrays = []
+        for name in chunk.columns:
+            values = chunk[name].to_numpy()
+            if values.dtype.kind == 'M':
+                # Print timestamps at the coarsest exact precision
+                values = values.astype(_timestamp_unit(values))
+            elif values.dtype.kind == 'f' and self._decimals is not None:
+                values = np.round(values, self._decimals)
+            arrays.append(pa.array(values))
+        table = pa.Table.from_arrays(arrays, names=[str(name) for name in chunk.columns])
+        pacsv.write_csv(table, self._file, pacsv.WriteOptions(include_header=False))
+
+
+def _timestamp_unit(values: np.ndarray) -> str:
+    """Coarsest datetime64 unit that represents every value exactly"""
+    ns = values.astype('datetime64[ns]').view(np.int64)
+    for unit, factor in (('s', 10 ** 9), ('ms', 10 ** 6), ('us', 10 ** 3)):
+        if not np.any(ns % factor):
+            return f'datetime64[{unit}]'
+    return 'datetime64[ns]'
+
+
+class JSONChunkWriter(TextChunkWriter):
+    """JSON array of records, byte-identical to ``to_json(indent=2)``"""
+    
+    extension = 'json'
+    mimetype = 'application/json'
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        records = chunk.to_json(orient='records', date_format='iso', indent=2)
+        # Strip the enclosing "[\n" / "\n]" so chunks join into one array
+        if self.rows_written == 0:
+            self._emit(records[:-2])
+        else:
+            self._emit(',\n' + records[2:-2])
+    
+    def close(self) -> None:
+        self._emit('\n]' if self.rows_written else '[]')
+        super().close()
+
+
+class NDJSONChunkWriter(TextChunkWriter):
+    """Newline-delimited JSON
+    
+    The ``records`` layout writes one object per row. The ``columns``
+    layout writes one object per chunk mapping each column to its array of
+    values, which is smaller and faster to parse column-wise.
+    """
+    
+    extension = 'ndjson'
+    mimetype = 'application/x-ndjson'
+    layouts = ('records', 'columns')
+    
+    def __init__(self, filepath: Path, compression: Optional[str] = None,
+                 compression_level: Optional[int] = None,
+                 layout: Optional[str] = None,
+                 fileobj: Optional[BinaryIO] = None):
+        layout = layout or 'records'
+        if layout not in self.layouts:
+            raise ValueError(
+                f"Unknown JSON layout '{layout}', expected one of {', '.join(self.layouts)}"
+            )
+        super().__init__(filepath, compression, compression_level, fileobj)
+        self.layout = layout
+    
+    @classmethod
+    def _options(cls, output: Any) -> Dict[str, Any]:
+        return dict(super()._options(output), layout=output.json_layout)
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        if self.layout == 'columns':
+            self._emit('{' + ','.join(
+                json.dumps(str(name)) + ':'
+                + chunk[name].to_json(orient='values', date_format='iso')
+                for name in chunk.columns
+            ) + '}\n')
+            return
+        
+        # pandas' lines=True rescans the output in Python; splitting the
+        # compact array on the record boundary is much faster. An unescaped
+        # '},{"<first key>":' can only occur between records.
+        records = chunk.to_json(orient='records', date_format='iso')
+        key = json.dumps(str(chunk.columns[0])) + ':'
+        self._emit(records[1:-1].replace('},{' + key, '}\n{' + key) + '\n')
+
+
+class ParquetChunkWriter(ChunkWriter):
+    """Parquet file with one row group per chunk
+    
+    Columns go straight from numpy to Arrow; timestamps are stored as
+    int64 ``timestamp[ns]`` values without passing through objects. Float
+    columns default to byte-stream-split encoding, which compresses random
+    measurements far better than a dictionary.
+    """
+    
+    extension = 'parquet'
+    mimetype = 'application/vnd.apache.parquet'
+    
+    default_compression = 'snappy'
+    compressions = ('snappy', 'gzip', 'brotli', 'zstd', 'lz4', 'none')
+    default_float_encoding = 'byte_stream_split'
+    float_encodings = ('dictionary', 'byte_stream_split', 'plain')
+    
+    def __init__(self, filepath: Path, compression: Optional[str] = 'snappy',
+                 compression_level: Optional[int] = None,
+                 float_encoding: Optional[str] = None):
+        super().__init__(filepath)
+        float_encoding = float_encoding or self.default_float_encoding
+        if float_encoding not in self.float_encodings:
+            raise ValueError(
+                f"Unknown float encoding '{float_encoding}', "
+                f"expected one of {', '.join(self.float_encodings)}"
+            )
+        if compression and compression not in self.compressions:
+            raise ValueError(
+                f"Unknown compression '{compression}', "
+                f"expected one of {', '.join(self.compressions)}"
+            )
+        self.compression = compression or 'none'
+        self.compression_level = compression_level if compression else None
+        self.float_encoding = float_encoding
+        self._writer = None
+        self._schema = None
+    
+    @classmethod
+    def from_config(cls, filepath: Path,
+                    output: Optional[Any] = None) -> 'ParquetChunkWriter':
+        if output is None:
+            return cls(filepath)
+        compression = None
+        if output.compress:
+            compression = output.compression or cls.default_compression
+        return cls(
+            filepath,
+            compression=compression,
+            compression_level=output.compression_level,
+            float_encoding=output.float_encoding
+        )
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        arrays = [pa.array(chunk[name].to_numpy()) for name in chunk.columns]
+        if self._writer is None:
+            self._schema = pa.schema(
+                [(str(name), array.type) for name, array in zip(chunk.columns, arrays)]
+            )
+            self._writer = pq.ParquetWriter(
+                self.filepath, self._schema, **self._writer_options()
+            )
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+    
+    def _writer_options(self) -> Dict[str, Any]:
+        import pyarrow as pa
+        
+        options = {
+            'compression': self.compression,
+            'compression_level': self.compression_level,
+        }
+        if self.float_encoding == 'dictionary':
+            options['use_dictionary'] = True
+            return options
+        
+        # Floats rarely repeat and timestamps are strictly increasing, so
+        # only the remaining columns keep a dictionary
+        encodings = {}
+        for field in self._schema:
+            if pa.types.is_floating(field.type):
+                encodings[field.name] = self.float_encoding.upper()
+            elif pa.types.is_timestamp(field.type) or pa.types.is_integer(field.type):
+                encodings[field.name] = 'DELTA_BINARY_PACKED'
+        options['use_dictionary'] = [
+            field.name for field in self._schema if field.name not in encodings
+        ] or False
+        options['column_encoding'] = encodings
+        return options
+    
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            pd.DataFrame().to_parquet(self.filepath, index=False)
+
+
+WRITERS: Dict[str, Type[ChunkWriter]] = {
+    'csv': CSVChunkWriter,
+    'json': JSONChunkWriter,
+    'ndjson': NDJSONChunkWriter,
+    'parquet': ParquetChunkWriter,
+}
+
+
+def get_writer_class(output_format: Optional[str]) -> Type[ChunkWriter]:
+    """Chunk writer for an output format (CSV by default)"""
+    return WRITERS.get(output_format, CSVChunkWriter)
+
+
+def stream_chunks(chunks: Iterable[pd.DataFrame], output_format: str,
+                  output: Optional[Any] = None) -> Iterator[bytes]:
+    """Encode chunks in a text format and yield the bytes of each one
+    
+    Nothing touches the disk; only the current chunk is held in memory.
+    """
+    writer_cls = get_writer_class(output_format)
+    if not issubclass(writer_cls, TextChunkWriter):
+        raise ValueError(f"Format '{output_format}' cannot be streamed")
+    
+    buffer = io.BytesIO()
+    
+    def drain() -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+    
+    writer = writer_cls.from_config(
+        f'stream.{writer_cls.extension_for(output)}', output, fileobj=buffer
+    )
+    with writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            data = drain()
+            if data:
+                yield data
+    data = drain()
+    if data:
+        yield data
@@ -374,6 +374,8 @@ function addAnomaly(anomalyData = null) {
                         <option value="outage">Outage</option>
                         <option value="congestion">Congestion</option>
                         <option value="drift">Drift</option>
+                        <option value="level_shift">Level shift</option>
+                        <option value="variance_burst">Variance burst</option>
                     </select>
                 </div>
                 <div class="col-md-2">
@@ -622,7 +624,12 @@ async function generateData() {
             body: JSON.stringify(config)
         });
         
-        const data = await response.json();
+        let data = await response.json();
+        if (data.queued) {
+            // Too large to hold the request open; the server runs it as a job
+            showNotification('Running as a background job: ' + data.reason, 'info');
+            data = await waitForJob(data);
+        }
         
         if (data.success) {
             state.generatedData = data;
@@ -640,6 +647,26 @@ async function generateData() {
     }
 }
 
+/**
+ * Poll a queued generation job until it finishes and return its result
+ */
+async function waitForJob(queued, intervalMs = 2000) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+        const response = await fetch(queued.status_url);
+        const status = await response.json();
+        if (!status.success) {
+            return status;
+        }
+        if (['completed', 'failed', 'cancelled'].includes(status.job.status)) {
+            break;
+        }
+    }
+    
+    const response = await fetch(queued.result_url);
+    return response.json();
+}
+
 /**
  * Display results
  */
@@ -882,7 +882,12 @@ async function generateData() {
             body: JSON.stringify(config)
         });
 
-        const data = await response.json();
+        let data = await response.json();
+        if (data.queued) {
+            // Too large to hold the request open; the server runs it as a job
+            showNotification('Running as a background job: ' + data.reason, 'info');
+            data = await waitForJob(data);
+        }
 
         if (data.success) {
             showNotification('✓ Data generated successfully!', 'success');
@@ -900,6 +905,24 @@ async function generateData() {
     }
 }
 
+// Poll a queued generation job until it finishes and return its result
+async function waitForJob(queued, intervalMs = 2000) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+        const response = await fetch(queued.status_url);
+        const status = await response.json();
+        if (!status.success) {
+            return status;
+        }
+        if (['completed', 'failed', 'cancelled'].includes(status.job.status)) {
+            break;
+        }
+    }
+
+    const response = await fetch(queued.result_url);
+    return response.json();
+}
+
 // Show Result
 function showResult(data) {
     // Build preview table if preview data exists
@@ -0,0 +1,53 @@
+"""
+Test Fixtures
+Flask test client and small generator configurations shared by the tests
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app
+
+START = datetime(2024, 1, 1)
+
+
+def small_config(entities: int = 1, metrics: int = 2, hours: int = 24,
+                 granularity_minutes: int = 5, **extra) -> dict:
+    """Configuration dict of normal metrics over an ``hours``-long window"""
+    config = {
+        'seed': 1,
+        'entities': [
+            {
+                'entity_id': f'E{e}',
+                'entity_type': 'T',
+                'metrics': [
+                    {'name': f'm{m}',
+                     'distribution': {'type': 'normal', 'mean': 50.0, 'std': 5.0}}
+                    for m in range(metrics)
+                ]
+            }
+            for e in range(entities)
+        ],
+        'time_window': {
+            'start_time': START.isoformat(),
+            'end_time': (START + timedelta(hours=hours)).isoformat(),
+            'granularity_minutes': granularity_minutes
+        },
+        'output': {'output_dir': './output'}
+    }
+    config.update(extra)
+    return config
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client of an app writing its output under ``tmp_path``"""
+    monkeypatch.chdir(tmp_path)
+    app = create_app()
+    app.config.update(TESTING=True, COST_MODEL_PATH=tmp_path / 'cost_model.json')
+    return app.test_client()
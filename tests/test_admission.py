@@ -0,0 +1,56 @@
+"""
+Admission Tests
+Cost estimates of configurations the generator rejects or would spend much on
+"""
+
+import time
+
+import pytest
+
+from conftest import small_config
+from generator.cost_model import CostModel
+from generator.domain_schema import GeneratorConfig
+
+
+def cyclic_config() -> dict:
+    return small_config(dependencies=[
+        {'parent': 'E0_m0', 'child': 'E0_m1', 'influence_factor': 0.5},
+        {'parent': 'E0_m1', 'child': 'E0_m0', 'influence_factor': 0.5}
+    ])
+
+
+@pytest.mark.parametrize('url', ['/api/generate', '/api/jobs'])
+def test_rejected_config_is_bad_request(client, url):
+    response = client.post(url, json=cyclic_config())
+    assert response.status_code == 400
+    assert 'cycle' in response.get_json()['error']
+
+
+def test_validate_rejects_cycle(client):
+    response = client.post('/api/validate', json=cyclic_config())
+    assert response.status_code == 400
+    assert not response.get_json()['valid']
+
+
+def test_schedule_is_estimated_without_drawing_events():
+    config = GeneratorConfig.from_dict(small_config(anomaly_schedule=[
+        {'anomaly_type': 'spike', 'rate_per_day': 1e9, 'propagate': True}
+    ]))
+    start = time.perf_counter()
+    estimate = CostModel.reference().estimate(config)
+    assert time.perf_counter() - start < 1.0
+    assert estimate.stages['anomalies']['seconds'] > 0
+
+
+@pytest.mark.parametrize('limit', ['ADMISSION_MAX_SECONDS', 'ADMISSION_SYNC_MAX_SECONDS'])
+def test_stream_is_admitted_like_generate(client, limit):
+    client.application.config[limit] = 0
+    response = client.post('/api/generate/stream', json=small_config())
+    assert response.status_code == 413
+    assert 'exceeds' in response.get_json()['error']
+
+
+def test_stream_rejects_cycle(client):
+    response = client.post('/api/generate/stream', json=cyclic_config())
+    assert response.status_code == 400
+    assert 'cycle' in response.get_json()['error']
@@ -0,0 +1,31 @@
+"""
+Result Cache Tests
+Seeded configurations are served from the cache, unseeded ones never
+"""
+
+from conftest import small_config
+
+
+def test_seeded_config_is_reused(client):
+    first = client.post('/api/generate', json=small_config()).get_json()
+    second = client.post('/api/generate', json=small_config()).get_json()
+    assert not first['cache']['hit']
+    assert second['cache']['hit']
+    assert second['artifact_id'] == first['artifact_id']
+
+
+def test_unseeded_config_is_generated_afresh(client):
+    config = small_config(seed=None)
+    first = client.post('/api/generate', json=config).get_json()
+    second = client.post('/api/generate', json=config).get_json()
+    assert not first['cache']['hit'] and not second['cache']['hit']
+    assert first['statistics'] != second['statistics']
+    assert client.get('/api/cache').get_json()['cache']['entries'] == 0
+
+
+def test_unseeded_runs_keep_their_own_files(client):
+    config = small_config(seed=None)
+    first = client.post('/api/generate', json=config).get_json()
+    second = client.post('/api/generate', json=config).get_json()
+    assert first['artifact_id'] != second['artifact_id']
+    assert first['download_url'] != second['download_url']
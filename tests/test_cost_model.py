@@ -0,0 +1,50 @@
+"""
+Cost Model Tests
+Output size estimates of the reference coefficients against real writes
+"""
+
+from pathlib import Path
+
+import pytest
+
+from conftest import small_config
+from generator.cost_model import CostModel
+from generator.domain_schema import GeneratorConfig, OutputConfig
+from generator.generic_core import SyntheticDataGenerator
+from generator.writers import get_writer_class
+
+
+def write(config: GeneratorConfig, directory: Path) -> int:
+    """Bytes of the data file ``config`` produces"""
+    writer_cls = get_writer_class(config.output.format)
+    path = directory / f'data.{writer_cls.extension_for(config.output)}'
+    writer = writer_cls.from_config(path, config.output)
+    for chunk in SyntheticDataGenerator(config).generate_chunks():
+        writer.write(chunk)
+    writer.close()
+    return path.stat().st_size
+
+
+@pytest.mark.parametrize('output_format', ['csv', 'json', 'ndjson', 'parquet'])
+@pytest.mark.parametrize('name', ['m', 'downlink_throughput_mbps_'])
+def test_size_estimate_matches_write(tmp_path, output_format, name):
+    config = small_config(entities=3, metrics=4, hours=48, granularity_minutes=1)
+    for entity in config['entities']:
+        for i, metric in enumerate(entity['metrics']):
+            metric['name'] = f'{name}{i}'
+    config = GeneratorConfig.from_dict(config)
+    config.output = OutputConfig(format=output_format, column_store=False)
+    
+    estimate = CostModel.reference().estimate(config)
+    actual = write(config, tmp_path) / (1 << 20)
+    assert estimate.file_size_mb == pytest.approx(actual, rel=0.1)
+    assert estimate.output_size_mb == estimate.file_size_mb
+
+
+def test_column_store_is_counted_separately():
+    config = GeneratorConfig.from_dict(small_config(hours=48, granularity_minutes=1))
+    estimate = CostModel.reference().estimate(config)
+    assert estimate.column_store_mb == pytest.approx(8 * estimate.rows * 2 / (1 << 20))
+    assert estimate.output_size_mb == pytest.approx(
+        estimate.file_size_mb + estimate.column_store_mb
+    )
@@ -0,0 +1,42 @@
+"""
+Downsampling Tests
+Point budgets and degenerate inputs of the LTTB sampler and its endpoints
+"""
+
+import numpy as np
+import pytest
+
+from conftest import small_config
+from generator.downsample import LTTBSampler, lttb
+
+
+@pytest.mark.parametrize('points', [-1, 0, 1, 2, 3])
+def test_small_budget_is_raised_to_minimum(points):
+    values = np.random.default_rng(0).normal(size=(1000, 2))
+    rows = lttb(values, points)
+    assert len(rows) == LTTBSampler.min_points
+    assert rows[0] == 0 and rows[-1] == 999
+
+
+def test_no_columns():
+    rows = lttb(np.empty((1000, 0)), 10)
+    assert len(rows) == 10
+    assert rows[0] == 0 and rows[-1] == 999
+
+
+def test_generate_without_metrics(client):
+    response = client.post('/api/generate', json=small_config(entities=0))
+    assert response.status_code == 200
+    assert response.get_json()['success']
+
+
+@pytest.mark.parametrize('points', [-1, 0, 2])
+def test_timeseries_budget_is_bounded(client, points):
+    config = small_config(hours=48, granularity_minutes=1)
+    config['output']['timeseries_points'] = points
+    result = client.post('/api/generate', json=config).get_json()
+    assert len(result['timeseries']) <= 100
+    
+    response = client.get(f'/api/artifacts/{result["artifact_id"]}/timeseries?points={points}')
+    assert response.status_code == 200
+    assert response.get_json()['points'] == LTTBSampler.min_points
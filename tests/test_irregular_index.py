@@ -0,0 +1,59 @@
+"""
+Irregular Index Tests
+Event windows resolved on timestamp indexes that are not evenly spaced
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from generator.domain_schema import (AnomalyConfig, AnomalyType, ChangePointConfig,
+                                     ChangeType)
+from generator.generic_core import AnomalyEngine, ChangePointEngine
+
+
+def irregular_index() -> pd.DatetimeIndex:
+    """Five-minute steps for a day, then hourly steps for three days"""
+    dense = pd.date_range('2024-01-01', periods=288, freq='5min')
+    sparse = pd.date_range(dense[-1] + pd.Timedelta(hours=1), periods=72, freq='1h')
+    return dense.append(sparse)
+
+
+def window(timestamps: pd.DatetimeIndex, start: datetime, minutes: int) -> np.ndarray:
+    start = pd.Timestamp(start)
+    return (timestamps >= start) & (timestamps < start + pd.Timedelta(minutes=minutes))
+
+
+def test_change_points_follow_the_actual_index():
+    timestamps = irregular_index()
+    step = ChangePointConfig('step', ChangeType.STEP, ['a'],
+                             datetime(2024, 1, 2, 18), 60, 0.5)
+    ramp = ChangePointConfig('ramp', ChangeType.RAMP, ['b'],
+                             datetime(2024, 1, 2, 6, 30), 600, 1.0)
+    data = {'a': np.ones(len(timestamps)), 'b': np.ones(len(timestamps))}
+    ChangePointEngine.apply_change_points(data, timestamps, [step, ramp])
+    
+    after = timestamps >= pd.Timestamp(step.start_time)
+    np.testing.assert_array_equal(data['a'], np.where(after, 1.5, 1.0))
+    
+    rows = np.flatnonzero(window(timestamps, ramp.start_time, ramp.duration_minutes))
+    expected = np.ones(len(timestamps))
+    expected[rows] = 1 + np.linspace(0, 1.0, len(rows))
+    expected[rows[-1] + 1:] = 2.0
+    np.testing.assert_allclose(data['b'], expected)
+
+
+def test_anomalies_follow_the_actual_index():
+    timestamps = irregular_index()
+    anomalies = [
+        # Across the change of spacing, and after the last timestamp
+        AnomalyConfig('across', AnomalyType.OUTAGE, datetime(2024, 1, 1, 22), 300, 0.8, 'a'),
+        AnomalyConfig('late', AnomalyType.OUTAGE, datetime(2024, 2, 1), 60, 0.8, 'a'),
+    ]
+    data = {'a': np.ones(len(timestamps)), 'b': np.ones(len(timestamps))}
+    AnomalyEngine(seed=0).inject_anomalies(data, timestamps, anomalies, [])
+    
+    hit = window(timestamps, anomalies[0].start_time, anomalies[0].duration_minutes)
+    np.testing.assert_allclose(data['a'], np.where(hit, 0.2, 1.0))
+    np.testing.assert_array_equal(data['b'], 1.0)
@@ -0,0 +1,67 @@
+"""
+Output Option Tests
+Unknown writer and statistics options, and profiling where it is disabled,
+are rejected before any work starts
+"""
+
+import pytest
+
+from conftest import small_config
+
+BAD_OPTIONS = [
+    {'format': 'csv', 'compression': 'brotli'},
+    {'format': 'parquet', 'compression': 'bz2'},
+    {'format': 'ndjson', 'json_layout': 'table'},
+    {'format': 'parquet', 'float_encoding': 'delta'},
+    {'format': 'csv', 'statistics': 'median'},
+]
+
+
+def config_with(options: dict) -> dict:
+    config = small_config()
+    config['output'].update(options)
+    return config
+
+
+@pytest.mark.parametrize('options', BAD_OPTIONS)
+def test_validate_rejects_unknown_option(client, options):
+    result = client.post('/api/validate', json=config_with(options)).get_json()
+    assert not result['valid']
+    assert any(error.startswith('Unknown') for error in result['errors'])
+
+
+@pytest.mark.parametrize('url', ['/api/generate', '/api/jobs'])
+@pytest.mark.parametrize('options', BAD_OPTIONS)
+def test_generation_rejects_unknown_option(client, url, options):
+    response = client.post(url, json=config_with(options))
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Unknown')
+
+
+def test_uncompressed_ignores_compression(client):
+    config = config_with({'format': 'csv', 'compress': False, 'compression': 'brotli'})
+    assert client.post('/api/validate', json=config).get_json()['valid']
+
+
+@pytest.mark.parametrize('options', [
+    {'format': 'parquet', 'compression': 'brotli'},
+    {'format': 'csv', 'compression': 'zstd', 'statistics': 'exact'},
+    {'format': 'ndjson', 'json_layout': 'columns'},
+])
+def test_known_options_generate(client, options):
+    response = client.post('/api/generate', json=config_with(options))
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('url', ['/api/generate', '/api/jobs', '/api/generate/stream'])
+def test_profiling_is_disabled_by_default(client, url):
+    response = client.post(url, json=config_with({'profile': True}))
+    assert response.status_code == 400
+    assert 'Profiling is disabled' in response.get_json()['error']
+
+
+def test_profiling_when_allowed(client):
+    client.application.config['ALLOW_PROFILING'] = True
+    response = client.post('/api/generate', json=config_with({'profile': True}))
+    assert response.status_code == 200
+    assert response.get_json()['metadata']['profile']['memory_tracked']
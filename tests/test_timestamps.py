@@ -0,0 +1,69 @@
+"""
+Timestamp Tests
+The vectorized time grid against the per-row timestamp list it replaced
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+import pandas as pd
+import pytest
+
+from conftest import small_config
+from generator.domain_schema import GeneratorConfig
+from generator.generic_core import SyntheticDataGenerator, TimeGrid
+
+
+def legacy_timestamps(time_window) -> List[datetime]:
+    """Timestamps as the generator built them before the DatetimeIndex"""
+    timestamps = []
+    current = time_window.start_time
+    delta = timedelta(minutes=time_window.granularity_minutes)
+    while current <= time_window.end_time:
+        timestamps.append(current)
+        current += delta
+    return timestamps
+
+
+WINDOWS = [
+    # 61 days of 7-minute steps ending 3 minutes into a step
+    (datetime(2024, 1, 1, 0, 3, 17), datetime(2024, 3, 2, 17, 29, 17), 7),
+    # Ends exactly on a step, across the leap day
+    (datetime(2024, 2, 28), datetime(2024, 3, 1, 12), 5),
+    # A partial single step, and one timestamp only
+    (datetime(2024, 1, 1), datetime(2024, 1, 1, 0, 59), 60),
+    (datetime(2024, 1, 1), datetime(2024, 1, 1), 15),
+    # End before start
+    (datetime(2024, 1, 2), datetime(2024, 1, 1), 5),
+]
+
+
+@pytest.mark.parametrize('start, end, granularity', WINDOWS)
+def test_grid_matches_legacy_list(start, end, granularity):
+    window = SimpleNamespace(start_time=start, end_time=end,
+                             granularity_minutes=granularity)
+    grid = TimeGrid.from_window(window)
+    expected = pd.DatetimeIndex(legacy_timestamps(window)).as_unit('ns')
+    
+    timestamps = grid.timestamps()
+    assert timestamps.dtype == 'datetime64[ns]'
+    assert timestamps.equals(expected)
+    
+    # Any slice of rows matches the same slice of the list
+    middle = grid.n_windows // 3
+    assert grid.timestamps(middle, 2 * middle).equals(expected[middle:2 * middle])
+
+
+def test_generated_frames_match_legacy_list():
+    config = GeneratorConfig.from_dict(small_config(hours=24 * 50, granularity_minutes=7))
+    config.time_window.end_time += timedelta(minutes=4)
+    expected = pd.DatetimeIndex(legacy_timestamps(config.time_window)).as_unit('ns')
+    
+    generator = SyntheticDataGenerator(config)
+    frame = generator.generate()
+    chunks = pd.concat(generator.generate_chunks(chunk_size=3000), ignore_index=True)
+    # Several chunks, the last one partial
+    assert len(expected) > 3 * 3000 and len(expected) % 3000
+    assert pd.DatetimeIndex(frame['timestamp']).equals(expected)
+    assert pd.DatetimeIndex(chunks['timestamp']).equals(expected)